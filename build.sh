@@ -5,4 +5,6 @@ set -o errexit
 pip install -r requirements.txt
 python manage.py collectstatic --noinput
 python manage.py migrate
+# 템플릿 문법 검사 (워커는 시작할 때 mysite/wsgi.py 에서 다시 미리 컴파일한다)
+python manage.py warm_templates
 python manage.py create_superuser
\ No newline at end of file
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+import tempfile
 import dj_database_url  # 이 줄 추가!
 
 
@@ -64,8 +65,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'polls.middleware.RequestTimingMiddleware',  # 요청별 시간/SQL 측정 (맨 앞에 둬야 전체 시간이 잡힘)
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # 이 줄 추가!
+    'polls.page_cache.PageCacheMiddleware',  # 익명 사용자 전체 페이지 캐시 (세션 미들웨어보다 앞에)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -91,8 +94,25 @@ TEMPLATES = [
     },
 ]
 
+# 운영 모드 템플릿: cached loader 를 명시하고 워커 시작 때 전부 미리 컴파일 (polls/templates_warmup.py)
+# 기본값은 DEBUG 가 꺼져 있으면 켜짐. 켜져 있으면 템플릿 파일을 고쳐도 재시작 전까지 반영되지 않는다.
+POLLS_TEMPLATE_CACHE = os.environ.get("POLLS_TEMPLATE_CACHE", "0" if DEBUG else "1") == "1"
+if POLLS_TEMPLATE_CACHE:
+    # loaders 를 직접 주면 APP_DIRS 는 꺼야 한다 (app_directories loader 가 대신함)
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'mysite.wsgi.application'
 
+# 목록/결과/투표를 async view 로 (ASGI 서버로 실행할 때만 켤 것, README 참고)
+# WSGI 에서 켜면 요청마다 이벤트 루프를 새로 만들어서 오히려 느려진다.
+POLLS_ASYNC_VIEWS = os.environ.get("POLLS_ASYNC_VIEWS", "0") == "1"
+
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
@@ -126,6 +146,26 @@ DATABASES = {
     )
 }
 
+# PostgreSQL 연결 풀 (psycopg_pool, POLLS_DB_POOL=1)
+# 워커마다 min_size~max_size 개 연결을 열어 두고 요청마다 빌려 쓴다 (Django 는 풀을 쓰면 CONN_MAX_AGE=0 이어야 함)
+# 오래되거나 오래 놀던 연결은 풀이 닫고 새로 연다 (max_idle / max_lifetime).
+# POLLS_DB_POOL_CHECK=1 이면 빌려줄 때마다 연결 상태를 확인한다 (CONN_HEALTH_CHECKS → psycopg_pool check).
+# 요청마다 연결을 빌리므로 확인도 요청마다 DB 왕복 한 번이 더 생겨서 기본은 끈다.
+# DB 재시작 등으로 끊긴 연결을 자주 만나는 환경에서만 켤 것.
+# 대기 시간/크기 통계는 /metrics 의 polls_db_pool_* (polls/metrics.py)
+POLLS_DB_POOL = os.environ.get("POLLS_DB_POOL", "0") == "1"
+if POLLS_DB_POOL and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = os.environ.get("POLLS_DB_POOL_CHECK", "0") == "1"
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": int(os.environ.get("POLLS_DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.environ.get("POLLS_DB_POOL_MAX_SIZE", "10")),
+        # 연결을 기다리는 최대 시간(초), 넘으면 요청 실패
+        "timeout": float(os.environ.get("POLLS_DB_POOL_TIMEOUT", "10")),
+        "max_idle": float(os.environ.get("POLLS_DB_POOL_MAX_IDLE", "600")),
+        "max_lifetime": float(os.environ.get("POLLS_DB_POOL_MAX_LIFETIME", "3600")),
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -175,4 +215,182 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # Django가 accounts 앱을 인식하도록 설정.
 LOGIN_REDIRECT_URL = "polls:index" 
-LOGOUT_REDIRECT_URL = "polls:index"
\ No newline at end of file
+LOGOUT_REDIRECT_URL = "polls:index"
+
+
+# 투표 버퍼링 설정
+# 켜면 투표를 메모리에 모았다가 백그라운드에서 질문별로 한 번에 UPDATE 한다.
+# FLUSH_INTERVAL: DB 반영까지 최대 지연(초), MAX_PENDING: 이만큼 쌓이면 즉시 반영
+POLLS_VOTE_BUFFER_ENABLED = os.environ.get("POLLS_VOTE_BUFFER", "0") == "1"
+POLLS_VOTE_BUFFER_FLUSH_INTERVAL = float(os.environ.get("POLLS_VOTE_BUFFER_FLUSH_INTERVAL", "1.0"))
+POLLS_VOTE_BUFFER_MAX_PENDING = int(os.environ.get("POLLS_VOTE_BUFFER_MAX_PENDING", "1000"))
+
+# 투표 shard 개수 (0 이면 사용 안 함)
+# 선택지마다 N개의 카운터 행에 나눠 더해서 한 행에 락이 몰리지 않게 한다.
+# shard 에 쌓인 표는 `python manage.py compact_vote_shards` 로 votes 에 합친다.
+POLLS_VOTE_SHARDS = int(os.environ.get("POLLS_VOTE_SHARDS", "0"))
+
+# 캐시 설정
+# polls_results: 결과 페이지 캐시 (질문 id 별 득표수/비율 목록)
+#   기본은 프로세스 내 locmem(LRU), POLLS_RESULTS_CACHE_BACKEND=file 이면
+#   워커끼리 공유되는 파일 캐시(LRU 정리)를 사용한다.
+#   locmem 이면 투표 시 무효화는 그 투표를 처리한 워커의 캐시에만 적용된다.
+#   다른 워커는 항목에 저장된 질문 버전이 공유 버전(polls_versions)과 달라진 것을 보고 다시 계산하므로,
+#   gunicorn -w 2 이상에서는 polls_versions 를 파일 캐시(기본)로 두거나 여기서 file 을 쓸 것.
+#   (둘 다 locmem 인데 워커가 여럿이면 check / 서버 시작 로그에 polls.W002 경고)
+POLLS_RESULTS_CACHE_ALIAS = "polls_results"
+POLLS_RESULTS_CACHE_BACKEND = os.environ.get("POLLS_RESULTS_CACHE_BACKEND", "locmem")
+
+_RESULTS_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "polls-results",
+    },
+    "file": {
+        "BACKEND": "polls.cache_backends.LRUFileBasedCache",
+        "LOCATION": os.environ.get(
+            "POLLS_RESULTS_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "django_polls_results"),
+        ),
+    },
+}
+
+# polls_versions: 질문별 버전 + 목록 세대 (polls/versions.py, ETag/페이지 캐시 키/결과·목록 캐시 검증)
+#   워커끼리 같은 값을 봐야 다른 워커의 투표 뒤에 304 나 예전 결과를 주지 않으므로 기본은 파일 캐시.
+#   locmem 은 워커가 하나일 때만 맞다 (manage.py check 가 경고, polls/checks.py)
+POLLS_VERSIONS_CACHE_ALIAS = "polls_versions"
+POLLS_VERSIONS_CACHE_BACKEND = os.environ.get("POLLS_VERSIONS_CACHE_BACKEND", "file")
+
+_VERSIONS_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "polls-versions",
+    },
+    "file": {
+        "BACKEND": "polls.cache_backends.LRUFileBasedCache",
+        "LOCATION": os.environ.get(
+            "POLLS_VERSIONS_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "django_polls_versions"),
+        ),
+    },
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # 익명 사용자 전체 페이지 캐시 (polls/page_cache.py)
+    "polls_pages": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "polls-pages",
+    },
+    # voter 별 투표한 질문 id 집합 (polls/voters.py), 가득 차면 오래 안 쓴 것부터
+    "polls_voted": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "polls-voted",
+        "TIMEOUT": int(os.environ.get("POLLS_VOTED_CACHE_TTL", "300")),
+        "OPTIONS": {"MAX_ENTRIES": int(os.environ.get("POLLS_VOTED_CACHE_MAX_ENTRIES", "10000"))},
+    },
+    # 템플릿 조각(head/header/footer) + 질문 목록 캐시 (polls/fragment_cache.py)
+    "polls_fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "polls-fragments",
+    },
+    POLLS_RESULTS_CACHE_ALIAS: {
+        **_RESULTS_CACHE_BACKENDS[POLLS_RESULTS_CACHE_BACKEND],
+        "TIMEOUT": int(os.environ.get("POLLS_RESULTS_CACHE_TTL", "300")),  # 초
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("POLLS_RESULTS_CACHE_MAX_ENTRIES", "1000")),
+        },
+    },
+    POLLS_VERSIONS_CACHE_ALIAS: {
+        **_VERSIONS_CACHE_BACKENDS[POLLS_VERSIONS_CACHE_BACKEND],
+        "TIMEOUT": None,
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("POLLS_VERSIONS_CACHE_MAX_ENTRIES", "10000")),
+        },
+    },
+}
+
+# 질문 검색 백엔드
+# auto: PostgreSQL 이면 tsvector(GIN), SQLite 면 FTS5, 그 외엔 icontains
+# 직접 지정: postgres / sqlite_fts / memory(프로세스 내 역색인) / like
+POLLS_SEARCH_BACKEND = os.environ.get("POLLS_SEARCH_BACKEND", "auto")
+# memory 백엔드: 재색인 주기(초), 이보다 많은 id 가 나오면 LIKE 로 대신
+POLLS_SEARCH_MEMORY_MAX_AGE = int(os.environ.get("POLLS_SEARCH_MEMORY_MAX_AGE", "300"))
+POLLS_SEARCH_MEMORY_MAX_IDS = int(os.environ.get("POLLS_SEARCH_MEMORY_MAX_IDS", "10000"))
+
+# 요청 성능 측정 (polls.middleware.RequestTimingMiddleware)
+# URL 이름별로 최근 몇 개 요청으로 p50/p95/p99 를 계산할지
+# 결과는 /polls/timings/ (관리자 전용)
+POLLS_REQUEST_TIMING_WINDOW = int(os.environ.get("POLLS_REQUEST_TIMING_WINDOW", "500"))
+
+# Prometheus 메트릭 (/metrics, polls/metrics.py)
+# 워커마다 POLLS_METRICS_DIR/<pid>.json 에 값을 저장하고 /metrics 에서 합산한다.
+# 카운터가 이전 실행 값까지 더해지지 않도록 서버 시작 전에 디렉터리를 비울 것.
+# gauge(연결 풀 크기 등)는 pid 가 살아 있는 파일만 합산하므로 종료/재시작된 워커 값은 빠진다.
+POLLS_METRICS_DIR = os.environ.get(
+    "POLLS_METRICS_DIR", os.path.join(tempfile.gettempdir(), "django_polls_metrics")
+)
+# 변경 후 파일에 반영되기까지 최대 지연(초)
+POLLS_METRICS_FLUSH_INTERVAL = float(os.environ.get("POLLS_METRICS_FLUSH_INTERVAL", "1.0"))
+# 설정하면 /metrics 요청에 "Authorization: Bearer <토큰>" 이 필요
+POLLS_METRICS_TOKEN = os.environ.get("POLLS_METRICS_TOKEN", "")
+
+# 결과 실시간 전송 (SSE, polls/live.py)
+# 질문당 초당 최대 전송 횟수 (그 사이 투표는 합쳐서 보냄)
+POLLS_LIVE_MAX_UPDATES_PER_SECOND = float(os.environ.get("POLLS_LIVE_MAX_UPDATES_PER_SECOND", "2"))
+# 다른 워커의 투표를 알아채려고 공유 버전 카운터를 확인하는 주기(초)
+POLLS_LIVE_POLL_INTERVAL = float(os.environ.get("POLLS_LIVE_POLL_INTERVAL", "1.0"))
+# 연결 유지용 주석 전송 간격 / 한 연결의 최대 시간(초, 끝나면 브라우저가 재연결)
+POLLS_LIVE_HEARTBEAT = int(os.environ.get("POLLS_LIVE_HEARTBEAT", "15"))
+POLLS_LIVE_MAX_DURATION = int(os.environ.get("POLLS_LIVE_MAX_DURATION", "300"))
+# 스트리밍은 ASGI(POLLS_ASYNC_VIEWS=1) 에서만. WSGI 에서는 결과 페이지가 JSON API 를 이 간격(초)으로
+# 다시 읽고, /live/ 도 스레드를 잡지 않고 스냅샷 한 건 + 이 간격의 retry 만 돌려준다
+POLLS_LIVE_FALLBACK_INTERVAL = int(os.environ.get("POLLS_LIVE_FALLBACK_INTERVAL", "5"))
+
+# 템플릿 조각 / 목록 캐시
+# 목록은 검색 조건별로 POLLS_INDEX_CACHE_TTL 초 (질문 저장/삭제 시 즉시 무효화)
+POLLS_FRAGMENT_CACHE_ALIAS = "polls_fragments"
+POLLS_INDEX_CACHE_TTL = int(os.environ.get("POLLS_INDEX_CACHE_TTL", "60"))
+
+# 익명 사용자 전체 페이지 캐시 (polls/page_cache.py)
+# TTL 초 동안은 그대로, 그 뒤 STALE 초 동안은 한 요청이 다시 만드는 사이 이전 응답을 준다.
+POLLS_PAGE_CACHE = os.environ.get("POLLS_PAGE_CACHE", "1") == "1"
+POLLS_PAGE_CACHE_ALIAS = "polls_pages"
+POLLS_PAGE_CACHE_VIEWS = ["polls:index", "polls:detail", "polls:results"]
+POLLS_PAGE_CACHE_TTL = int(os.environ.get("POLLS_PAGE_CACHE_TTL", "10"))
+POLLS_PAGE_CACHE_STALE = int(os.environ.get("POLLS_PAGE_CACHE_STALE", "30"))
+
+# 인기순/급상승 정렬 (polls/ranking.py)
+# 급상승 점수의 반감기(초)와 decay_trending --loop 주기(초)
+POLLS_TRENDING_HALF_LIFE = int(os.environ.get("POLLS_TRENDING_HALF_LIFE", str(6 * 3600)))
+POLLS_TRENDING_DECAY_INTERVAL = int(os.environ.get("POLLS_TRENDING_DECAY_INTERVAL", "600"))
+# 인기순/급상승 목록 캐시 TTL (투표로 순서가 바뀌므로 목록 캐시보다 짧게)
+POLLS_RANKED_INDEX_CACHE_TTL = int(os.environ.get("POLLS_RANKED_INDEX_CACHE_TTL", "10"))
+
+# 투표 속도 제한 (polls/ratelimit.py, token bucket, 넘치면 DB 조회 전에 429)
+# 요율은 "개수/초": 질문별은 (세션 쿠키 또는 IP, 질문), 클라이언트별은 IP 하나의 전체 투표
+POLLS_VOTE_RATE_LIMIT = os.environ.get("POLLS_VOTE_RATE_LIMIT", "1") == "1"
+POLLS_VOTE_RATE_PER_QUESTION = os.environ.get("POLLS_VOTE_RATE_PER_QUESTION", "5/60")
+POLLS_VOTE_RATE_PER_CLIENT = os.environ.get("POLLS_VOTE_RATE_PER_CLIENT", "60/60")
+# memory: 워커마다 따로 / mmap: 워커끼리 POLLS_VOTE_RATE_FILE 을 공유 (gunicorn -w 2 이상이면 mmap)
+POLLS_VOTE_RATE_BACKEND = os.environ.get("POLLS_VOTE_RATE_BACKEND", "memory")
+POLLS_VOTE_RATE_FILE = os.environ.get(
+    "POLLS_VOTE_RATE_FILE", os.path.join(tempfile.gettempdir(), "django_polls_vote_rate.bin")
+)
+POLLS_VOTE_RATE_SLOTS = int(os.environ.get("POLLS_VOTE_RATE_SLOTS", "65536"))
+POLLS_VOTE_RATE_MAX_ENTRIES = int(os.environ.get("POLLS_VOTE_RATE_MAX_ENTRIES", "100000"))
+# 실제 클라이언트 IP 를 읽을 곳 (IP 기준 규칙은 이 값으로 IP 를 알 수 있을 때만 적용)
+#   REMOTE_ADDR: 프록시 없이 직접 받을 때
+#   HTTP_X_FORWARDED_FOR: 프록시 뒤 (Render 에서는 기본값). 클라이언트가 왼쪽 값을 마음대로 넣을 수 있으므로
+#     신뢰하는 프록시가 붙인 오른쪽에서 POLLS_TRUSTED_PROXY_COUNT 번째 값을 쓴다
+#   "": REMOTE_ADDR 가 프록시 주소일 수 있어 IP 기준 규칙은 건너뛰고 세션 쿠키 기준 질문별 제한만
+POLLS_CLIENT_IP_HEADER = os.environ.get(
+    "POLLS_CLIENT_IP_HEADER", "HTTP_X_FORWARDED_FOR" if os.environ.get("RENDER") else "REMOTE_ADDR"
+)
+POLLS_TRUSTED_PROXY_COUNT = int(os.environ.get("POLLS_TRUSTED_PROXY_COUNT", "1"))
+
+# 질문당 한 표 (polls.Vote, polls/voters.py)
+# voter 별 투표한 질문 id 집합을 이 캐시에 두고 상세 화면의 "이미 투표함" 표시에 쓴다
+POLLS_VOTED_CACHE_ALIAS = "polls_voted"
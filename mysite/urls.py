@@ -17,12 +17,18 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from polls import views as polls_views
+
 
 urlpatterns = [
     # 앞에는 도메인, 뒤에는 include로 앱을 호출.
     path("polls/", include("polls.urls")),
     # http://127.0.0.1:8000/polls
 
+    # Prometheus 메트릭 (gunicorn 워커 전체 합산)
+    path("metrics", polls_views.metrics, name="metrics"),
+    # http://127.0.0.1:8000/metrics
+
     path('admin/', admin.site.urls),
     # http://127.0.0.1:8000/admin
 
@@ -14,3 +14,13 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
 
 application = get_wsgi_application()
+
+# 운영 모드(POLLS_TEMPLATE_CACHE)면 첫 요청 전에 템플릿을 미리 컴파일
+from polls.templates_warmup import precompile_on_startup  # noqa: E402
+
+precompile_on_startup()
+
+# 여러 워커인데 결과/버전 캐시가 워커별(locmem)이면 경고 로그 (gunicorn 은 system check 를 돌리지 않음)
+from polls.checks import warn_on_startup  # noqa: E402
+
+warn_on_startup()
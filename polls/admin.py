@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Question, Choice
+from .models import Question, Choice, Vote
 
 # Choice 인라인 (Tabular 형식)
 class ChoiceInline(admin.TabularInline):
@@ -13,10 +13,20 @@ class QuestionAdmin(admin.ModelAdmin):
         ("날짜정보", {"fields": ["pub_date"], "classes": ["collapse"]}),
     ]
     inlines = [ChoiceInline]
-    list_display = ["question_text", "pub_date", "was_published_recently"]
+    list_display = ["question_text", "pub_date", "was_published_recently", "total_votes", "choice_count"]
     list_filter = ["pub_date"]
     search_fields = ["question_text"]
 
 # 등록
 admin.site.register(Question, QuestionAdmin)
 admin.site.register(Choice)
+
+# 투표 기록 (질문당 한 사람 한 표)
+class VoteAdmin(admin.ModelAdmin):
+    list_display = ["voter", "question", "choice"]
+    list_select_related = ["question", "choice"]
+    raw_id_fields = ["question", "choice"]
+    search_fields = ["voter"]
+
+
+admin.site.register(Vote, VoteAdmin)
@@ -0,0 +1,118 @@
+import hashlib
+
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.http import condition, require_GET, require_POST
+
+from .models import Choice, Question
+from .pagination import keyset_page
+from .ratelimit import limit_votes
+from .results_cache import get_many_results, get_results
+from .versions import get_version, get_versions
+from .views import IndexView, filter_questions, list_columns
+from .voters import ALREADY_VOTED, remember_vote, voter_key
+from .votes import record_vote
+
+# JSON API (/polls/api/...)
+# 결과 조회는 질문별 버전 카운터로 만든 ETag 를 붙여서
+# If-None-Match 가 같으면 DB/캐시 조회 없이 304 Not Modified 를 돌려준다.
+
+# 한 번에 가져올 수 있는 최대 질문 수 (bulk 결과)
+BULK_RESULTS_LIMIT = 100
+
+
+def _question_json(question):
+    return {
+        "id": question.id,
+        "question_text": question.question_text,
+        "pub_date": question.pub_date.isoformat(),
+        "url": reverse("polls:api_question_detail", args=(question.id,)),
+    }
+
+
+def _parse_ids(value):
+    """'1,2,3' → [1, 2, 3] (숫자가 아닌 값은 무시, 중복 제거)"""
+    ids = []
+    for part in (value or "").split(","):
+        part = part.strip()
+        if part.isdigit() and int(part) not in ids:
+            ids.append(int(part))
+    return ids
+
+
+# ETag 계산 (condition 데코레이터가 If-None-Match 비교와 ETag 헤더를 처리)
+def _results_etag(request, pk):
+    return f"results-{pk}-{get_version(pk)}"
+
+
+def _bulk_results_etag(request):
+    ids = _parse_ids(request.GET.get("ids"))[:BULK_RESULTS_LIMIT]
+    versions = get_versions(ids)
+    raw = ",".join(f"{qid}-{versions[qid]}" for qid in ids)
+    return "results-" + hashlib.sha1(raw.encode()).hexdigest()
+
+
+@require_GET
+def question_list(request):
+    """질문 목록 (IndexView 와 같은 필터/정렬, cursor 페이지네이션)"""
+    qs, ordering = filter_questions(request.GET)
+    qs = qs.only(*list_columns(ordering))
+    items, next_cursor = keyset_page(
+        qs, ordering, request.GET.get("cursor"), IndexView.page_size
+    )
+    return JsonResponse({
+        "results": [_question_json(q) for q in items],
+        "next_cursor": next_cursor,
+    })
+
+
+@require_GET
+def question_detail(request, pk):
+    question = get_object_or_404(Question, pk=pk, pub_date__lte=timezone.now())
+    data = _question_json(question)
+    data["choices"] = [
+        {"id": choice_id, "choice_text": text}
+        for choice_id, text in question.choice_set.order_by("id").values_list("id", "choice_text")
+    ]
+    data["results_url"] = reverse("polls:api_question_results", args=(question.id,))
+    return JsonResponse(data)
+
+
+@require_GET
+@condition(etag_func=_results_etag)
+def question_results(request, pk):
+    question = get_object_or_404(Question.objects.only("id"), pk=pk)
+    return JsonResponse({"id": question.id, "results": get_results(question.id)})
+
+
+@require_GET
+@condition(etag_func=_bulk_results_etag)
+def bulk_results(request):
+    """?ids=1,2,3 → 여러 질문의 결과를 한 번에 (없는 질문은 제외)"""
+    ids = _parse_ids(request.GET.get("ids"))[:BULK_RESULTS_LIMIT]
+    existing = set(Question.objects.filter(pk__in=ids).values_list("id", flat=True))
+    results = get_many_results([qid for qid in ids if qid in existing])
+    return JsonResponse({
+        "results": [{"id": qid, "results": results[qid]} for qid in ids if qid in existing],
+    })
+
+
+@require_POST
+@limit_votes(json=True)
+def vote(request, pk):
+    question = get_object_or_404(Question, pk=pk)
+    try:
+        choice = question.choice_set.get(pk=request.POST["choice"])
+    except (KeyError, ValueError, Choice.DoesNotExist):
+        return JsonResponse({"error": "You didn't select a choice."}, status=400)
+    voter = voter_key(request, create=True)
+    if not record_vote(question.id, choice.id, voter):
+        return JsonResponse({"error": ALREADY_VOTED}, status=409)
+    remember_vote(voter, question.id)
+    return JsonResponse({
+        "question": question.id,
+        "choice": choice.id,
+        "results_url": reverse("polls:api_question_results", args=(question.id,)),
+    })
@@ -4,5 +4,6 @@ class PollsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "polls"
     
-    # def ready(self):
-    #     import polls.signals # 앱 시작 시 실행할 초기 설정
\ No newline at end of file
+    def ready(self):
+        # 앱 시작 시 signal 수신자 / system check 등록
+        from . import checks, counters, fragment_cache, live, metrics, results_cache, search, versions  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,88 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseRedirect
+from django.shortcuts import aget_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.views import generic
+
+from .fragment_cache import aget_index_page, normalize_index_params
+from .live import live_context
+from .models import Question
+from .pagination import akeyset_page
+from .ratelimit import limit_votes
+from .results_cache import aget_results
+from .views import IndexView as SyncIndexView
+from .views import choices_prefetch, filter_questions, index_json, list_columns, next_page_query
+from .voters import ALREADY_VOTED, aremember_vote, voter_key
+from .votes import arecord_vote
+
+# async 버전 목록/결과/투표 (ASGI 로 실행할 때 사용, POLLS_ASYNC_VIEWS=1)
+# async ORM(aget, aupdate, async for) 으로 DB 를 기다리는 동안 다른 요청을 처리한다.
+# 템플릿은 TemplateResponse 로 돌려줘서 Django 가 sync 스레드에서 렌더링하게 한다.
+# (request.user 같은 lazy 조회가 템플릿에서 일어나도 SynchronousOnlyOperation 이 나지 않게)
+
+
+# 메인 페이지 (질문 목록)
+class IndexView(generic.View):
+    template_name = "polls/index.html"
+    page_size = SyncIndexView.page_size
+
+    async def get(self, request):
+        async def build():
+            # 검색 백엔드 선택(테이블 조회)/메모리 색인 생성이 DB 를 쓸 수 있어서 sync 로
+            qs, ordering = await sync_to_async(filter_questions)(request.GET)
+            qs = qs.only(*list_columns(ordering))
+            return await akeyset_page(qs, ordering, request.GET.get("cursor"), self.page_size)
+
+        items, next_cursor, cache_key, cache_timeout = await aget_index_page(request.GET, build)
+        if request.GET.get("format") == "json":
+            return index_json(items, next_cursor)
+        return TemplateResponse(request, self.template_name, {
+            "index_filters": normalize_index_params(request.GET),
+            "index_cache_key": cache_key,
+            "index_cache_timeout": cache_timeout,
+            "latest_question_list": items,
+            "next_cursor": next_cursor,
+            "next_page_query": next_page_query(request.GET, next_cursor),
+        })
+
+
+# 결과 페이지
+class ResultsView(generic.View):
+    template_name = "polls/results.html"
+
+    async def get(self, request, pk):
+        question = await aget_object_or_404(Question.objects.only("id", "question_text"), pk=pk)
+        return TemplateResponse(request, self.template_name, {
+            "question": question,
+            "results": await aget_results(question.id),
+            **live_context(),
+        })
+
+
+# 투표 처리 로직
+@limit_votes()
+async def vote(request, question_id):
+    # 선택지를 미리 가져와서 검증/에러 화면 모두 추가 쿼리 없이 처리
+    question = await aget_object_or_404(
+        Question.objects.only("id", "question_text").prefetch_related(choices_prefetch()),
+        pk=question_id,
+    )
+    choice_id = request.POST.get("choice")
+    selected_choice = next(
+        (choice for choice in question.choice_set.all() if str(choice.pk) == choice_id), None
+    )
+    if selected_choice is None:
+        return TemplateResponse(request, "polls/detail.html", {
+            "question": question,
+            "error_message": "You didn't select a choice.",
+        })
+    voter = await sync_to_async(voter_key)(request, create=True)
+    if not await arecord_vote(question.id, selected_choice.id, voter):
+        return TemplateResponse(request, "polls/detail.html", {
+            "question": question,
+            "already_voted": True,
+            "error_message": ALREADY_VOTED,
+        }, status=409)
+    await aremember_vote(voter, question.id)
+    return HttpResponseRedirect(reverse("polls:results", args=(question.id,)))
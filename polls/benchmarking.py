@@ -0,0 +1,232 @@
+import http.client
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from .middleware import percentile
+
+# 벤치마크 공용 도구 (bench_polls, bench_asgi)
+# gunicorn 을 로컬 포트에 띄우고, 스레드마다 keep-alive 연결 하나로 요청을 보내
+# 응답 시간과 Server-Timing 헤더(RequestTimingMiddleware)의 SQL 개수/시간을 모은다.
+
+# gunicorn 설정 파일: 워커의 모든 DB 연결에 쿼리 지연 추가 (원격 DB 왕복 시간 흉내)
+LATENCY_CONFIG = """
+import time
+
+
+def post_worker_init(worker):
+    from django.db.backends.signals import connection_created
+
+    def add_latency(sender, connection, **kwargs):
+        def wrapper(execute, sql, params, many, context):
+            time.sleep({delay})
+            return execute(sql, params, many, context)
+
+        # 요청마다 넣고 빼는 다른 wrapper(RequestTimingMiddleware) 에 밀려 빠지지 않도록 맨 앞에
+        connection.execute_wrappers.insert(0, wrapper)
+
+    connection_created.connect(add_latency, weak=False)
+"""
+
+SERVERS = {
+    "wsgi": {"app": "mysite.wsgi:application", "args": [], "async_views": "0"},
+    "asgi": {"app": "mysite.asgi:application", "args": ["-k", "asgi"], "async_views": "1"},
+}
+
+SERVER_TIMING_RE = re.compile(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) queries")?')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url, proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                response.read()
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not answer {url}")
+
+
+@contextmanager
+def running_server(app, args=(), env=None, db_latency_ms=0, ready_path="/polls/"):
+    """gunicorn 을 띄우고 (host, port) 를 넘긴다. 블록이 끝나면 종료"""
+    port = free_port()
+    cmd = [
+        sys.executable, "-m", "gunicorn", app,
+        "-b", f"127.0.0.1:{port}", "--log-level", "warning", *args,
+    ]
+    with tempfile.NamedTemporaryFile("w", suffix=".py") as config:
+        if db_latency_ms:
+            config.write(LATENCY_CONFIG.format(delay=db_latency_ms / 1000))
+            config.flush()
+            cmd += ["-c", config.name]
+        proc = subprocess.Popen(cmd, cwd=settings.BASE_DIR, env={**os.environ, **(env or {})})
+        try:
+            wait_ready(f"http://127.0.0.1:{port}{ready_path}", proc)
+            yield "127.0.0.1", port
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+def parse_server_timing(value):
+    """'db;dur=1.2;desc="3 queries", tpl;dur=..., total;dur=...' → dict"""
+    result = {}
+    for name, duration, queries in SERVER_TIMING_RE.findall(value or ""):
+        result[f"{name}_ms"] = float(duration)
+        if queries:
+            result["queries"] = int(queries)
+    return result
+
+
+class Client:
+    """스레드 하나가 쓰는 keep-alive HTTP 클라이언트 (끊기면 다시 연결)"""
+
+    def __init__(self, host, port, timeout=30):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.cookies = {}
+        self.keep_cookies = False  # True 면 응답의 Set-Cookie 를 계속 반영 (세션 유지)
+        self._conn = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        for attempt in (1, 2):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._conn.request(method, path, body=body, headers=headers)
+                response = self._conn.getresponse()
+                content = response.read()
+            except (ConnectionError, http.client.HTTPException):
+                # 서버가 keep-alive 연결을 닫은 경우 한 번 다시 시도
+                self._conn.close()
+                self._conn = None
+                if attempt == 2:
+                    raise
+                continue
+            if response.getheader("Connection", "").lower() == "close":
+                self._conn.close()
+                self._conn = None
+            if self.keep_cookies:
+                self.remember_cookies(response)
+            return response.status, response, content
+
+    def remember_cookies(self, response):
+        for header in response.headers.get_all("Set-Cookie") or ():
+            name, _, rest = header.partition("=")
+            self.cookies[name.strip()] = rest.split(";", 1)[0]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+
+
+def run_load(host, port, make_request, concurrency, duration, setup=None):
+    """
+    concurrency 개 스레드가 duration 초 동안 make_request(client, i) → (method, path, body, headers)
+    를 반복해서 보낸다. setup(client) 는 측정 전에 스레드마다 한 번 (CSRF 쿠키 받기 등).
+    409(이미 투표함 등)는 처리량/응답 시간에 넣지 않고 conflicts 로 따로 센다.
+    """
+    samples = []
+    errors, conflicts = [0], [0]
+    lock = threading.Lock()
+    start_gate = threading.Barrier(concurrency + 1)
+    deadline = [0.0]
+
+    def worker(offset):
+        client = Client(host, port)
+        local, failed, conflicted, i = [], 0, 0, offset
+        try:
+            if setup is not None:
+                setup(client)
+        finally:
+            start_gate.wait()
+        while time.perf_counter() < deadline[0]:
+            method, path, body, headers = make_request(client, i)
+            i += concurrency
+            started = time.perf_counter()
+            try:
+                status, response, _ = client.request(method, path, body, headers)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                continue
+            elapsed = time.perf_counter() - started
+            if status == 409:
+                conflicted += 1
+                continue
+            if status >= 400:
+                failed += 1
+            local.append((
+                elapsed, status,
+                parse_server_timing(response.getheader("Server-Timing")),
+                response.getheader("X-Page-Cache"),
+            ))
+        client.close()
+        with lock:
+            samples.extend(local)
+            errors[0] += failed
+            conflicts[0] += conflicted
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    deadline[0] = time.perf_counter() + duration
+    started = time.perf_counter()
+    start_gate.wait()
+    for t in threads:
+        t.join()
+    return summarize(samples, errors[0], time.perf_counter() - started, conflicts[0])
+
+
+def _pcts(values, scale=1.0):
+    values = sorted(values)
+    if not values:
+        return {}
+    return {
+        "p50": round(percentile(values, 50) * scale, 3),
+        "p95": round(percentile(values, 95) * scale, 3),
+        "p99": round(percentile(values, 99) * scale, 3),
+        "max": round(values[-1] * scale, 3),
+        "mean": round(sum(values) / len(values) * scale, 3),
+    }
+
+
+def summarize(samples, errors, elapsed, conflicts=0):
+    statuses, cache = {}, {}
+    for _, status, _, cache_result in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        if cache_result:
+            cache[cache_result] = cache.get(cache_result, 0) + 1
+    timings = [timing for _, _, timing, _ in samples if timing]
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "conflicts": conflicts,
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": _pcts([s[0] for s in samples], 1000),
+        "queries": _pcts([t.get("queries", 0) for t in timings]),
+        "db_ms": _pcts([t.get("db_ms", 0.0) for t in timings]),
+        "status": statuses,
+        "page_cache": cache,
+    }
@@ -0,0 +1,38 @@
+import os
+import time
+
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+class LRUFileBasedCache(FileBasedCache):
+    """
+    파일 캐시 + LRU 정리.
+    기본 FileBasedCache 는 MAX_ENTRIES 를 넘으면 무작위로 지우지만,
+    여기서는 읽을 때마다 파일 mtime 을 갱신하고 가장 오래 안 쓰인 것부터 지운다.
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, default, version)
+        if value is not default:
+            try:
+                os.utime(self._key_to_file(key, version), ns=(time.time_ns(), time.time_ns()))
+            except FileNotFoundError:
+                pass
+        return value
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+        by_access = []
+        for fname in filelist:
+            try:
+                by_access.append((os.stat(fname).st_mtime_ns, fname))
+            except FileNotFoundError:
+                pass
+        by_access.sort()
+        for _, fname in by_access[: int(num_entries / self._cull_frequency)]:
+            self._delete(fname)
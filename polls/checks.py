@@ -0,0 +1,91 @@
+import logging
+import os
+import shlex
+import sys
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Warning, register
+
+logger = logging.getLogger(__name__)
+
+# manage.py check / runserver / migrate 때 실행되는 설정 점검
+# gunicorn 은 system check 를 돌리지 않으므로 wsgi.py/asgi.py 가 시작할 때 warn_on_startup() 으로 로그를 남긴다
+
+
+def _is_locmem(alias):
+    return isinstance(caches[alias], LocMemCache)
+
+
+def configured_workers():
+    """
+    gunicorn 워커 수 (모르면 1).
+    우선순위는 gunicorn 과 같다: 명령행 -w > GUNICORN_CMD_ARGS > WEB_CONCURRENCY
+    """
+    workers = os.environ.get("WEB_CONCURRENCY", "1")
+    args = shlex.split(os.environ.get("GUNICORN_CMD_ARGS", ""))
+    if "gunicorn" in os.path.basename(sys.argv[0]) or "gunicorn" in sys.argv[0].split(os.sep):
+        args += sys.argv[1:]
+    for i, arg in enumerate(args):
+        if arg in ("-w", "--workers") and i + 1 < len(args):
+            workers = args[i + 1]
+        elif arg.startswith("--workers="):
+            workers = arg.partition("=")[2]
+        elif arg.startswith("-w") and arg[2:].isdigit():
+            workers = arg[2:]
+    try:
+        return int(workers)
+    except ValueError:
+        return 1
+
+
+@register()
+def check_versions_cache(app_configs, **kwargs):
+    """질문 버전 캐시가 워커별(locmem)이면 다른 워커의 투표 뒤에도 304/예전 결과를 줄 수 있다"""
+    alias = getattr(settings, "POLLS_VERSIONS_CACHE_ALIAS", "polls_versions")
+    if not _is_locmem(alias):
+        return []
+    return [
+        Warning(
+            f"The '{alias}' cache is per-process (locmem).",
+            hint=(
+                "ETags, cached results and cached pages only see votes handled by the same "
+                "worker. Use POLLS_VERSIONS_CACHE_BACKEND=file (the default) when running "
+                "more than one worker."
+            ),
+            id="polls.W001",
+        )
+    ]
+
+
+@register()
+def check_results_cache_workers(app_configs, **kwargs):
+    """
+    locmem 결과 캐시는 투표 시 그 투표를 처리한 워커의 항목만 지운다.
+    다른 워커는 공유 버전으로 알아채므로, 버전 캐시까지 locmem 이면서 워커가 여럿일 때 경고.
+    """
+    workers = configured_workers()
+    results = getattr(settings, "POLLS_RESULTS_CACHE_ALIAS", "polls_results")
+    versions = getattr(settings, "POLLS_VERSIONS_CACHE_ALIAS", "polls_versions")
+    if workers <= 1 or not (_is_locmem(results) and _is_locmem(versions)):
+        return []
+    return [
+        Warning(
+            f"{workers} gunicorn workers are configured but the '{results}' and '{versions}' "
+            "caches are per-process (locmem).",
+            hint=(
+                "A vote only invalidates cached results in the worker that handled it; the "
+                "others keep serving old counts until POLLS_RESULTS_CACHE_TTL. Set "
+                "POLLS_VERSIONS_CACHE_BACKEND=file or POLLS_RESULTS_CACHE_BACKEND=file."
+            ),
+            id="polls.W002",
+        )
+    ]
+
+
+def warn_on_startup():
+    """서버 프로세스 시작 시 위 점검 결과를 로그로 (gunicorn 은 check 를 돌리지 않음)"""
+    for check in (check_versions_cache, check_results_cache_workers):
+        for message in check(None):
+            logger.warning("%s: %s HINT: %s", message.id, message.msg, message.hint)
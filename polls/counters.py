@@ -0,0 +1,63 @@
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Choice, Question
+
+# Question.total_votes / choice_count (비정규화 집계)
+# 항상 total_votes = 선택지 votes 합계, choice_count = 선택지 수 가 되도록 유지한다.
+#   - 투표: polls/votes.py 가 Choice.votes 와 같은 트랜잭션에서 total_votes 를 더한다
+#     (shard 모드는 shard 를 votes 로 합칠 때(compact_shards) 같이 더한다)
+#   - 선택지 저장/삭제: 아래 signal 에서 그 질문의 집계를 UPDATE 한 번으로 다시 계산
+#   - bulk 가져오기: importers 가 질문을 만들 때 값을 직접 채운다
+# 그 밖의 경로(raw SQL, 큐 유실 등)로 어긋났으면 repair_question_counters 로 복구한다.
+
+
+def actual_counters():
+    """질문별 실제 (투표 합계, 선택지 수) 서브쿼리 식"""
+    choices = Choice.objects.filter(question=OuterRef("pk")).order_by().values("question")
+    total_votes = Coalesce(Subquery(choices.annotate(total=Sum("votes")).values("total")), 0)
+    choice_count = Coalesce(Subquery(choices.annotate(n=Count("pk")).values("n")), 0)
+    return total_votes, choice_count
+
+
+def refresh_counters(question_ids):
+    """주어진 질문들의 집계를 다시 계산 (UPDATE 한 번)"""
+    total_votes, choice_count = actual_counters()
+    return Question.objects.filter(pk__in=list(question_ids)).update(
+        total_votes=total_votes, choice_count=choice_count
+    )
+
+
+def stale_counters(queryset=None):
+    """집계가 실제와 다른 질문들"""
+    total_votes, choice_count = actual_counters()
+    queryset = Question.objects.all() if queryset is None else queryset
+    return queryset.annotate(
+        actual_votes=total_votes, actual_choices=choice_count
+    ).exclude(total_votes=F("actual_votes"), choice_count=F("actual_choices"))
+
+
+def repair_counters(batch_size=5000):
+    """
+    id 순으로 batch_size 개씩 어긋난 질문만 고친다.
+    배치마다 (마지막 id, 검사한 범위의 고친 질문 수) 를 yield.
+    """
+    last = 0
+    while True:
+        ids = Question.objects.filter(pk__gt=last).order_by("pk").values_list("pk", flat=True)
+        upper = ids[batch_size - 1:batch_size].first() or ids.last()
+        if upper is None:
+            return
+        batch = Question.objects.filter(pk__gt=last, pk__lte=upper)
+        stale_ids = list(stale_counters(batch).values_list("pk", flat=True))
+        fixed = refresh_counters(stale_ids) if stale_ids else 0
+        yield upper, fixed
+        last = upper
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def _refresh_on_choice_change(sender, instance, **kwargs):
+    refresh_counters([instance.question_id])
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import zlib
+
+from django.db.models import Prefetch
+
+from .models import Choice
+from .votes import with_vote_totals
+
+# Question + Choice 내보내기 (NDJSON / CSV)
+# iterator(chunk_size) 로 조금씩 읽고 한 줄씩 내보내므로
+# 행 수와 관계없이 메모리 사용량이 일정하다.
+
+EXPORT_FORMATS = ("ndjson", "csv")
+CSV_HEADER = [
+    "question_id", "question_text", "pub_date",
+    "choice_id", "choice_text", "votes",
+]
+
+
+def export_queryset(questions):
+    """
+    내보낼 질문 쿼리셋을 id 순으로 정렬하고
+    선택지는 shard 합계를 더한 득표수(vote_total)와 함께 prefetch.
+    """
+    return questions.order_by("id").prefetch_related(
+        Prefetch("choice_set", queryset=with_vote_totals(Choice.objects.order_by("id")))
+    )
+
+
+def iter_ndjson(questions, chunk_size=2000):
+    """질문 하나당 한 줄 (선택지는 choices 배열)"""
+    for question in questions.iterator(chunk_size=chunk_size):
+        yield json.dumps({
+            "id": question.id,
+            "question_text": question.question_text,
+            "pub_date": question.pub_date.isoformat(),
+            "choices": [
+                {"id": c.id, "choice_text": c.choice_text, "votes": c.vote_total}
+                for c in question.choice_set.all()
+            ],
+        }, ensure_ascii=False) + "\n"
+
+
+def iter_csv(questions, chunk_size=2000):
+    """선택지 하나당 한 행 (선택지가 없는 질문은 choice 칸을 비운 한 행)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    writer.writerow(CSV_HEADER)
+    yield flush()
+    for question in questions.iterator(chunk_size=chunk_size):
+        base = [question.id, question.question_text, question.pub_date.isoformat()]
+        choices = question.choice_set.all()
+        if not choices:
+            writer.writerow(base + ["", "", ""])
+        for c in choices:
+            writer.writerow(base + [c.id, c.choice_text, c.vote_total])
+        yield flush()
+
+
+def iter_export(fmt, questions, chunk_size=2000):
+    if fmt == "csv":
+        return iter_csv(questions, chunk_size)
+    return iter_ndjson(questions, chunk_size)
+
+
+def gzip_stream(chunks, level=6):
+    """문자열 조각들을 gzip 으로 바로바로 압축해서 bytes 조각으로 내보낸다"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,153 @@
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Question
+from .versions import new_version, shared_cache
+
+# 템플릿 조각/목록 캐시 (polls_fragments 캐시)
+# head/header/footer 는 템플릿의 {% cache %} 로, 목록 페이지는 여기서 관리한다.
+# 목록 캐시 키 = 목록 세대(generation) + 정규화한 검색 조건(q/show/start/end/order/cursor)
+# 질문이 저장/삭제되면 세대를 바꿔서 이전 키를 한꺼번에 버린다 (지우지 않고 TTL 로 사라짐).
+# 세대는 워커끼리 공유되는 polls_versions 캐시(polls/versions.py)에 두어서
+# 한 워커의 저장/삭제를 다른 워커의 목록 캐시/페이지 캐시도 바로 본다.
+
+GENERATION_KEY = "polls:index:generation"
+NEXT_PUB_KEY = "polls:index:next-pub"
+PAGE_KEY = "polls:index:page"
+# 투표로 순서가 바뀌는 정렬 (질문 저장/삭제로는 세대가 안 바뀌므로 짧은 TTL 로만 갱신)
+RANKED_ORDERS = ("popular", "trending")
+
+
+def _cache():
+    return caches[getattr(settings, "POLLS_FRAGMENT_CACHE_ALIAS", "polls_fragments")]
+
+
+def _timeout():
+    return getattr(settings, "POLLS_INDEX_CACHE_TTL", 60)
+
+
+def index_generation():
+    cache = shared_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, new_version(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_index_generation():
+    # 질문 버전과 같은 이유로 incr 대신 새 무작위 값 (파일 캐시 incr 는 프로세스 사이에서 원자적이지 않음)
+    shared_cache().set(GENERATION_KEY, new_version(), timeout=None)
+
+
+def _store_next_pub(cache, generation):
+    next_pub = (
+        Question.objects.filter(pub_date__gt=timezone.now())
+        .order_by("pub_date")
+        .values_list("pub_date", flat=True)
+        .first()
+    )
+    # None(미래 질문 없음)도 캐시해야 하므로 튜플로 감싼다
+    cache.set(f"{NEXT_PUB_KEY}:{generation}", (next_pub,), _timeout() * 10)
+    return next_pub
+
+
+def next_pub_date(generation):
+    """
+    현재 세대에서 아직 공개되지 않은 가장 가까운 pub_date (없으면 None).
+    세대가 바뀐 뒤 첫 목록 요청에서 한 번 계산한다 (질문 저장 signal 에서는 쿼리하지 않음).
+    """
+    cache = _cache()
+    cached = cache.get(f"{NEXT_PUB_KEY}:{generation}")
+    if cached is not None and (cached[0] is None or cached[0] > timezone.now()):
+        return cached[0]
+    # 캐시가 비었거나 그 시각이 지났으면 다시 계산
+    return _store_next_pub(cache, generation)
+
+
+def normalize_index_params(params):
+    """같은 목록이 나오는 쿼리스트링은 같은 값이 되도록 정리"""
+    from .views import _parse_yyyy_mm_dd
+
+    start = _parse_yyyy_mm_dd(params.get("start"))
+    end = _parse_yyyy_mm_dd(params.get("end"))
+    return {
+        "q": " ".join((params.get("q") or "").split()),
+        "show": "future" if params.get("show") == "future" else "",
+        "start": start.isoformat() if start else "",
+        "end": end.isoformat() if end else "",
+        "order": params.get("order") if params.get("order") in RANKED_ORDERS + ("oldest",) else "",
+        "cursor": params.get("cursor") or "",
+    }
+
+
+def index_cache_key(params, generation=None):
+    generation = index_generation() if generation is None else generation
+    normalized = json.dumps(normalize_index_params(params), sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha1(normalized.encode()).hexdigest()
+    return f"{generation}:{digest}"
+
+
+def index_cache_timeout(params, generation=None):
+    """
+    TTL. 미래 질문을 숨기는 목록은 가장 가까운 미래 질문이 공개되는 시각까지만 캐시한다
+    (공개 시각이 지나는 것은 save/delete 가 아니라서 세대가 바뀌지 않으므로).
+    """
+    timeout = _timeout()
+    if params.get("order") in RANKED_ORDERS:
+        timeout = min(timeout, getattr(settings, "POLLS_RANKED_INDEX_CACHE_TTL", 10))
+    if params.get("show") != "future":
+        generation = index_generation() if generation is None else generation
+        next_pub = next_pub_date(generation)
+        if next_pub is not None:
+            seconds = (next_pub - timezone.now()).total_seconds()
+            timeout = max(1, min(timeout, int(seconds) + 1))
+    return timeout
+
+
+def _lookup(params):
+    generation = index_generation()
+    key = index_cache_key(params, generation)
+    return key, index_cache_timeout(params, generation)
+
+
+def get_index_page(params, build):
+    """
+    캐시된 (items, next_cursor, key, timeout) 을 반환. 없으면 build() 로 만들어 저장.
+    key/timeout 은 템플릿 {% cache %} 에 그대로 넘겨 같은 조건의 목록 HTML 도 재사용한다.
+    """
+    key, timeout = _lookup(params)
+    cache = _cache()
+    cached = cache.get(f"{PAGE_KEY}:{key}")
+    if cached is not None:
+        items, next_cursor = cached
+    else:
+        items, next_cursor = build()
+        cache.set(f"{PAGE_KEY}:{key}", (items, next_cursor), timeout)
+    return items, next_cursor, key, timeout
+
+
+async def aget_index_page(params, abuild):
+    """get_index_page 의 async 버전 (abuild 는 코루틴 함수)"""
+    key, timeout = await sync_to_async(_lookup)(params)
+    cache = _cache()
+    cached = await cache.aget(f"{PAGE_KEY}:{key}")
+    if cached is not None:
+        items, next_cursor = cached
+    else:
+        items, next_cursor = await abuild()
+        await cache.aset(f"{PAGE_KEY}:{key}", (items, next_cursor), timeout)
+    return items, next_cursor, key, timeout
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def _bump_on_question_change(sender, **kwargs):
+    bump_index_generation()
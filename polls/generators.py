@@ -0,0 +1,90 @@
+import datetime
+import random
+
+# 대용량 테스트 데이터 생성
+# import_records(polls/importers.py) 가 받는 것과 같은 레코드를 만들어서
+# 질문은 bulk_create, 선택지는 COPY/executemany 로 배치 단위로 넣는다.
+# 같은 seed + anchor(기준 시각) 이면 항상 같은 데이터가 나온다.
+#   pub_date: 과거는 최근일수록 많게(지수 분포), future_ratio 만큼은 앞으로 future_days 일 안
+#   질문 문구: 한국어/영어 템플릿 × 주제
+#   투표 수: 질문별 총 투표는 긴 꼬리(파레토), 선택지끼리는 Zipf (k 번째 인기 선택지 ∝ 1/k^s)
+
+TOPICS = [
+    ("프로그래밍 언어", "programming language", ["Python", "Java", "Go", "Rust", "JavaScript", "C++", "Kotlin", "Swift"]),
+    ("점심 메뉴", "lunch menu", ["김치찌개", "비빔밥", "Ramen", "Pizza", "Salad", "Burger", "국밥", "Sushi"]),
+    ("여행지", "travel destination", ["제주", "부산", "Tokyo", "Paris", "New York", "Bangkok", "강릉", "London"]),
+    ("운동", "sport", ["축구", "야구", "Basketball", "Tennis", "수영", "Running", "Yoga", "Climbing"]),
+    ("웹 프레임워크", "web framework", ["Django", "Flask", "FastAPI", "Rails", "Spring", "Express", "Laravel", "Next.js"]),
+    ("영화 장르", "movie genre", ["액션", "코미디", "Drama", "Horror", "SF", "Romance", "Documentary", "Animation"]),
+    ("음료", "drink", ["아메리카노", "라떼", "Tea", "Juice", "Water", "Cola", "식혜", "Smoothie"]),
+    ("개발 도구", "developer tool", ["VS Code", "PyCharm", "Vim", "Emacs", "IntelliJ", "Sublime", "Zed", "Neovim"]),
+]
+
+KOREAN_TEMPLATES = [
+    "가장 좋아하는 {topic}은(는)?",
+    "요즘 {topic} 중에 뭐가 제일 나아요?",
+    "다음 주에 고를 {topic}은(는)?",
+    "{topic} 하나만 고른다면?",
+]
+
+ENGLISH_TEMPLATES = [
+    "What is your favorite {topic}?",
+    "Which {topic} would you pick next week?",
+    "Best {topic} right now?",
+    "If you could choose only one {topic}, which one?",
+]
+
+
+def zipf_split(total, n, s, rng):
+    """total 표를 n 개 선택지에 Zipf(s) 비율로 나눈다. 인기 순위는 선택지 순서와 무관하게 섞는다"""
+    weights = [1 / (rank ** s) for rank in range(1, n + 1)]
+    norm = sum(weights)
+    counts = [int(total * w / norm) for w in weights]
+    counts[0] += total - sum(counts)  # 버림으로 남은 표는 1위에
+    rng.shuffle(counts)
+    return counts
+
+
+def generate_records(
+    count,
+    seed=0,
+    anchor=None,
+    past_days=365,
+    future_ratio=0.05,
+    future_days=30,
+    korean_ratio=0.5,
+    min_choices=2,
+    max_choices=6,
+    zipf_s=1.1,
+    mean_votes=50,
+):
+    """import_records 에 넘길 레코드를 count 개 만든다 (generator)"""
+    rng = random.Random(seed)
+    anchor = anchor or datetime.datetime.now(datetime.timezone.utc)
+    # 파레토(alpha) 평균 = alpha / (alpha - 1) → mean_votes 가 평균이 되도록 배율 조정
+    alpha = 1.5
+    votes_scale = mean_votes * (alpha - 1) / alpha
+    for i in range(count):
+        korean_topic, english_topic, options = TOPICS[rng.randrange(len(TOPICS))]
+        if rng.random() < korean_ratio:
+            text = rng.choice(KOREAN_TEMPLATES).format(topic=korean_topic)
+        else:
+            text = rng.choice(ENGLISH_TEMPLATES).format(topic=english_topic)
+
+        if rng.random() < future_ratio:
+            offset = datetime.timedelta(seconds=rng.uniform(60, future_days * 86400))
+        else:
+            # 평균 past_days/5 일 전, past_days 를 넘으면 잘라냄
+            days = min(rng.expovariate(5 / past_days), past_days)
+            offset = -datetime.timedelta(days=days)
+
+        n_choices = rng.randint(min_choices, min(max_choices, len(options)))
+        picked = rng.sample(options, n_choices)
+        total = int(rng.paretovariate(alpha) * votes_scale)
+        votes = zipf_split(total, n_choices, zipf_s, rng)
+        yield {
+            "id": None,
+            "question_text": f"{text} #{i + 1}",
+            "pub_date": (anchor + offset).isoformat(),
+            "choices": list(zip(picked, votes)),
+        }
@@ -0,0 +1,143 @@
+import csv
+import gzip
+import io
+import json
+import sys
+from itertools import groupby
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .fragment_cache import bump_index_generation
+from .models import Choice, Question
+from .search import build_search_document, get_search_backend
+
+# Question + Choice 대량 가져오기
+# 입력은 export_polls 와 같은 형식(NDJSON: 질문 한 줄에 choices 배열 / CSV: 선택지 한 행)
+# 질문은 bulk_create 로 넣어서 새 id 를 돌려받고, 그 id 로 외래키를 채운 선택지를
+# PostgreSQL 은 COPY FROM STDIN, 그 외 DB 는 batch 단위 executemany 로 넣는다.
+# (선택지는 모델 객체를 만들 필요가 없어서 bulk_create 보다 몇 배 빠르다)
+
+
+def open_input(path):
+    """경로('-' 은 stdin) → 텍스트 스트림. .gz 는 풀어서 읽는다"""
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8", newline="")
+
+
+def read_ndjson(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        row = json.loads(line)
+        yield {
+            "id": row.get("id"),
+            "question_text": row["question_text"],
+            "pub_date": row.get("pub_date"),
+            "choices": [
+                (c["choice_text"], int(c.get("votes") or 0))
+                for c in row.get("choices", [])
+            ],
+        }
+
+
+def read_csv(stream):
+    """같은 question_id 가 연속된 행을 질문 하나로 묶는다 (export 결과는 id 순)"""
+    rows = csv.DictReader(stream)
+    for question_id, group in groupby(rows, key=lambda r: r["question_id"]):
+        group = list(group)
+        yield {
+            "id": question_id,
+            "question_text": group[0]["question_text"],
+            "pub_date": group[0]["pub_date"],
+            "choices": [
+                (r["choice_text"], int(r["votes"] or 0))
+                for r in group if r["choice_text"]
+            ],
+        }
+
+
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
+
+
+def _parse_pub_date(value, default):
+    parsed = parse_datetime(value) if value else None
+    if parsed is None:
+        return default
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy_choices(rows):
+    """PostgreSQL: psycopg 3 COPY 로 선택지 적재"""
+    table = Choice._meta.db_table
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(
+            f"COPY {table} (question_id, choice_text, votes) FROM STDIN"
+        ) as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def _insert_choices(rows):
+    if connection.vendor == "postgresql":
+        _copy_choices(rows)
+        return
+    table = connection.ops.quote_name(Choice._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {table} (question_id, choice_text, votes) VALUES (%s, %s, %s)",
+            rows,
+        )
+
+
+def import_records(records, batch_size=5000):
+    """
+    레코드를 batch_size 개 질문씩 한 트랜잭션으로 넣는다.
+    배치마다 (질문 수, 선택지 수) 를 yield (진행 상황 출력용).
+    """
+    now = timezone.now()
+    backend = get_search_backend()
+    for batch in _batches(records, batch_size):
+        questions = [
+            Question(
+                question_text=r["question_text"],
+                pub_date=_parse_pub_date(r["pub_date"], now),
+                # bulk_create 는 save signal 을 거치지 않으므로 검색 문서를 직접 채움
+                search_document=build_search_document(r["question_text"]),
+                # 선택지는 signal 없이 넣으므로 집계도 여기서 채움 (polls/counters.py)
+                total_votes=sum(votes for _, votes in r["choices"]),
+                choice_count=len(r["choices"]),
+            )
+            for r in batch
+        ]
+        with transaction.atomic():
+            Question.objects.bulk_create(questions, batch_size=batch_size)
+            # bulk_create 가 돌려준 새 pk 로 외래키를 한꺼번에 연결
+            choice_rows = [
+                (question.pk, text, votes)
+                for question, record in zip(questions, batch)
+                for text, votes in record["choices"]
+            ]
+            _insert_choices(choice_rows)
+            backend.index_many(questions)
+        # bulk_create 는 save signal 이 없으므로 목록 캐시를 직접 무효화
+        bump_index_generation()
+        yield len(questions), len(choice_rows)
@@ -0,0 +1,179 @@
+import bisect
+import threading
+import time
+from array import array
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .models import Question
+from .search import LikeSearchBackend, is_hangul, tokenize
+
+# 메모리 역색인 (PostgreSQL 전문 검색을 쓸 수 없는 배포용)
+# token → 질문 id 정렬 배열(array('q')) 을 들고 있다가
+# 검색어 토큰들의 posting list 를 교집합해서 id 집합을 돌려준다.
+
+
+class InvertedIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}     # token → array('q') (오름차순 id)
+        self._doc_tokens = {}   # id → 토큰 튜플 (수정/삭제 시 기존 posting 제거용)
+        self._sorted_tokens = []
+        self._tokens_dirty = False
+        self.built_at = None
+
+    def __len__(self):
+        return len(self._doc_tokens)
+
+    # 색인 갱신
+    def add(self, doc_id, text):
+        tokens = tuple(dict.fromkeys(tokenize(text)))
+        with self._lock:
+            if doc_id in self._doc_tokens:
+                self._remove(doc_id)
+            self._doc_tokens[doc_id] = tokens
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    self._postings[token] = array("q", [doc_id])
+                    self._tokens_dirty = True
+                elif not postings or postings[-1] < doc_id:
+                    postings.append(doc_id)  # 새 질문은 보통 id 가 가장 크다
+                else:
+                    bisect.insort(postings, doc_id)
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        for token in self._doc_tokens.pop(doc_id, ()):
+            postings = self._postings[token]
+            i = bisect.bisect_left(postings, doc_id)
+            if i < len(postings) and postings[i] == doc_id:
+                del postings[i]
+            if not postings:
+                del self._postings[token]
+                self._tokens_dirty = True
+
+    def rebuild(self, rows):
+        """rows: (id, question_text) 이터러블 (QuerySet.iterator() 로 스트리밍)"""
+        index = InvertedIndex()
+        for doc_id, text in rows:
+            index.add(doc_id, text)
+        with self._lock:
+            self._postings = index._postings
+            self._doc_tokens = index._doc_tokens
+            self._tokens_dirty = True
+            self.built_at = time.monotonic()
+
+    # 조회
+    def _prefix_postings(self, prefix):
+        with self._lock:
+            if self._tokens_dirty:
+                self._sorted_tokens = sorted(self._postings)
+                self._tokens_dirty = False
+            tokens = self._sorted_tokens
+            i = bisect.bisect_left(tokens, prefix)
+            matched = []
+            while i < len(tokens) and tokens[i].startswith(prefix):
+                postings = self._postings.get(tokens[i])
+                if postings:
+                    matched.append(postings)
+                i += 1
+            return matched
+
+    def lookup(self, token, prefix=False):
+        """토큰(또는 prefix 로 시작하는 모든 토큰)을 가진 id 집합"""
+        if not prefix:
+            with self._lock:
+                return set(self._postings.get(token, ()))
+        ids = set()
+        for postings in self._prefix_postings(token):
+            ids.update(postings)
+        return ids
+
+    def search(self, terms):
+        """
+        terms: (토큰, prefix 여부) 목록. 모든 조건을 만족하는 id 집합 (AND).
+        작은 집합부터 교집합해서 빨리 비게 만든다.
+        """
+        sets = sorted((self.lookup(token, prefix) for token, prefix in terms), key=len)
+        if not sets:
+            return set()
+        result = sets[0]
+        for other in sets[1:]:
+            if not result:
+                break
+            result &= other
+        return result
+
+
+class MemorySearchBackend(LikeSearchBackend):
+    """
+    InvertedIndex 로 검색어 → 질문 id 집합을 구하고 pk__in 으로 필터.
+    색인은 첫 검색 때 Question 전체를 iterator() 로 읽어서 만들고,
+    이후엔 save/delete signal 로 갱신한다 (커밋된 변경만 반영).
+    다른 워커에서 생긴 변경은 POLLS_SEARCH_MEMORY_MAX_AGE 초마다 백그라운드 재색인으로 따라잡는다.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self.inverted = InvertedIndex()
+        self.max_age = getattr(settings, "POLLS_SEARCH_MEMORY_MAX_AGE", 300)
+        self.max_ids = getattr(settings, "POLLS_SEARCH_MEMORY_MAX_IDS", 10000)
+        self._build_lock = threading.Lock()
+        self._refreshing = False
+
+    def _rows(self):
+        return Question.objects.values_list("id", "question_text").iterator(chunk_size=2000)
+
+    def ensure_built(self):
+        if self.inverted.built_at is None:
+            with self._build_lock:
+                if self.inverted.built_at is None:
+                    self.inverted.rebuild(self._rows())
+        elif self.max_age and time.monotonic() - self.inverted.built_at > self.max_age:
+            self._refresh_in_background()
+
+    def _refresh_in_background(self):
+        with self._build_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.inverted.rebuild(self._rows())
+            finally:
+                self._refreshing = False
+                close_old_connections()
+
+        threading.Thread(target=run, name="polls-search-reindex", daemon=True).start()
+
+    def supports(self, tokens):
+        # 한글 한 글자는 bigram 으로 찾을 수 없으므로 LIKE 로
+        return bool(tokens) and not any(is_hangul(t) and len(t) == 1 for t in tokens)
+
+    def resolve(self, tokens):
+        """검색어 토큰 → 질문 id 집합 (영문은 prefix, 한글 bigram 은 정확히 일치)"""
+        self.ensure_built()
+        return self.inverted.search([(t, not is_hangul(t)) for t in tokens])
+
+    def filter(self, qs, query, tokens):
+        ids = self.resolve(tokens)
+        if len(ids) > self.max_ids:
+            # IN 목록이 너무 길어지면 LIKE 가 더 낫다
+            return super().filter(qs, query, tokens)
+        return qs.filter(pk__in=ids)
+
+    def index(self, question):
+        if self.inverted.built_at is not None:
+            pk, text = question.pk, question.question_text
+            transaction.on_commit(lambda: self.inverted.add(pk, text))
+
+    def remove(self, question_id):
+        if self.inverted.built_at is not None:
+            transaction.on_commit(lambda: self.inverted.remove(question_id))
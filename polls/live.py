@@ -0,0 +1,286 @@
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.dispatch import receiver
+
+from .results_cache import get_results
+from .signals import votes_recorded
+from .versions import get_version, get_versions
+
+logger = logging.getLogger(__name__)
+
+# 결과 실시간 전송 (Server-Sent Events)
+# 워커마다 LiveResultsBroadcaster 하나가 질문별 구독자 목록을 들고 있다가
+# 투표 알림이 오면 결과를 한 번만 읽어서(get_results) 모든 구독자에게 나눠준다.
+#   - 같은 워커의 투표: votes_recorded signal 로 바로 알림
+#   - 다른 워커의 투표: 공유 버전 카운터(polls/versions.py)를 poll_interval 마다 확인
+#     (polls_versions 캐시가 워커끼리 공유될 때만 보인다. 기본 파일 캐시)
+# 질문당 초당 max_rate 번 넘게는 보내지 않고, 그 사이의 투표는 다음 전송에 합친다.
+
+
+class Subscription:
+    """
+    구독자 한 명. 최신 이벤트 하나만 보관한다 (결과 전체를 보내므로 중간 이벤트는 버려도 된다).
+    loop 를 주면 asyncio 용(async for), 아니면 스레드용(blocking get).
+    """
+
+    def __init__(self, question_id, loop=None):
+        self.question_id = question_id
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=1) if loop else queue.Queue(maxsize=1)
+
+    def deliver(self, event):
+        # 브로드캐스터 스레드에서 호출
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._put, event)
+        else:
+            self._put(event)
+
+    def _put(self, event):
+        try:
+            self._queue.get_nowait()
+        except (queue.Empty, asyncio.QueueEmpty):
+            pass
+        self._queue.put_nowait(event)
+
+    def get(self, timeout):
+        """다음 이벤트 (timeout 초 동안 없으면 None)"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def aget(self, timeout):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LiveResultsBroadcaster:
+    def __init__(self, max_rate=2.0, poll_interval=1.0, autostart=True):
+        self.min_gap = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.poll_interval = poll_interval
+        self.autostart = autostart
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._subscribers = {}  # question_id → set[Subscription]
+        self._dirty = set()     # 다음 전송을 기다리는 질문
+        self._last_sent = {}    # question_id → 마지막 전송 시각 (monotonic)
+        self._snapshots = {}    # question_id → 마지막으로 보낸 이벤트
+        self._versions = {}     # question_id → 마지막으로 본 공유 버전
+        self._last_poll = 0.0
+        self._thread = None
+
+    # 구독
+    def subscribe(self, question_id, loop=None):
+        subscription = Subscription(question_id, loop)
+        with self._lock:
+            self._subscribers.setdefault(question_id, set()).add(subscription)
+            snapshot = self._snapshots.get(question_id)
+            if snapshot is None:
+                # 첫 구독자: 다음 루프에서 결과를 읽어 보낸다
+                self._dirty.add(question_id)
+        if snapshot is not None:
+            subscription.deliver(snapshot)
+        if self.autostart:
+            self.start()
+        self._wakeup.set()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.question_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                qid = subscription.question_id
+                del self._subscribers[qid]
+                for state in (self._last_sent, self._snapshots, self._versions):
+                    state.pop(qid, None)
+                self._dirty.discard(qid)
+
+    def subscriber_count(self, question_id):
+        with self._lock:
+            return len(self._subscribers.get(question_id, ()))
+
+    # 변경 알림
+    def notify(self, question_id):
+        with self._lock:
+            if question_id not in self._subscribers:
+                return
+            self._dirty.add(question_id)
+        self._wakeup.set()
+
+    def poll_versions(self):
+        """다른 워커에서 생긴 변경: 구독 중인 질문의 공유 버전이 바뀌었으면 dirty 로"""
+        with self._lock:
+            question_ids = list(self._subscribers)
+        if not question_ids:
+            return
+        versions = get_versions(question_ids)
+        with self._lock:
+            for qid, version in versions.items():
+                seen = self._versions.get(qid)
+                if seen is not None and seen != version and qid in self._subscribers:
+                    self._dirty.add(qid)
+
+    # 전송
+    def publish_due(self, now=None):
+        """
+        보낼 때가 된 질문들의 결과를 보내고, 다음에 확인해야 할 때까지 남은 시간(초)을 반환.
+        (질문당 min_gap 초에 한 번까지만)
+        """
+        now = time.monotonic() if now is None else now
+        wait = None
+        due = []
+        with self._lock:
+            for qid in list(self._dirty):
+                remaining = self._last_sent.get(qid, float("-inf")) + self.min_gap - now
+                if remaining <= 0:
+                    self._dirty.discard(qid)
+                    due.append(qid)
+                else:
+                    wait = remaining if wait is None else min(wait, remaining)
+        for qid in due:
+            self._publish(qid, now)
+        return wait
+
+    def _publish(self, question_id, now):
+        version = get_version(question_id)
+        results = get_results(question_id)  # 변경 후 첫 조회만 DB 를 읽는다
+        with self._lock:
+            subscribers = list(self._subscribers.get(question_id, ()))
+            if not subscribers:
+                return
+            previous = self._snapshots.get(question_id)
+            before = {r["id"]: r["votes"] for r in previous["results"]} if previous else {}
+            event = {
+                "question": question_id,
+                "version": version,
+                "results": results,
+                # 이전 전송 이후 늘어난 표 (첫 전송이면 빈 dict)
+                "deltas": {
+                    str(r["id"]): r["votes"] - before.get(r["id"], 0)
+                    for r in results
+                    if previous and r["votes"] != before.get(r["id"], 0)
+                },
+            }
+            self._snapshots[question_id] = event
+            self._versions[question_id] = version
+            self._last_sent[question_id] = now
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    # 백그라운드 스레드
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="polls-live-results", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            wait = self.poll_interval
+            try:
+                now = time.monotonic()
+                if now - self._last_poll >= self.poll_interval:
+                    self._last_poll = now
+                    self.poll_versions()
+                due_in = self.publish_due()
+                if due_in is not None:
+                    wait = min(wait, due_in)
+            except Exception:
+                logger.exception("live results broadcast failed")
+            finally:
+                close_old_connections()
+            self._wakeup.wait(wait)
+            self._wakeup.clear()
+
+
+def format_event(event):
+    """SSE 한 건 (id 는 질문 버전)"""
+    data = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event['version']}\nevent: results\ndata: {data}\n\n"
+
+
+def live_context():
+    """결과 페이지 템플릿용: ASGI 면 SSE 로 연결, WSGI 면 JSON API 를 주기적으로 다시 읽는다"""
+    return {
+        "live_stream": settings.POLLS_ASYNC_VIEWS,
+        "live_poll_interval": getattr(settings, "POLLS_LIVE_FALLBACK_INTERVAL", 5),
+    }
+
+
+def snapshot_results(question_id):
+    """
+    WSGI 용 SSE 응답 본문: 현재 결과 한 건만 보내고 끝낸다 (스레드를 붙잡지 않음).
+    브라우저 EventSource 는 retry 뒤에 다시 연결하므로 짧은 polling 이 된다.
+    """
+    interval = getattr(settings, "POLLS_LIVE_FALLBACK_INTERVAL", 5)
+    event = {
+        "question": question_id,
+        "version": get_version(question_id),
+        "results": get_results(question_id),
+        "deltas": {},
+    }
+    return f"retry: {interval * 1000}\n\n" + format_event(event)
+
+
+def _stream_settings():
+    return (
+        getattr(settings, "POLLS_LIVE_HEARTBEAT", 15),
+        getattr(settings, "POLLS_LIVE_MAX_DURATION", 300),
+    )
+
+
+async def astream_results(question_id):
+    """
+    ASGI 용 SSE 스트림 (구독자는 이벤트 루프의 큐에서 기다린다).
+    WSGI 에서는 스레드를 붙잡지 않도록 스트리밍하지 않고 snapshot_results 를 쓴다.
+    """
+    heartbeat, max_duration = _stream_settings()
+    broadcaster = get_live_broadcaster()
+    subscription = broadcaster.subscribe(question_id, loop=asyncio.get_running_loop())
+    deadline = time.monotonic() + max_duration
+    try:
+        yield "retry: 3000\n\n"
+        while time.monotonic() < deadline:
+            event = await subscription.aget(timeout=min(heartbeat, max(deadline - time.monotonic(), 0)))
+            yield format_event(event) if event is not None else ": ping\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_live_broadcaster():
+    """프로세스당 하나의 LiveResultsBroadcaster (설정값으로 생성)"""
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                _broadcaster = LiveResultsBroadcaster(
+                    max_rate=getattr(settings, "POLLS_LIVE_MAX_UPDATES_PER_SECOND", 2.0),
+                    poll_interval=getattr(settings, "POLLS_LIVE_POLL_INTERVAL", 1.0),
+                )
+    return _broadcaster
+
+
+@receiver(votes_recorded)
+def _notify_on_vote(sender, question_id, **kwargs):
+    # 구독자가 없는 워커에서는 아무것도 하지 않는다
+    if _broadcaster is not None:
+        _broadcaster.notify(question_id)
@@ -0,0 +1,112 @@
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from polls.benchmarking import SERVERS, running_server
+from polls.middleware import percentile
+from polls.models import Question
+
+# 같은 DB 로 gunicorn 을 WSGI(sync 워커) / ASGI(asgi 워커 + async view) 로 차례로 띄우고
+# 동시 요청을 보내 처리량을 비교한다.
+# 로컬 SQLite 는 쿼리가 거의 즉시 끝나서 async 가 겹쳐 기다릴 것이 없다.
+# --db-latency-ms 로 쿼리마다 지연(원격 PostgreSQL 왕복 시간 흉내)을 넣어 비교할 수 있다.
+
+
+class Command(BaseCommand):
+    help = 'Compares concurrent throughput of the WSGI and ASGI (async views) servers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', default='wsgi,asgi', help='Comma separated: wsgi, asgi')
+        parser.add_argument('--workers', type=int, default=1, help='gunicorn workers per server')
+        parser.add_argument('--wsgi-threads', type=int, default=1,
+                            help='gunicorn --threads for the WSGI server (1 = sync worker)')
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per server')
+        parser.add_argument('--db-latency-ms', type=float, default=0,
+                            help='Simulated round trip added to every SQL query in the servers')
+
+    def handle(self, *args, **options):
+        question = Question.objects.create(
+            question_text='[bench] asgi', pub_date=timezone.now() - timezone.timedelta(minutes=1)
+        )
+        for i in range(4):
+            question.choice_set.create(choice_text=f'bench {i}', votes=i)
+        paths = ['/polls/', f'/polls/{question.id}/results/']
+        try:
+            results = {}
+            for name in options['servers'].split(','):
+                if name not in SERVERS:
+                    raise CommandError(f'Unknown server: {name}')
+                results[name] = self._bench_server(name, paths, options)
+                self._report(name, results[name])
+            if 'wsgi' in results and 'asgi' in results:
+                ratio = results['asgi']['rps'] / results['wsgi']['rps']
+                self.stdout.write(self.style.SUCCESS(f'asgi/wsgi throughput: {ratio:.2f}x'))
+        finally:
+            question.delete()
+
+    def _bench_server(self, name, paths, options):
+        server = SERVERS[name]
+        args = [*server['args'], '-w', str(options['workers'])]
+        if name == 'wsgi' and options['wsgi_threads'] > 1:
+            args += ['--threads', str(options['wsgi_threads'])]
+        env = {'POLLS_ASYNC_VIEWS': server['async_views']}
+        try:
+            with running_server(server['app'], args, env, options['db_latency_ms']) as (host, port):
+                base = f'http://{host}:{port}'
+                return self._load(base, paths, options['concurrency'], options['duration'])
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+    def _load(self, base, paths, concurrency, duration):
+        latencies = []
+        errors = [0]
+        lock = threading.Lock()
+        start_gate = threading.Barrier(concurrency + 1)
+        deadline = [0.0]
+
+        def worker(offset):
+            local, failed, i = [], 0, offset
+            start_gate.wait()
+            while time.perf_counter() < deadline[0]:
+                url = base + paths[i % len(paths)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(url, timeout=30) as response:
+                        response.read()
+                    local.append(time.perf_counter() - started)
+                except (urllib.error.URLError, ConnectionError, TimeoutError):
+                    failed += 1
+            with lock:
+                latencies.extend(local)
+                errors[0] += failed
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+        for w in workers:
+            w.start()
+        deadline[0] = time.perf_counter() + duration
+        started = time.perf_counter()
+        start_gate.wait()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': errors[0],
+            'rps': len(latencies) / elapsed,
+            'p50_ms': (percentile(latencies, 50) or 0) * 1000,
+            'p95_ms': (percentile(latencies, 95) or 0) * 1000,
+        }
+
+    def _report(self, name, result):
+        self.stdout.write(
+            f"{name:<4} requests={result['requests']} errors={result['errors']} "
+            f"throughput={result['rps']:.0f} req/s "
+            f"p50={result['p50_ms']:.1f}ms p95={result['p95_ms']:.1f}ms"
+        )
@@ -0,0 +1,256 @@
+import datetime
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+from urllib.parse import urlencode
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from polls.benchmarking import SERVERS, run_load, running_server
+from polls.importers import import_records
+from polls.models import Choice, Question
+
+# polls 주요 경로 부하 테스트
+# 질문 N개(선택지 M개씩)를 넣고 gunicorn 을 띄운 뒤 시나리오마다 duration 초 동안 동시 요청:
+#   목록(필터 조합 16가지 + 인기순/급상승), 상세, 결과, 투표(POST, CSRF 토큰 포함)
+# 투표는 스레드마다 자기 세션(voter)으로 질문당 한 번씩만 보내고, 409(이미 투표함)는 conflicts 로 따로 센다.
+# 처리량, 응답 시간 백분위수, 요청당 SQL 개수/시간(Server-Timing 헤더)을 JSON 으로 남겨
+# 릴리스마다 비교한다.
+# 풀 비교 (PostgreSQL): bench_polls --scenarios vote --workers 4 --db-pool both
+
+PREFIX = '[bench]'
+CSRF_RE = re.compile(rb'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+INDEX_FILTERS = {
+    'q': lambda today: {'q': 'bench'},
+    'show': lambda today: {'show': 'future'},
+    'order': lambda today: {'order': 'oldest'},
+    'range': lambda today: {
+        'start': (today - datetime.timedelta(days=30)).isoformat(),
+        'end': (today - datetime.timedelta(days=1)).isoformat(),
+    },
+}
+
+
+def index_scenarios():
+    """필터 조합마다 (이름, 쿼리스트링)"""
+    today = timezone.localdate()
+    names = list(INDEX_FILTERS)
+    for size in range(len(names) + 1):
+        for combo in itertools.combinations(names, size):
+            params = {}
+            for name in combo:
+                params.update(INDEX_FILTERS[name](today))
+            label = 'index' + ('?' + '+'.join(combo) if combo else '')
+            yield label, urlencode(params)
+    # 투표수/급상승 정렬
+    for order in ('popular', 'trending'):
+        yield f'index?{order}', urlencode({'order': order})
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Load tests the polls index/detail/results/vote paths and writes a JSON report'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--questions', type=int, default=200, help='Questions to seed')
+        parser.add_argument('--choices', type=int, default=4, help='Choices per question')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=2.0, help='Seconds per scenario')
+        parser.add_argument('--server', choices=list(SERVERS), default='wsgi')
+        parser.add_argument('--workers', type=int, default=1, help='gunicorn workers')
+        parser.add_argument('--threads', type=int, default=4,
+                            help='gunicorn --threads for the WSGI server (1 = sync worker)')
+        parser.add_argument('--scenarios', default='index,detail,results,vote',
+                            help='Comma separated scenario groups to run')
+        parser.add_argument('--no-page-cache', action='store_true',
+                            help='Run the server with POLLS_PAGE_CACHE=0')
+        parser.add_argument('--vote-rate-limit', action='store_true',
+                            help='Keep vote rate limiting on (votes past the limit are 429 errors)')
+        parser.add_argument('--db-latency-ms', type=float, default=0,
+                            help='Simulated round trip added to every SQL query in the server')
+        parser.add_argument('--db-pool', choices=['off', 'on', 'both'], default='off',
+                            help='Run the server with POLLS_DB_POOL (both = unpooled, then pooled; PostgreSQL only)')
+        parser.add_argument('--output', default='bench_polls.json', help="JSON report path ('-' for stdout)")
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for request order')
+        parser.add_argument('--keep-data', action='store_true', help='Do not delete the seeded questions')
+
+    def handle(self, *args, **options):
+        groups = set(options['scenarios'].split(','))
+        unknown = groups - {'index', 'detail', 'results', 'vote'}
+        if unknown:
+            raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+
+        if options['db_pool'] != 'off' and connection.vendor != 'postgresql':
+            raise CommandError('--db-pool needs a PostgreSQL DATABASE_URL')
+
+        self._seed(options['questions'], options['choices'])
+        try:
+            report = self._run(groups, options)
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if not options['keep_data']:
+                Question.objects.filter(question_text__startswith=PREFIX).delete()
+
+        payload = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output'] == '-':
+            self.stdout.write(payload)
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(payload + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+    def _seed(self, n_questions, n_choices):
+        # 과거 60일 ~ 미래 10일에 고르게 퍼뜨려 show/range 필터가 실제로 걸러내게 한다
+        now = timezone.now()
+        records = (
+            {
+                'question_text': f'{PREFIX} bench question {i} topic {i % 10}',
+                'pub_date': (now - datetime.timedelta(days=i % 70 - 10, minutes=i)).isoformat(),
+                'choices': [(f'choice {j}', 0) for j in range(n_choices)],
+            }
+            for i in range(n_questions)
+        )
+        for _ in import_records(records):
+            pass
+
+    def _targets(self):
+        """공개된 bench 질문들의 (question_id, [choice_id...])"""
+        now = timezone.now()
+        ids = list(
+            Question.objects.filter(question_text__startswith=PREFIX, pub_date__lte=now)
+            .values_list('id', flat=True)
+        )
+        if not ids:
+            raise CommandError('No published benchmark questions (use a larger --questions)')
+        choices = {}
+        for question_id, choice_id in Choice.objects.filter(question_id__in=ids).values_list(
+            'question_id', 'id'
+        ):
+            choices.setdefault(question_id, []).append(choice_id)
+        return [(qid, choices.get(qid, [])) for qid in ids]
+
+    def _run(self, groups, options):
+        rng = random.Random(options['seed'])
+        targets = self._targets()
+        rng.shuffle(targets)
+        voteable = [t for t in targets if t[1]]
+
+        server = SERVERS[options['server']]
+        args = [*server['args'], '-w', str(options['workers'])]
+        if options['server'] == 'wsgi' and options['threads'] > 1:
+            args += ['--threads', str(options['threads'])]
+        env = {
+            'POLLS_ASYNC_VIEWS': server['async_views'],
+            'POLLS_PAGE_CACHE': '0' if options['no_page_cache'] else '1',
+            # 같은 클라이언트가 계속 투표하므로 기본은 속도 제한을 끈다
+            'POLLS_VOTE_RATE_LIMIT': '1' if options['vote_rate_limit'] else '0',
+        }
+        concurrency, duration = options['concurrency'], options['duration']
+        scenarios = {}
+        # both: 풀 없이 한 번, psycopg 풀로 한 번 (시나리오 이름 뒤에 [no-pool] / [pool])
+        pool_modes = ['off', 'on'] if options['db_pool'] == 'both' else [options['db_pool']]
+
+        for pool_mode in pool_modes:
+            suffix = '' if len(pool_modes) == 1 else ('[pool]' if pool_mode == 'on' else '[no-pool]')
+            server_env = {**env, 'POLLS_DB_POOL': '1' if pool_mode == 'on' else '0'}
+
+            def scenario(name, make_request, setup=None):
+                result = run_load(host, port, make_request, concurrency, duration, setup)
+                scenarios[name + suffix] = result
+                self._report(name + suffix, result)
+
+            with running_server(server['app'], args, server_env, options['db_latency_ms']) as (host, port):
+                if 'index' in groups:
+                    for name, query in index_scenarios():
+                        path = '/polls/' + (f'?{query}' if query else '')
+                        scenario(name, lambda client, i, path=path: ('GET', path, None, None))
+                if 'detail' in groups:
+                    scenario('detail', lambda client, i: (
+                        'GET', f'/polls/{targets[i % len(targets)][0]}/', None, None
+                    ))
+                if 'results' in groups:
+                    scenario('results', lambda client, i: (
+                        'GET', f'/polls/{targets[i % len(targets)][0]}/results/', None, None
+                    ))
+                if 'vote' in groups and voteable:
+                    scenario('vote', lambda client, i: self._vote_request(client, voteable[i % len(voteable)], i),
+                             setup=lambda client: self._fetch_csrf(client, voteable[0][0]))
+
+        return {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'git_revision': _git_revision(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'server': options['server'],
+                'workers': options['workers'],
+                'threads': options['threads'],
+                'concurrency': concurrency,
+                'duration': duration,
+                'questions': options['questions'],
+                'choices': options['choices'],
+                'page_cache': not options['no_page_cache'],
+                'db_latency_ms': options['db_latency_ms'],
+                'db_pool': options['db_pool'],
+                # 풀에서 빌릴 때마다 연결 확인 (서버는 이 프로세스의 환경 변수를 물려받는다)
+                'db_pool_check': os.environ.get('POLLS_DB_POOL_CHECK', '0') == '1',
+            },
+            'scenarios': scenarios,
+        }
+
+    def _fetch_csrf(self, client, question_id):
+        # 상세 화면에서 CSRF 쿠키와 폼 토큰을 받아 둔다 (스레드마다 한 번)
+        status, response, content = client.request('GET', f'/polls/{question_id}/')
+        match = CSRF_RE.search(content)
+        if status != 200 or match is None:
+            raise CommandError(f'Could not get a CSRF token from /polls/{question_id}/')
+        client.remember_cookies(response)
+        client.csrf_token = match.group(1).decode()
+        # 투표 응답의 세션 쿠키를 이어 받아 스레드마다 한 voter 로 투표한다
+        client.keep_cookies = True
+        client.voted = set()
+
+    def _vote_request(self, client, target, i):
+        question_id, choice_ids = target
+        # voter 는 질문마다 한 표뿐이라, 이 세션으로 이미 투표한 질문이 다시 오면
+        # 세션 쿠키를 버리고 다음 투표에서 새 세션(새 voter)을 받는다
+        if question_id in client.voted:
+            client.cookies.pop(settings.SESSION_COOKIE_NAME, None)
+            client.voted.clear()
+        client.voted.add(question_id)
+        body = urlencode({
+            'csrfmiddlewaretoken': client.csrf_token,
+            'choice': choice_ids[i % len(choice_ids)],
+        })
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        return 'POST', f'/polls/{question_id}/vote/', body, headers
+
+    def _report(self, name, result):
+        latency = result['latency_ms']
+        queries = result['queries']
+        self.stdout.write(
+            f"{name:<28} {result['rps']:>8.0f} req/s  "
+            f"p50={latency.get('p50', 0):.1f}ms p95={latency.get('p95', 0):.1f}ms  "
+            f"queries={queries.get('mean', 0):.1f}  errors={result['errors']}  "
+            f"conflicts={result['conflicts']}"
+        )
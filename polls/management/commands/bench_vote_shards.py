@@ -0,0 +1,69 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection
+from django.db.models import F
+from django.utils import timezone
+
+from polls.models import Choice, Question
+from polls.votes import increment_shard
+
+
+class Command(BaseCommand):
+    help = 'Measures concurrent vote throughput for different shard counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shards', default='0,1,4,16',
+                            help='Comma separated shard counts (0 = plain Choice.votes UPDATE)')
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--votes', type=int, default=500, help='Votes per thread')
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        per_thread = options['votes']
+        question = Question.objects.create(
+            question_text='[bench] vote shards', pub_date=timezone.now()
+        )
+        choice = question.choice_set.create(choice_text='bench')
+        try:
+            for shards in [int(x) for x in options['shards'].split(',')]:
+                elapsed, errors = self._run(choice.id, shards, threads, per_thread)
+                total = threads * per_thread - errors
+                self.stdout.write(
+                    f'shards={shards:<3} threads={threads} votes={total} '
+                    f'errors={errors} elapsed={elapsed:.2f}s '
+                    f'throughput={total / elapsed:.0f} votes/s'
+                )
+        finally:
+            question.delete()
+
+    def _run(self, choice_id, shards, threads, per_thread):
+        errors = [0]
+        lock = threading.Lock()
+        start_gate = threading.Barrier(threads + 1)
+
+        def worker():
+            start_gate.wait()
+            try:
+                for _ in range(per_thread):
+                    try:
+                        if shards:
+                            increment_shard(choice_id, shards=shards)
+                        else:
+                            Choice.objects.filter(pk=choice_id).update(votes=F('votes') + 1)
+                    except DatabaseError:
+                        # SQLite 는 쓰기가 직렬화되므로 locked 오류가 날 수 있음
+                        with lock:
+                            errors[0] += 1
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for w in workers:
+            w.start()
+        start_gate.wait()
+        started = time.perf_counter()
+        for w in workers:
+            w.join()
+        return time.perf_counter() - started, errors[0]
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from polls.votes import compact_shards
+
+
+class Command(BaseCommand):
+    help = 'Folds sharded vote counters back into Choice.votes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', type=float, default=0,
+            help='Repeat every N seconds instead of running once (for a worker process)',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['loop']
+        while True:
+            moved = compact_shards()
+            self.stdout.write(self.style.SUCCESS(f'Compacted {moved} vote(s) into Choice.votes'))
+            if not interval:
+                break
+            time.sleep(interval)
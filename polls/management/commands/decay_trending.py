@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from polls.ranking import decay_trending, half_life
+
+
+class Command(BaseCommand):
+    help = 'Decays Question.trending_score by the time elapsed since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--elapsed', type=float,
+                            help='Seconds since the last run (default: POLLS_TRENDING_DECAY_INTERVAL)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running every POLLS_TRENDING_DECAY_INTERVAL seconds')
+
+    def handle(self, *args, **options):
+        interval = settings.POLLS_TRENDING_DECAY_INTERVAL
+        if not options['loop']:
+            self._decay(options['elapsed'] or interval)
+            return
+
+        # 실제로 지난 시간만큼 줄인다 (느려지거나 밀려도 감쇠량이 맞도록)
+        last = time.monotonic()
+        while True:
+            time.sleep(interval)
+            now = time.monotonic()
+            self._decay(now - last)
+            last = now
+            close_old_connections()
+
+    def _decay(self, elapsed):
+        decayed = decay_trending(elapsed)
+        self.stdout.write(self.style.SUCCESS(
+            f'Decayed {decayed} trending scores by {elapsed:.0f}s (half-life {half_life()}s)'
+        ))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from polls.pagination import encode_cursor, keyset_queryset
+from polls.views import IndexView, filter_questions
+
+
+def query_shapes():
+    """IndexView 가 만드는 쿼리 모양별 대표 쿼리스트링"""
+    cursor = encode_cursor([timezone.now(), 1])
+    return [
+        ("default", {}),
+        ("show=future", {"show": "future"}),
+        ("order=oldest", {"order": "oldest"}),
+        ("q", {"q": "django"}),
+        ("start/end", {"start": "2026-01-01", "end": "2026-01-31"}),
+        ("start/end + order=oldest", {"start": "2026-01-01", "end": "2026-01-31", "order": "oldest"}),
+        ("cursor (page 2+)", {"cursor": cursor}),
+        ("cursor + order=oldest", {"order": "oldest", "cursor": cursor}),
+        ("order=popular", {"order": "popular"}),
+        ("order=trending", {"order": "trending"}),
+        ("cursor + order=trending", {"order": "trending", "cursor": encode_cursor([1.5, 1])}),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Prints EXPLAIN output for each IndexView query shape'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Run EXPLAIN ANALYZE (PostgreSQL only)',
+        )
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options['analyze'] and connection.vendor == 'postgresql':
+            explain_options['analyze'] = True
+
+        for name, params in query_shapes():
+            qs, ordering = filter_questions(params)
+            qs = keyset_queryset(qs, ordering, params.get('cursor'))[: IndexView.page_size + 1]
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {name} {params}'))
+            self.stdout.write(str(qs.query))
+            self.stdout.write(qs.explain(**explain_options))
+            self.stdout.write('')
@@ -0,0 +1,41 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from polls.exporters import EXPORT_FORMATS, export_queryset, gzip_stream, iter_export
+from polls.views import filter_questions
+
+
+class Command(BaseCommand):
+    help = 'Streams questions, choices and votes as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument('--start', help='YYYY-MM-DD (pub_date from)')
+        parser.add_argument('--end', help='YYYY-MM-DD (pub_date until, inclusive)')
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip')
+        parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        qs, _ = filter_questions({
+            'show': 'future',
+            'start': options['start'],
+            'end': options['end'],
+        })
+        chunks = iter_export(options['format'], export_queryset(qs), options['chunk_size'])
+        if options['gzip']:
+            chunks = gzip_stream(chunks)
+        else:
+            chunks = (chunk.encode() for chunk in chunks)
+
+        if options['output']:
+            with open(options['output'], 'wb') as out:
+                for chunk in chunks:
+                    out.write(chunk)
+            self.stderr.write(self.style.SUCCESS(f'Exported to {options["output"]}'))
+        else:
+            out = sys.stdout.buffer
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
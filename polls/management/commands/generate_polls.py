@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from polls.generators import generate_records
+from polls.importers import import_records
+
+
+class Command(BaseCommand):
+    help = 'Generates synthetic questions and choices (Zipf distributed votes) for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--questions', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0, help='Same seed + anchor gives the same data')
+        parser.add_argument('--anchor',
+                            help='ISO datetime pub_dates are relative to (default: now)')
+        parser.add_argument('--past-days', type=int, default=365)
+        parser.add_argument('--future-ratio', type=float, default=0.05,
+                            help='Share of questions published in the future')
+        parser.add_argument('--future-days', type=int, default=30)
+        parser.add_argument('--korean-ratio', type=float, default=0.5)
+        parser.add_argument('--min-choices', type=int, default=2)
+        parser.add_argument('--max-choices', type=int, default=6)
+        parser.add_argument('--zipf-s', type=float, default=1.1, help='Zipf exponent across choices')
+        parser.add_argument('--mean-votes', type=float, default=50, help='Average votes per question')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Questions per bulk_create / transaction')
+
+    def handle(self, *args, **options):
+        anchor = timezone.now()
+        if options['anchor']:
+            anchor = parse_datetime(options['anchor'])
+            if anchor is None:
+                raise CommandError(f"Invalid --anchor: {options['anchor']}")
+            if timezone.is_naive(anchor):
+                anchor = timezone.make_aware(anchor)
+        if not 1 <= options['min_choices'] <= options['max_choices']:
+            raise CommandError('--min-choices must be between 1 and --max-choices')
+
+        records = generate_records(
+            options['questions'],
+            seed=options['seed'],
+            anchor=anchor,
+            past_days=options['past_days'],
+            future_ratio=options['future_ratio'],
+            future_days=options['future_days'],
+            korean_ratio=options['korean_ratio'],
+            min_choices=options['min_choices'],
+            max_choices=options['max_choices'],
+            zipf_s=options['zipf_s'],
+            mean_votes=options['mean_votes'],
+        )
+        started = time.perf_counter()
+        questions = choices = 0
+        for n_questions, n_choices in import_records(records, options['batch_size']):
+            questions += n_questions
+            choices += n_choices
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{questions}/{options["questions"]} questions / {choices} choices '
+                f'({(questions + choices) / elapsed:.0f} rows/s)'
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {questions} questions and {choices} choices in {elapsed:.1f}s '
+            f'(seed={options["seed"]}, anchor={anchor.isoformat()})'
+        ))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from polls.importers import READERS, import_records, open_input
+
+
+class Command(BaseCommand):
+    help = 'Bulk imports questions and choices from NDJSON or CSV (export_polls format)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file ('-' for stdin, .gz is decompressed)")
+        parser.add_argument('--format', choices=list(READERS),
+                            help='Input format (default: guessed from the file name, else ndjson)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Questions per transaction')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if '.csv' in path else 'ndjson')
+        try:
+            stream = open_input(path)
+        except OSError as exc:
+            raise CommandError(f'Cannot open {path}: {exc}')
+
+        started = time.perf_counter()
+        questions = choices = 0
+        with stream:
+            for n_questions, n_choices in import_records(READERS[fmt](stream), options['batch_size']):
+                questions += n_questions
+                choices += n_choices
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'{questions} questions / {choices} choices '
+                    f'({(questions + choices) / elapsed:.0f} rows/s)'
+                )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {questions} questions and {choices} choices in {elapsed:.1f}s '
+            f'({(questions + choices) / max(elapsed, 1e-9):.0f} rows/s)'
+        ))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from polls.models import Question
+from polls.search import build_search_document, get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds Question.search_document and the full-text index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        backend = get_search_backend()
+        batch = []
+        total = 0
+        for question in Question.objects.only('id', 'question_text').iterator(chunk_size=batch_size):
+            question.search_document = build_search_document(question.question_text)
+            batch.append(question)
+            if len(batch) >= batch_size:
+                total += self._write(backend, batch)
+                batch = []
+        total += self._write(backend, batch)
+        self.stdout.write(self.style.SUCCESS(
+            f'Reindexed {total} question(s) with the "{backend.name}" backend'
+        ))
+
+    def _write(self, backend, batch):
+        with transaction.atomic():
+            Question.objects.bulk_update(batch, ['search_document'])
+            backend.index_many(batch)
+        return len(batch)
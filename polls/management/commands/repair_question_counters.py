@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from polls.counters import repair_counters, stale_counters
+
+
+class Command(BaseCommand):
+    help = 'Recomputes Question.total_votes and choice_count from the choices in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Questions per UPDATE batch')
+        parser.add_argument('--check', action='store_true',
+                            help='Only count questions whose counters are wrong')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['check']:
+            stale = stale_counters().count()
+            style = self.style.SUCCESS if not stale else self.style.WARNING
+            self.stdout.write(style(f'{stale} questions have stale counters'))
+            return
+
+        fixed = 0
+        for last_id, batch_fixed in repair_counters(options['batch_size']):
+            fixed += batch_fixed
+            if batch_fixed:
+                self.stdout.write(f'up to id {last_id}: fixed {batch_fixed}')
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Fixed {fixed} questions in {elapsed:.1f}s'))
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from polls.templates_warmup import template_names, warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Compiles every template to validate it and fill the cached template loader'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project-only', action='store_true',
+                            help='Only templates under the project templates/ directory')
+
+    def handle(self, *args, **options):
+        names = template_names(include_apps=not options['project_only'])
+        compiled, errors, elapsed_ms = warm_templates(names)
+        for name, exc in errors:
+            self.stderr.write(f'{name}: {exc}')
+        if errors:
+            raise CommandError(f'{len(errors)} of {len(names)} templates failed to compile')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Compiled {compiled} templates in {elapsed_ms:.0f}ms'
+        ))
+        if not settings.POLLS_TEMPLATE_CACHE:
+            self.stdout.write('POLLS_TEMPLATE_CACHE is off: templates were validated but are not kept cached')
@@ -0,0 +1,266 @@
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Prometheus 텍스트 형식 메트릭 (/metrics)
+# gunicorn 워커마다 메모리에 카운터/히스토그램을 모으고,
+# 변경이 생기면 POLLS_METRICS_FLUSH_INTERVAL 초 안에 POLLS_METRICS_DIR/<pid>.json 으로 저장한다.
+# /metrics 요청을 받은 워커가 디렉터리의 파일을 모두 읽어 합산해서 응답한다.
+# (prometheus_client 같은 외부 패키지/서비스 없이 동작)
+
+# 응답 시간 히스토그램 구간(초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 이름 → (종류, 설명)
+METRICS = {
+    "polls_votes_total": ("counter", "Votes recorded."),
+    "polls_votes_rate_limited_total": ("counter", "Votes rejected with 429 by rate limit scope."),
+    "polls_request_duration_seconds": ("histogram", "Request latency by URL name."),
+    "polls_results_cache_requests_total": ("counter", "Results cache lookups by result (hit/miss)."),
+    "polls_page_cache_requests_total": (
+        "counter", "Anonymous page cache lookups by result (hit/stale/miss/bypass).",
+    ),
+    "polls_db_connections_opened_total": (
+        "counter", "New database connections opened (with POLLS_DB_POOL, checkouts from the pool).",
+    ),
+    "polls_db_connection_requests_total": (
+        "counter", "Requests that ran SQL, by whether the connection was reused or newly opened.",
+    ),
+    # psycopg 연결 풀 (POLLS_DB_POOL=1), 살아 있는 워커마다의 값을 합산
+    "polls_db_pool_size": ("gauge", "Open pool connections (in use + idle)."),
+    "polls_db_pool_available": ("gauge", "Idle pool connections ready to hand out."),
+    "polls_db_pool_max": ("gauge", "Configured pool max_size."),
+    "polls_db_pool_waiting": ("gauge", "Requests currently waiting for a pool connection."),
+    "polls_db_pool_requests_total": ("counter", "Connections requested from the pool."),
+    "polls_db_pool_wait_seconds_total": ("counter", "Time spent waiting for a pool connection."),
+    "polls_db_pool_errors_total": ("counter", "Pool requests that failed (timeout waiting for a connection)."),
+    "polls_db_pool_connections_lost_total": ("counter", "Broken connections discarded by the pool check."),
+}
+
+# psycopg_pool get_stats() 키 → (메트릭 이름, 배율)
+POOL_STATS = {
+    "pool_size": ("polls_db_pool_size", 1),
+    "pool_available": ("polls_db_pool_available", 1),
+    "pool_max": ("polls_db_pool_max", 1),
+    "requests_waiting": ("polls_db_pool_waiting", 1),
+    "requests_num": ("polls_db_pool_requests_total", 1),
+    "requests_wait_ms": ("polls_db_pool_wait_seconds_total", 0.001),
+    "requests_errors": ("polls_db_pool_errors_total", 1),
+    "connections_lost": ("polls_db_pool_connections_lost_total", 1),
+}
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # 다른 사용자의 프로세스
+    return True
+
+
+class MetricsRegistry:
+    def __init__(self, directory, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._reset()
+
+    def _reset(self):
+        # fork 된 자식 워커는 부모가 모은 값을 버리고 자기 pid 파일에 새로 쌓는다
+        self._lock = threading.Lock()
+        self._counters = {}    # (이름, labels) → 값
+        self._histograms = {}  # (이름, labels) → [구간별 개수..., 합계, 개수]
+        self._values = {}      # (이름, labels) → 마지막으로 정한 값 (gauge, 외부에서 센 누적값)
+        self._timer = None
+        self.pid = os.getpid()
+
+    # 기록
+    def inc(self, name, value=1, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._changed()
+
+    def set(self, name, value, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            if self._values.get(key) == value:
+                return
+            self._values[key] = value
+        self._changed()
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [0] * len(buckets) + [0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    hist[i] += 1
+                    break
+            hist[-2] += value
+            hist[-1] += 1
+        self._changed()
+
+    def _changed(self):
+        if self.flush_interval <= 0:
+            self.flush()
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+        self._timer.start()
+
+    # 파일 저장 / 합산
+    def flush(self):
+        with self._lock:
+            self._timer = None
+            data = {
+                "counters": [[name, labels, value] for (name, labels), value in self._counters.items()],
+                "histograms": [[name, labels, hist] for (name, labels), hist in self._histograms.items()],
+                "values": [[name, labels, value] for (name, labels), value in self._values.items()],
+            }
+        if not data["counters"] and not data["histograms"] and not data["values"]:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # 임시 파일에 쓰고 교체해서 읽는 쪽이 반쯤 쓰인 파일을 보지 않게
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, os.path.join(self.directory, f"{self.pid}.json"))
+
+    def collect(self):
+        """
+        모든 워커 파일을 합산한 (counters, histograms). set() 으로 정한 값은 counters 에 같이 합산.
+        gauge 는 지금 살아 있는 워커의 값만 더한다 (종료/재시작된 워커의 파일은 카운터만 남긴다).
+        """
+        self.flush()
+        counters, histograms = {}, {}
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            pid = os.path.basename(path)[: -len(".json")]
+            alive = not pid.isdigit() or _pid_alive(int(pid))
+            for name, labels, value in data["counters"] + data.get("values", []):
+                if not alive and METRICS.get(name, ("counter",))[0] == "gauge":
+                    continue
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, hist in data["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                if key in histograms:
+                    histograms[key] = [a + b for a, b in zip(histograms[key], hist)]
+                else:
+                    histograms[key] = list(hist)
+        return counters, histograms
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def render_metrics(counters, histograms):
+    """Prometheus text exposition format (0.0.4)"""
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind in ("counter", "gauge"):
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        else:
+            for (metric, labels), hist in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, hist):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {hist[-1]}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {hist[-2]}")
+                lines.append(f"{name}_count{_format_labels(labels)} {hist[-1]}")
+
+    # 결과 캐시 적중률 (합산된 hit / (hit + miss))
+    hits = counters.get(("polls_results_cache_requests_total", (("result", "hit"),)), 0)
+    misses = counters.get(("polls_results_cache_requests_total", (("result", "miss"),)), 0)
+    lines.append("# HELP polls_results_cache_hit_ratio Results cache hit ratio across workers.")
+    lines.append("# TYPE polls_results_cache_hit_ratio gauge")
+    lines.append(f"polls_results_cache_hit_ratio {hits / (hits + misses) if hits + misses else 0}")
+    return "\n".join(lines) + "\n"
+
+
+_registry = None
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry(
+            getattr(settings, "POLLS_METRICS_DIR",
+                    os.path.join(tempfile.gettempdir(), "django_polls_metrics")),
+            getattr(settings, "POLLS_METRICS_FLUSH_INTERVAL", 1.0),
+        )
+        os.register_at_fork(after_in_child=_registry._reset)
+        atexit.register(_registry.flush)
+    return _registry
+
+
+@receiver(setting_changed)
+def _reset_registry(setting, **kwargs):
+    # 테스트에서 override_settings 로 저장 위치를 바꿀 수 있게
+    global _registry
+    if setting in ("POLLS_METRICS_DIR", "POLLS_METRICS_FLUSH_INTERVAL"):
+        _registry = None
+
+
+def inc(name, value=1, **labels):
+    get_registry().inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    get_registry().observe(name, value, **labels)
+
+
+def record_db_pool_stats():
+    """이 워커의 psycopg 연결 풀 통계를 저장 (풀을 쓰는 DB 만, 요청이 끝날 때마다)"""
+    registry = get_registry()
+    for connection in connections.all(initialized_only=True):
+        pool = getattr(connection, "_connection_pools", {}).get(connection.alias)
+        if pool is None:
+            continue
+        stats = pool.get_stats()
+        for key, (name, scale) in POOL_STATS.items():
+            registry.set(name, stats.get(key, 0) * scale, alias=connection.alias)
+
+
+@receiver(connection_created)
+def _count_new_connection(sender, connection, **kwargs):
+    inc("polls_db_connections_opened_total", alias=connection.alias)
@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+# 요청별 성능 측정
+# URL 이름(polls:index 등)마다 전체 응답 시간 / SQL 개수·시간 / 템플릿 렌더 시간을 재서
+#   - 응답에 Server-Timing 헤더로 붙이고 (브라우저 개발자도구 Network 탭에서 보임)
+#   - 최근 N개 요청을 메모리에 모아 p50/p95/p99 를 계산한다 (/polls/timings/, 관리자 전용)
+# 통계는 워커 프로세스마다 따로 쌓인다. 워커 전체 합산은 /metrics (polls/metrics.py).
+
+
+def percentile(sorted_values, pct):
+    """정렬된 목록의 nearest-rank 백분위수"""
+    if not sorted_values:
+        return None
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+class TimingStats:
+    """URL 이름별 최근 window 개 요청의 측정값 (링 버퍼)"""
+
+    METRICS = ("total_ms", "db_ms", "queries", "template_ms")
+
+    def __init__(self, window=500):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}  # url 이름 → deque[(total_ms, db_ms, queries, template_ms)]
+        self._counts = {}   # url 이름 → 전체 요청 수
+
+    def record(self, name, total_ms, db_ms, queries, template_ms):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append((total_ms, db_ms, queries, template_ms))
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+            counts = dict(self._counts)
+        result = {}
+        for name, rows in sorted(samples.items()):
+            entry = {"count": counts[name], "window": len(rows)}
+            for i, metric in enumerate(self.METRICS):
+                values = sorted(row[i] for row in rows)
+                entry[metric] = {
+                    f"p{pct}": round(percentile(values, pct), 2) for pct in (50, 95, 99)
+                }
+            result[name] = entry
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+_stats = None
+
+
+def get_request_stats():
+    global _stats
+    if _stats is None:
+        _stats = TimingStats(getattr(settings, "POLLS_REQUEST_TIMING_WINDOW", 500))
+    return _stats
+
+
+class _RequestTiming:
+    """요청 하나 동안의 측정값"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self._template_start = None
+
+    def wrap_query(self, execute, sql, params, many, context):
+        # connection.execute_wrapper 로 모든 SQL 실행을 감싼다
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+    def template_started(self):
+        self._template_start = time.perf_counter()
+
+    def template_done(self, response):
+        if self._template_start is not None:
+            self.template += time.perf_counter() - self._template_start
+            self._template_start = None
+
+
+class RequestTimingMiddleware:
+    """
+    MIDDLEWARE 맨 앞에 두어 다른 미들웨어 시간까지 포함해서 잰다.
+    URL 이 resolve 되지 않은 요청(정적 파일 등)은 통계에 넣지 않는다.
+    StreamingHttpResponse 본문을 만드는 동안의 SQL 은 응답 이후라 포함되지 않는다.
+    ASGI 에서도 동작한다 (async view 의 ORM 호출도 같은 연결 객체를 쓰므로 SQL 이 잡힌다).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing, raw_before, start = self._start(request)
+        with self._wrap_queries(timing):
+            response = self.get_response(request)
+        return self._finish(request, response, timing, raw_before, start)
+
+    async def __acall__(self, request):
+        timing, raw_before, start = self._start(request)
+        with self._wrap_queries(timing):
+            response = await self.get_response(request)
+        return self._finish(request, response, timing, raw_before, start)
+
+    def _start(self, request):
+        timing = _RequestTiming()
+        request._polls_timing = timing
+        # 요청 전 DB 연결 객체 (conn_max_age 로 이전 요청의 연결을 다시 쓰는지 보기 위해)
+        raw_before = {c.alias: c.connection for c in connections.all()}
+        return timing, raw_before, time.perf_counter()
+
+    def _wrap_queries(self, timing):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timing.wrap_query))
+        return stack
+
+    def _finish(self, request, response, timing, raw_before, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = timing.db * 1000
+        template_ms = timing.template * 1000
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={db_ms:.2f};desc="{timing.queries} queries"',
+            f"tpl;dur={template_ms:.2f}",
+            f"total;dur={total_ms:.2f}",
+        ])
+        match = getattr(request, "resolver_match", None)
+        if match is not None:
+            get_request_stats().record(
+                match.view_name, total_ms, db_ms, timing.queries, template_ms
+            )
+            metrics.observe("polls_request_duration_seconds", total_ms / 1000, view=match.view_name)
+        if timing.queries:
+            for connection in connections.all():
+                if connection.connection is None:
+                    continue
+                before = raw_before.get(connection.alias)
+                state = "reused" if before is connection.connection else "new"
+                metrics.inc("polls_db_connection_requests_total", alias=connection.alias, state=state)
+            metrics.record_db_pool_stats()
+        return response
+
+    def process_template_response(self, request, response):
+        # TemplateResponse 는 미들웨어를 다 지난 뒤 렌더링되므로 그 직전/직후를 잰다
+        timing = getattr(request, "_polls_timing", None)
+        if timing is not None:
+            timing.template_started()
+            response.add_post_render_callback(timing.template_done)
+        return response
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 08:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0003_choicevoteshard'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['pub_date', 'id'], name='polls_q_pub_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 6.0.1 on 2026-10-18 08:17
+
+from django.db import OperationalError, migrations, models
+
+from polls.search import FTS_TABLE, build_search_document
+
+
+def fill_search_document(apps, schema_editor):
+    Question = apps.get_model('polls', 'Question')
+    for question in Question.objects.only('id', 'question_text').iterator(chunk_size=2000):
+        question.search_document = build_search_document(question.question_text)
+        question.save(update_fields=['search_document'])
+
+
+def create_search_index(apps, schema_editor):
+    # DB 종류별 전문 검색 인덱스
+    # - PostgreSQL: to_tsvector GIN 인덱스
+    # - SQLite: FTS5 가상 테이블 (FTS5 가 없는 빌드면 건너뛰고 LIKE 검색으로 동작)
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX polls_question_fts_idx ON polls_question "
+            "USING gin (to_tsvector('simple', search_document))"
+        )
+    elif vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(search_document)"
+            )
+        except OperationalError:
+            return
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, search_document) "
+            "SELECT id, search_document FROM polls_question"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS polls_question_fts_idx")
+    elif vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0004_question_pub_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_document, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
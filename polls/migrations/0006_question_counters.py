@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-18 08:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    # 기존 질문의 집계 채우기 (UPDATE 한 번, 큰 테이블은 배포 후 repair_question_counters 로도 가능)
+    Question = apps.get_model('polls', 'Question')
+    Choice = apps.get_model('polls', 'Choice')
+    choices = Choice.objects.filter(question=OuterRef('pk')).order_by().values('question')
+    Question.objects.update(
+        total_votes=Coalesce(Subquery(choices.annotate(total=Sum('votes')).values('total')), 0),
+        choice_count=Coalesce(Subquery(choices.annotate(n=Count('pk')).values('n')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0005_question_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='choice_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='total_votes',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.db import OperationalError, migrations
+
+from polls.search import FTS_TABLE, build_search_document
+
+
+def rebuild_search_document(apps, schema_editor):
+    # 예전 search_document 는 중복 토큰을 지워서 단어 빈도가 없었다 → 다시 만든다
+    Question = apps.get_model('polls', 'Question')
+    for question in Question.objects.only('id', 'question_text').iterator(chunk_size=2000):
+        question.search_document = build_search_document(question.question_text)
+        question.save(update_fields=['search_document'])
+    # PostgreSQL GIN 인덱스는 자동으로 갱신되고, SQLite FTS5 테이블은 다시 채운다
+    if schema_editor.connection.vendor == 'sqlite':
+        try:
+            schema_editor.execute(f"DELETE FROM {FTS_TABLE}")
+        except OperationalError:
+            return  # FTS5 가 없는 빌드
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, search_document) "
+            "SELECT id, search_document FROM polls_question"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0008_vote'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_search_document, migrations.RunPython.noop),
+    ]
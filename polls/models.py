@@ -6,6 +6,23 @@ class Question(models.Model):
 	# 각각 변수에 
     question_text = models.CharField(max_length=200)
     pub_date = models.DateTimeField("date published")
+    # 검색용 토큰 문자열 (저장 시 question_text 로부터 자동 생성, polls/search.py)
+    search_document = models.TextField(default="", blank=True, editable=False)
+    # 비정규화 집계 (= 선택지 votes 합계 / 선택지 수). 투표·선택지 추가/삭제 때 갱신 (polls/counters.py)
+    # 어긋났으면 manage.py repair_question_counters
+    total_votes = models.IntegerField(default=0, editable=False)
+    choice_count = models.IntegerField(default=0, editable=False)
+    # 급상승 점수: 투표마다 +1, decay_trending 이 주기적으로 반감기에 맞춰 줄인다 (polls/ranking.py)
+    trending_score = models.FloatField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # 목록 페이지: pub_date 범위 필터 + (pub_date, id) 정렬/keyset 페이지네이션
+            models.Index(fields=["pub_date", "id"], name="polls_q_pub_date_id_idx"),
+            # order=popular / order=trending 정렬 + keyset 페이지네이션
+            models.Index(fields=["total_votes", "id"], name="polls_q_total_votes_id_idx"),
+            models.Index(fields=["trending_score", "id"], name="polls_q_trending_id_idx"),
+        ]
     
     # 테스트코드와 연관
     # 논리적, 정확히 떨어져야 하는 경우에 테스트코드 작성
@@ -35,4 +52,39 @@ class Choice(models.Model):
     # 리턴값 복붙해서 변경안했더니 오류발생
     # 항상 출력으로 뭘 줄지 생각을하자.
     def __str__(self):
-        return self.choice_text
\ No newline at end of file
+        return self.choice_text
+
+
+# 인기 투표에서 Choice.votes 한 행에 UPDATE 가 몰리지 않도록
+# 선택지마다 N개의 카운터 행(shard)에 나눠서 더한다.
+# 실제 득표수 = Choice.votes + 모든 shard.count (주기적으로 votes 로 합쳐짐)
+class ChoiceVoteShard(models.Model):
+    choice = models.ForeignKey(Choice, on_delete=models.CASCADE, related_name="vote_shards")
+    shard = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["choice", "shard"], name="polls_choice_shard_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.choice_id}#{self.shard}: {self.count}"
+
+
+# 누가 어느 질문에 투표했는지 (질문당 한 표)
+# voter: 로그인 사용자는 "user:<id>", 익명은 "session:<세션 키>" (polls/voters.py)
+# (voter, question) 유니크 제약으로 중복 투표를 DB 가 막는다. 이미 있으면 INSERT 가 0행.
+class Vote(models.Model):
+    question = models.ForeignKey(Question, on_delete=models.CASCADE)
+    choice = models.ForeignKey(Choice, on_delete=models.CASCADE)
+    voter = models.CharField(max_length=64)
+
+    class Meta:
+        constraints = [
+            # voter 가 앞이라 "이 사람이 투표한 질문들" 조회에도 쓰인다
+            models.UniqueConstraint(fields=["voter", "question"], name="polls_vote_voter_question_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.voter} → {self.question_id}:{self.choice_id}"
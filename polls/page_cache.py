@@ -0,0 +1,179 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+
+from . import metrics
+from .fragment_cache import index_cache_timeout, index_generation
+from .versions import get_version
+
+# 익명 사용자용 전체 페이지 캐시 (polls_pages 캐시)
+# 세션/메시지 쿠키가 없는 GET 요청이면 세션·인증·CSRF 미들웨어와 view 를 건너뛰고 저장된 응답을 돌려준다.
+#   키: 경로 + 정규화한 쿼리스트링 (빈 값 제거, 이름순 정렬)
+#   무효화: 저장할 때의 버전을 함께 넣어두고 조회 때 비교
+#     목록 → 목록 세대(fragment_cache), 상세/결과 → 질문 버전(versions, 투표/선택지 변경 포함)
+#   TTL 이 지났거나 버전이 바뀐 항목은 stale: 잠금을 잡은 요청 하나만 다시 만들고
+#   그 동안 다른 요청은 stale 응답을 받는다 (stale-while-revalidate, 최대 TTL + POLLS_PAGE_CACHE_STALE 초)
+# 쿠키를 심는 응답(CSRF 토큰을 쓴 폼 화면 = 투표 폼이 있는 상세 화면 등)과
+# Cookie 말고 다른 헤더로 Vary 하는 응답, Cache-Control 을 직접 정한 응답은 저장하지 않는다.
+
+HEADER = "X-Page-Cache"
+LOCK_TIMEOUT = 10
+
+
+def _cache():
+    return caches[getattr(settings, "POLLS_PAGE_CACHE_ALIAS", "polls_pages")]
+
+
+def normalize_query(query_dict):
+    """같은 의미의 쿼리스트링을 하나로 (빈 값 제거, 이름순, 같은 이름은 원래 순서 유지)"""
+    pairs = [(key, value) for key in sorted(query_dict) for value in query_dict.getlist(key) if value]
+    return urlencode(pairs)
+
+
+def page_cache_key(request):
+    raw = f"{request.path}?{normalize_query(request.GET)}"
+    return "polls:page:" + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def page_version(match, request):
+    """이 페이지 내용이 의존하는 버전 (바뀌면 저장된 응답은 stale)"""
+    if match.view_name == "polls:index":
+        return ("index", index_generation())
+    pk = match.kwargs.get("pk") or match.kwargs.get("question_id")
+    if pk is not None:
+        return ("question", get_version(int(pk)))
+    return None
+
+
+def page_timeout(match, request):
+    ttl = getattr(settings, "POLLS_PAGE_CACHE_TTL", 10)
+    if match.view_name == "polls:index":
+        # 미래 질문 공개 시각이 지나면 목록이 바뀐다 (fragment_cache 와 같은 규칙)
+        ttl = min(ttl, index_cache_timeout(request.GET))
+    return ttl
+
+
+def _bypass_cookies():
+    return (settings.SESSION_COOKIE_NAME, "messages")
+
+
+def _vary_is_cookie_only(response):
+    vary = response.get("Vary")
+    if not vary:
+        return True
+    return all(header.strip().lower() == "cookie" for header in vary.split(","))
+
+
+class PageCacheMiddleware:
+    """
+    SessionMiddleware 보다 앞(바깥)에 둔다. 저장된 응답에는 안쪽 미들웨어가 붙인 헤더도 같이 들어 있고,
+    바깥 미들웨어(Security, RequestTiming)는 캐시된 응답에도 그대로 적용된다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self._lookup(request)
+        if isinstance(state, HttpResponse):
+            return state
+        response = self.get_response(request)
+        return self._store(request, response, state)
+
+    async def __acall__(self, request):
+        # 조회는 목록 TTL 계산에서 DB 를 읽을 수 있어서 sync 로 (저장은 캐시 쓰기만 하므로 그대로)
+        state = await sync_to_async(self._lookup)(request)
+        if isinstance(state, HttpResponse):
+            return state
+        response = await self.get_response(request)
+        return self._store(request, response, state)
+
+    def _lookup(self, request):
+        """캐시된 응답(HttpResponse) 또는 저장에 필요한 상태(dict) / None(캐시 대상 아님)"""
+        if not getattr(settings, "POLLS_PAGE_CACHE", True) or request.method not in ("GET", "HEAD"):
+            return None
+        if any(name in request.COOKIES for name in _bypass_cookies()):
+            metrics.inc("polls_page_cache_requests_total", result="bypass")
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if match.view_name not in getattr(settings, "POLLS_PAGE_CACHE_VIEWS", ()):
+            return None
+        # 캐시된 응답은 CommonMiddleware 앞에서 나가므로 ALLOWED_HOSTS 검사를 여기서 (DisallowedHost → 400)
+        request.get_host()
+
+        cache = _cache()
+        key = page_cache_key(request)
+        version = page_version(match, request)
+        ttl = page_timeout(match, request)
+        state = {"key": key, "version": version, "ttl": ttl, "locked": False}
+        entry = cache.get(key)
+        if entry is not None:
+            fresh = entry["version"] == version and time.time() - entry["stored"] <= ttl
+            if fresh:
+                return self._cached_response(request, match, entry, "hit")
+            # stale: 잠금을 잡은 요청만 다시 만든다
+            if cache.add(f"{key}:lock", 1, LOCK_TIMEOUT):
+                state["locked"] = True
+            else:
+                return self._cached_response(request, match, entry, "stale")
+        metrics.inc("polls_page_cache_requests_total", result="miss")
+        return state
+
+    def _cached_response(self, request, match, entry, result):
+        metrics.inc("polls_page_cache_requests_total", result=result)
+        # RequestTimingMiddleware 가 URL 이름별 통계에 넣을 수 있도록
+        request.resolver_match = match
+        response = HttpResponse(entry["content"], status=entry["status"])
+        for name, value in entry["headers"]:
+            response[name] = value
+        response[HEADER] = result.upper()
+        return response
+
+    def _store(self, request, response, state):
+        if state is None:
+            return response
+        cache = _cache()
+        key = state["key"]
+        storable = (
+            request.method == "GET"
+            and response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not response.has_header("Cache-Control")
+            and _vary_is_cookie_only(response)
+        )
+        if storable:
+            entry = {
+                "content": response.content,
+                "status": response.status_code,
+                "headers": list(response.items()),
+                "version": state["version"],
+                "stored": time.time(),
+            }
+            # TTL 이 지나도 stale 로 더 쓸 수 있도록 STALE 초만큼 더 보관
+            stale = getattr(settings, "POLLS_PAGE_CACHE_STALE", 30)
+            cache.set(key, entry, state["ttl"] + stale)
+        elif state["locked"] and request.method == "GET":
+            # 다시 만든 결과가 저장할 수 없는 응답(404 등)이면 stale 항목도 버린다
+            # (HEAD 는 저장하지 않을 뿐이므로 stale 항목은 그대로 두고 잠금만 푼다)
+            cache.delete(key)
+        if state["locked"]:
+            cache.delete(f"{key}:lock")
+        response[HEADER] = "MISS" if storable else "BYPASS"
+        return response
@@ -0,0 +1,96 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+# 커서(keyset) 페이지네이션
+# OFFSET 대신 "마지막으로 본 행의 정렬 키" 다음부터 읽으므로
+# 몇 번째 페이지든 첫 페이지와 같은 비용으로 조회된다.
+#
+# ordering 은 (정렬 필드, "id") 두 개짜리 튜플이고 방향은 같아야 한다.
+#   예) ("-pub_date", "-id") / ("pub_date", "id")
+
+
+def encode_cursor(values):
+    """정렬 키 값 목록 → URL 에 넣을 수 있는 불투명 토큰"""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """토큰 → 정렬 키 값 목록. 형식이 틀리면 None"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != 2:
+        return None
+    # 정렬 키/id 는 문자열이나 숫자 하나씩 (리스트/객체/불리언, DB 정수 범위를 넘는 수는 잘못된 토큰)
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            return None
+        if isinstance(value, int) and not -(2 ** 63) <= value < 2 ** 63:
+            return None
+    return values
+
+
+def _field_name(order):
+    return order.lstrip("-")
+
+
+def keyset_queryset(qs, ordering, cursor):
+    """qs 를 ordering 으로 정렬하고, cursor 가 있으면 그 다음 행부터 오도록 필터"""
+    key_field, id_field = (_field_name(o) for o in ordering)
+    descending = ordering[0].startswith("-")
+    qs = qs.order_by(*ordering)
+
+    values = decode_cursor(cursor)
+    if values is None:
+        return qs
+    try:
+        key = qs.model._meta.get_field(key_field).to_python(values[0])
+        last_id = qs.model._meta.get_field(id_field).to_python(values[1])
+    except (ValidationError, TypeError, ValueError, OverflowError):
+        return qs
+    if key is None or last_id is None:
+        return qs
+    op = "lt" if descending else "gt"
+    # key <= v AND (key < v OR id < last_id)  (오름차순이면 부등호 반대)
+    # 앞쪽 조건이 (key, id) 인덱스 범위 스캔으로 바로 쓰인다.
+    return qs.filter(
+        Q(**{f"{key_field}__{op}e": key})
+        & (Q(**{f"{key_field}__{op}": key}) | Q(**{f"{id_field}__{op}": last_id}))
+    )
+
+
+def keyset_page(qs, ordering, cursor, page_size):
+    """
+    qs 를 ordering 으로 정렬해 cursor 다음 page_size 개를 가져온다.
+    (items, next_cursor) 반환. 마지막 페이지면 next_cursor 는 None.
+    잘못된 cursor 는 무시하고 첫 페이지를 돌려준다.
+    """
+    rows = list(keyset_queryset(qs, ordering, cursor)[: page_size + 1])
+    return _split_page(rows, ordering, page_size)
+
+
+async def akeyset_page(qs, ordering, cursor, page_size):
+    """keyset_page 의 async 버전 (async for 로 조회)"""
+    rows = [row async for row in keyset_queryset(qs, ordering, cursor)[: page_size + 1]]
+    return _split_page(rows, ordering, page_size)
+
+
+def _split_page(rows, ordering, page_size):
+    """page_size + 1 개 조회 결과 → (items, next_cursor)"""
+    key_field, id_field = (_field_name(o) for o in ordering)
+    items = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, key_field), getattr(last, id_field)])
+    return items, next_cursor
@@ -5,6 +5,7 @@ from django.views import generic
 from django.shortcuts import render
 
 from .models import Question 
+from .search import search_questions
 
 
 
@@ -47,8 +48,9 @@ def practice_2(request):
     q = request.GET.get("q")    # TODO : q 꺼내기
 
     # TODO : q가 있을 때만
+    # icontains(LIKE 전체 스캔) 대신 전문 검색 인덱스 사용
     if q :  
-        qs = qs.filter(question_text__icontains=q)
+        qs = search_questions(qs, q)
 
     # 결과 개수만 화면에 보여주기
     return HttpResponse(f"검색어: {q} / 결과 개수: {qs.count()}")
@@ -58,8 +60,9 @@ def practice_api_2(request):
     q = request.GET.get("q") # TODO : q 꺼내기
 
     # TODO : q가 있을 때만
+    # 검색 결과는 관련도 순으로
     if q :
-        qs = qs.filter(question_text__icontains=q)
+        qs = search_questions(qs, q, ranked=True)
 
     return JsonResponse({
         "q": q,
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .models import Question
+
+# 급상승(trending) 점수
+# 점수 = Σ 표마다 0.5 ** (그 표가 들어온 뒤 지난 시간 / 반감기)  ≈ 최근 투표 속도
+#   - 투표: trending_score += n (polls/votes.py, total_votes 와 같은 UPDATE)
+#   - decay_trending 명령: 주기적으로 모든 점수에 0.5 ** (지난 시간 / 반감기) 를 곱한다
+# 모든 질문이 같은 시점에 같은 비율로 줄어들어서 점수끼리 바로 비교할 수 있고,
+# 목록은 (trending_score, id) 인덱스를 그대로 읽는다.
+# 주기 사이에 들어온 표는 1 로 더해지므로 오차는 한 주기 동안의 감쇠(기본 10분/6시간 ≈ 2%) 이내.
+
+
+def half_life():
+    return getattr(settings, "POLLS_TRENDING_HALF_LIFE", 6 * 3600)
+
+
+def decay_factor(elapsed, half_life_seconds=None):
+    return 0.5 ** (elapsed / (half_life_seconds or half_life()))
+
+
+def decay_trending(elapsed, half_life_seconds=None, floor=0.01):
+    """
+    elapsed 초만큼 점수를 줄이고 줄인 질문 수를 반환.
+    floor 보다 작아진 점수는 0 으로 만들어 다음 주기부터 건드리지 않는다.
+    """
+    factor = decay_factor(elapsed, half_life_seconds)
+    with transaction.atomic():
+        decayed = Question.objects.filter(trending_score__gt=0).update(
+            trending_score=F("trending_score") * factor
+        )
+        Question.objects.filter(trending_score__gt=0, trending_score__lt=floor).update(trending_score=0)
+    return decayed
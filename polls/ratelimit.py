@@ -0,0 +1,257 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse, JsonResponse
+
+from . import metrics
+
+# 투표 속도 제한 (token bucket)
+# 투표 view 가 질문을 조회하기 전에 검사해서, 넘치면 ORM 쿼리 없이 바로 429 를 돌려준다.
+#   질문별: (세션 쿠키 또는 IP, 질문) 마다 POLLS_VOTE_RATE_PER_QUESTION
+#   클라이언트별: IP 마다 모든 질문 합쳐서 POLLS_VOTE_RATE_PER_CLIENT (쿠키를 바꿔 가며 보내는 봇 대비)
+#   요율 형식 "5/60" = 최대 5개까지 몰아서, 60초에 5개씩 다시 참
+# request.user 는 세션을 DB 에서 읽어야 하므로 쓰지 않는다 (로그인 사용자는 세션 쿠키로 구분됨).
+# 클라이언트 IP 는 POLLS_CLIENT_IP_HEADER / POLLS_TRUSTED_PROXY_COUNT 로 (client_ip 참고)
+# 저장소 (POLLS_VOTE_RATE_BACKEND)
+#   memory: 프로세스 안 dict. 다시 가득 찬 버킷은 지우고, 최대 개수를 넘으면 오래 안 쓴 것부터
+#   mmap: 워커들이 같이 쓰는 고정 크기 파일 (해시 슬롯 테이블 + flock), gunicorn 워커가 여러 개일 때
+
+SLOT = struct.Struct("<Qddd")  # 키 해시, 남은 토큰, 마지막 갱신 시각, 다시 가득 차는 시각
+PROBE = 16  # 해시 자리부터 살펴볼 슬롯 수
+
+
+def parse_rate(value):
+    """'5/60' → (용량 5, 초당 5/60 개)"""
+    count, _, seconds = str(value).partition("/")
+    count, seconds = float(count), float(seconds or 1)
+    if count <= 0 or seconds <= 0:
+        raise ValueError(f"Invalid rate: {value!r}")
+    return count, count / seconds
+
+
+def _take(tokens, updated, capacity, rate, now):
+    """
+    버킷을 now 까지 채우고 토큰 하나를 꺼낸다.
+    (허용 여부, 남은 토큰, 다시 가득 차는 시각, 다시 시도할 때까지 초)
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    if tokens >= 1:
+        tokens -= 1
+        allowed, retry_after = True, 0.0
+    else:
+        allowed, retry_after = False, (1 - tokens) / rate
+    return allowed, tokens, now + (capacity - tokens) / rate, retry_after
+
+
+class MemoryBucketStore:
+    def __init__(self, max_entries=100000, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # 키 → (토큰, 갱신 시각, 가득 차는 시각), 최근에 쓴 것이 뒤
+
+    def take(self, key, capacity, rate):
+        now = self.clock()
+        with self._lock:
+            tokens, updated, _ = self._buckets.pop(key, (capacity, now, now))
+            allowed, tokens, full_at, retry_after = _take(tokens, updated, capacity, rate, now)
+            self._buckets[key] = (tokens, now, full_at)
+            self._evict(now)
+        return allowed, retry_after
+
+    def _evict(self, now):
+        # 가득 찬 버킷은 없는 키와 같다. 앞쪽(오래 안 쓴 쪽)부터 지운다
+        while self._buckets:
+            key, (_, _, full_at) = next(iter(self._buckets.items()))
+            if full_at > now and len(self._buckets) <= self.max_entries:
+                break
+            del self._buckets[key]
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class MmapBucketStore:
+    """
+    path 파일을 slots 개 슬롯으로 나눠 워커끼리 공유한다.
+    키 해시 자리부터 PROBE 칸 안에서 같은 키 → 빈 칸(가득 찬 버킷 포함) → 가장 먼저 가득 찰 칸 순으로 쓴다.
+    밀려난 키는 가득 찬 버킷으로 다시 시작한다.
+    """
+
+    def __init__(self, path, slots=65536, clock=time.time):
+        self.path = path
+        self.slots = slots
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _open(self):
+        # flock 은 열린 파일 단위라 fork 된 워커는 파일을 새로 열어야 서로 막힌다
+        if self._pid == os.getpid():
+            return
+        size = self.slots * SLOT.size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(fd).st_size < size:
+            os.ftruncate(fd, size)
+        self._fd = fd
+        self._map = mmap.mmap(fd, size)
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _hash(key):
+        value = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+        return value or 1  # 0 은 빈 슬롯
+
+    def _find(self, key_hash, now):
+        """(쓸 슬롯 위치, 같은 키의 (토큰, 갱신 시각) 또는 None)"""
+        start = key_hash % self.slots
+        victim, victim_full_at = None, None
+        for i in range(PROBE):
+            offset = (start + i) % self.slots * SLOT.size
+            slot_hash, tokens, updated, full_at = SLOT.unpack_from(self._map, offset)
+            if slot_hash == key_hash:
+                return offset, (tokens, updated)
+            if slot_hash == 0 or full_at <= now:
+                full_at = float("-inf")
+            if victim is None or full_at < victim_full_at:
+                victim, victim_full_at = offset, full_at
+        return victim, None
+
+    def take(self, key, capacity, rate):
+        import fcntl
+
+        key_hash = self._hash(key)
+        with self._lock:
+            self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = self.clock()
+                offset, bucket = self._find(key_hash, now)
+                tokens, updated = bucket or (capacity, now)
+                allowed, tokens, full_at, retry_after = _take(tokens, updated, capacity, rate, now)
+                SLOT.pack_into(self._map, offset, key_hash, tokens, now, full_at)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return allowed, retry_after
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        backend = getattr(settings, "POLLS_VOTE_RATE_BACKEND", "memory")
+        if backend == "mmap":
+            _store = MmapBucketStore(
+                settings.POLLS_VOTE_RATE_FILE, getattr(settings, "POLLS_VOTE_RATE_SLOTS", 65536)
+            )
+        elif backend == "memory":
+            _store = MemoryBucketStore(getattr(settings, "POLLS_VOTE_RATE_MAX_ENTRIES", 100000))
+        else:
+            raise ValueError(f"Unknown POLLS_VOTE_RATE_BACKEND: {backend}")
+    return _store
+
+
+def reset_store():
+    """모든 버킷을 비운다 (memory 는 새로 만들고, mmap 은 다음 사용 때 다시 연다)"""
+    global _store
+    _store = None
+
+
+@receiver(setting_changed)
+def _reset_store(setting, **kwargs):
+    if setting.startswith("POLLS_VOTE_RATE"):
+        reset_store()
+
+
+def client_ip(request):
+    """
+    POLLS_CLIENT_IP_HEADER 로 알아낸 클라이언트 IP. 알 수 없으면 None.
+    X-Forwarded-For: <클라이언트가 보낸 값...>, client, proxy1  → 오른쪽에서 POLLS_TRUSTED_PROXY_COUNT 번째
+    """
+    header = getattr(settings, "POLLS_CLIENT_IP_HEADER", "REMOTE_ADDR")
+    if not header:
+        return None
+    if header == "REMOTE_ADDR":
+        return request.META.get("REMOTE_ADDR") or None
+    value = request.META.get(header)
+    if not value:
+        # 프록시를 거치지 않은 요청 (예: 내부 헬스 체크) 이면 직접 연결한 주소
+        return request.META.get("REMOTE_ADDR") or None
+    hops = [hop.strip() for hop in value.split(",")]
+    count = max(1, getattr(settings, "POLLS_TRUSTED_PROXY_COUNT", 1))
+    if len(hops) < count:
+        return None
+    return hops[-count] or None
+
+
+def check_vote_rate(request, question_id):
+    """
+    제한에 걸리면 다시 시도할 때까지 초, 아니면 None (DB 를 쓰지 않는다).
+    IP 를 모르면(프록시 주소뿐이면) IP 기준 규칙은 건너뛴다. 모두를 프록시 IP 하나로 묶지 않도록.
+    """
+    if not getattr(settings, "POLLS_VOTE_RATE_LIMIT", True):
+        return None
+    store = get_store()
+    ip = client_ip(request)
+    session = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    voter = f"s:{session}" if session else (f"ip:{ip}" if ip else None)
+    rules = []
+    if voter is not None:
+        rules.append(("question", f"vote:{voter}:{question_id}", settings.POLLS_VOTE_RATE_PER_QUESTION))
+    if ip is not None:
+        rules.append(("client", f"vote:ip:{ip}", settings.POLLS_VOTE_RATE_PER_CLIENT))
+    for scope, key, rate in rules:
+        allowed, retry_after = store.take(key, *parse_rate(rate))
+        if not allowed:
+            metrics.inc("polls_votes_rate_limited_total", scope=scope)
+            return retry_after
+    return None
+
+
+def rate_limited_response(retry_after, json=False):
+    seconds = max(1, int(retry_after + 0.999))
+    message = f"Too many votes. Try again in {seconds} seconds."
+    if json:
+        response = JsonResponse({"error": message, "retry_after": seconds}, status=429)
+    else:
+        response = HttpResponse(message, status=429, content_type="text/plain; charset=utf-8")
+    response["Retry-After"] = str(seconds)
+    return response
+
+
+def limit_votes(json=False):
+    """투표 view 데코레이터. URL 의 질문 id(question_id 또는 pk) 별로 제한한다"""
+
+    def decorator(view):
+        def _retry_after(request, kwargs):
+            return check_vote_rate(request, kwargs.get("question_id", kwargs.get("pk")))
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                retry_after = _retry_after(request, kwargs)
+                if retry_after is not None:
+                    return rate_limited_response(retry_after, json)
+                return await view(request, *args, **kwargs)
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                retry_after = _retry_after(request, kwargs)
+                if retry_after is not None:
+                    return rate_limited_response(retry_after, json)
+                return view(request, *args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,141 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import metrics
+from .models import Choice, Question
+from .signals import votes_recorded
+from .versions import aget_version, get_version, get_versions
+from .votes import with_vote_totals
+
+# 결과 캐시 항목은 (질문 버전, 결과) 로 저장한다.
+# 워커마다 따로인 locmem 캐시라도, 다른 워커의 투표로 공유 버전(polls/versions.py)이 바뀌면
+# 버전이 달라진 항목은 없는 것으로 보고 다시 계산한다.
+# 버전은 계산 전에 읽는다: 그 사이 투표가 들어와도 예전 버전으로 저장되어 다음 조회 때 다시 계산된다.
+
+
+def _cache():
+    return caches[getattr(settings, "POLLS_RESULTS_CACHE_ALIAS", "polls_results")]
+
+
+def _key(question_id):
+    return f"polls:results:{question_id}"
+
+
+def _build_results(rows):
+    total = sum(votes for _, _, votes in rows)
+    return [
+        {
+            "id": choice_id,
+            "choice_text": text,
+            "votes": votes,
+            "percentage": round(votes * 100 / total, 1) if total else 0.0,
+        }
+        for choice_id, text, votes in rows
+    ]
+
+
+def compute_results(question_id):
+    """
+    질문의 결과 목록을 DB 에서 계산.
+    [{"id", "choice_text", "votes", "percentage"}, ...] (선택지 id 순)
+    """
+    return compute_many_results([question_id])[question_id]
+
+
+def _results_rows(question_ids):
+    return (
+        with_vote_totals(Choice.objects.filter(question_id__in=question_ids))
+        .order_by("question_id", "id")
+        .values_list("question_id", "id", "choice_text", "vote_total")
+    )
+
+
+def compute_many_results(question_ids):
+    """여러 질문의 결과를 쿼리 한 번으로 계산. {question_id: 결과 목록}"""
+    rows = {qid: [] for qid in question_ids}
+    for question_id, choice_id, text, votes in _results_rows(question_ids):
+        rows[question_id].append((choice_id, text, votes))
+    return {qid: _build_results(choice_rows) for qid, choice_rows in rows.items()}
+
+
+def _fresh(entry, version):
+    """캐시 항목이 현재 버전의 결과면 결과, 아니면 None"""
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    return None
+
+
+def get_results(question_id):
+    """캐시에 현재 버전이 있으면 캐시에서, 없으면 계산해서 캐시에 넣고 반환"""
+    cache = _cache()
+    version = get_version(question_id)
+    results = _fresh(cache.get(_key(question_id)), version)
+    if results is None:
+        metrics.inc("polls_results_cache_requests_total", result="miss")
+        results = compute_results(question_id)
+        cache.set(_key(question_id), (version, results))
+    else:
+        metrics.inc("polls_results_cache_requests_total", result="hit")
+    return results
+
+
+async def aget_results(question_id):
+    """get_results 의 async 버전 (cache.aget + async for)"""
+    cache = _cache()
+    version = await aget_version(question_id)
+    results = _fresh(await cache.aget(_key(question_id)), version)
+    if results is None:
+        metrics.inc("polls_results_cache_requests_total", result="miss")
+        rows = [
+            (choice_id, text, votes)
+            async for _, choice_id, text, votes in _results_rows([question_id])
+        ]
+        results = _build_results(rows)
+        await cache.aset(_key(question_id), (version, results))
+    else:
+        metrics.inc("polls_results_cache_requests_total", result="hit")
+    return results
+
+
+def get_many_results(question_ids):
+    """여러 질문의 결과. 캐시에 현재 버전이 없는 것만 모아서 한 번에 계산"""
+    cache = _cache()
+    versions = get_versions(question_ids)
+    keys = {_key(qid): qid for qid in question_ids}
+    results = {}
+    for key, entry in cache.get_many(keys).items():
+        fresh = _fresh(entry, versions[keys[key]])
+        if fresh is not None:
+            results[keys[key]] = fresh
+    missing = [qid for qid in question_ids if qid not in results]
+    if results:
+        metrics.inc("polls_results_cache_requests_total", len(results), result="hit")
+    if missing:
+        metrics.inc("polls_results_cache_requests_total", len(missing), result="miss")
+        computed = compute_many_results(missing)
+        cache.set_many({_key(qid): (versions[qid], value) for qid, value in computed.items()})
+        results.update(computed)
+    return results
+
+
+def invalidate_results(question_id):
+    _cache().delete(_key(question_id))
+
+
+# 투표 / 선택지 변경(관리자 수정 포함) 시 해당 질문 캐시 무효화
+@receiver(votes_recorded)
+def _invalidate_on_vote(sender, question_id, **kwargs):
+    invalidate_results(question_id)
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def _invalidate_on_choice_change(sender, instance, **kwargs):
+    invalidate_results(instance.question_id)
+
+
+@receiver(post_save, sender=Question)
+def _invalidate_on_question_save(sender, instance, **kwargs):
+    invalidate_results(instance.pk)
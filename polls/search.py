@@ -0,0 +1,227 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+from .models import Question
+
+# 질문 검색
+# question_text__icontains 는 LIKE '%q%' 전체 스캔이라 질문이 많아지면 느리다.
+# 질문 저장 시 검색용 토큰 문자열(search_document)을 만들어 두고
+#   - PostgreSQL: to_tsvector GIN 인덱스
+#   - SQLite: FTS5 가상 테이블 (signal 로 동기화)
+# 로 찾는다. 둘 다 안 되면 기존 icontains 로 동작.
+
+HANGUL = "가-힣ㄱ-ㆎ"
+TOKEN_RE = re.compile(rf"[{HANGUL}]+|[^\W_{HANGUL}]+")
+HANGUL_RE = re.compile(rf"[{HANGUL}]")
+
+FTS_TABLE = "polls_question_fts"
+
+
+def tokenize(text):
+    """
+    검색용 토큰 목록.
+    영문/숫자는 단어 단위(소문자), 한글은 형태소 분석 대신 2글자씩 자른 bigram.
+      "SQL 배우기" → ["sql", "배우", "우기"]
+    """
+    tokens = []
+    for word in TOKEN_RE.findall((text or "").lower()):
+        if HANGUL_RE.match(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def build_search_document(text):
+    """
+    Question.search_document 에 저장할 문자열 (토큰을 공백으로 이어 붙임).
+    같은 토큰도 나온 만큼 남겨서 ts_rank / bm25 가 단어 빈도로 순위를 매길 수 있게 한다.
+    """
+    return " ".join(tokenize(text))
+
+
+def is_hangul(token):
+    return bool(HANGUL_RE.match(token))
+
+
+class LikeSearchBackend:
+    """전문 검색을 쓸 수 없을 때: 기존 icontains"""
+
+    name = "like"
+
+    def supports(self, tokens):
+        return True
+
+    def filter(self, qs, query, tokens):
+        return qs.filter(question_text__icontains=query)
+
+    def rank(self, qs, query, tokens):
+        return self.filter(qs, query, tokens).order_by("-pub_date", "-id")
+
+    def index(self, question):
+        pass
+
+    def index_many(self, questions):
+        """bulk_create 처럼 signal 없이 들어간 질문들을 색인"""
+        for question in questions:
+            self.index(question)
+
+    def remove(self, question_id):
+        pass
+
+
+class PostgresSearchBackend(LikeSearchBackend):
+    """to_tsvector('simple', search_document) GIN 인덱스 + ts_rank"""
+
+    name = "postgres"
+    vector_sql = "to_tsvector('simple', \"polls_question\".\"search_document\")"
+
+    def supports(self, tokens):
+        # 한글 한 글자는 bigram 으로 찾을 수 없으므로 LIKE 로
+        return bool(tokens) and not any(is_hangul(t) and len(t) == 1 for t in tokens)
+
+    def _tsquery(self, tokens):
+        # 영문 토큰은 앞부분만 입력해도 찾도록 prefix(:*) 검색
+        return " & ".join(t if is_hangul(t) else f"{t}:*" for t in tokens)
+
+    def filter(self, qs, query, tokens):
+        return qs.filter(RawSQL(
+            f"{self.vector_sql} @@ to_tsquery('simple', %s)",
+            [self._tsquery(tokens)],
+            output_field=BooleanField(),
+        ))
+
+    def rank(self, qs, query, tokens):
+        return self.filter(qs, query, tokens).annotate(search_rank=RawSQL(
+            f"ts_rank({self.vector_sql}, to_tsquery('simple', %s))",
+            [self._tsquery(tokens)],
+            output_field=FloatField(),
+        )).order_by("-search_rank", "-pub_date", "-id")
+
+
+class SQLiteFTSSearchBackend(PostgresSearchBackend):
+    """FTS5 가상 테이블(rowid = Question.id) + bm25"""
+
+    name = "sqlite_fts"
+
+    def _match(self, tokens):
+        return " AND ".join(
+            f'"{t}"' if is_hangul(t) else f'"{t}"*' for t in tokens
+        )
+
+    def filter(self, qs, query, tokens):
+        return qs.filter(pk__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            [self._match(tokens)],
+        ))
+
+    def rank(self, qs, query, tokens):
+        # FTS 테이블을 한 번만 조인해서 MATCH 하고 bm25 로 정렬 (작을수록 관련도가 높으므로 부호를 바꿈)
+        return qs.extra(
+            select={"search_rank": f"-bm25({FTS_TABLE})"},
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = \"polls_question\".\"id\"", f"{FTS_TABLE} MATCH %s"],
+            params=[self._match(tokens)],
+        ).order_by("-search_rank", "-pub_date", "-id")
+
+    def index(self, question):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [question.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, search_document) VALUES (%s, %s)",
+                [question.pk, question.search_document],
+            )
+
+    def index_many(self, questions):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [[q.pk] for q in questions]
+            )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, search_document) VALUES (%s, %s)",
+                [[q.pk, q.search_document] for q in questions],
+            )
+
+    def remove(self, question_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [question_id])
+
+
+_backend = None
+
+
+def get_search_backend():
+    """
+    POLLS_SEARCH_BACKEND 설정(auto/postgres/sqlite_fts/memory/like)에 맞는 검색 백엔드.
+    auto 면 DB 종류와 FTS5 테이블 존재 여부로 고른다.
+    """
+    global _backend
+    if _backend is None:
+        choice = getattr(settings, "POLLS_SEARCH_BACKEND", "auto")
+        if choice == "auto":
+            if connection.vendor == "postgresql":
+                choice = "postgres"
+            elif (connection.vendor == "sqlite"
+                  and FTS_TABLE in connection.introspection.table_names()):
+                choice = "sqlite_fts"
+            else:
+                choice = "like"
+        _backend = import_string(BACKENDS[choice])()
+    return _backend
+
+
+BACKENDS = {
+    "like": "polls.search.LikeSearchBackend",
+    "postgres": "polls.search.PostgresSearchBackend",
+    "sqlite_fts": "polls.search.SQLiteFTSSearchBackend",
+    "memory": "polls.inverted_index.MemorySearchBackend",
+}
+
+
+@receiver(setting_changed)
+def _reset_backend(setting, **kwargs):
+    # 테스트에서 override_settings 로 백엔드를 바꿀 수 있게
+    global _backend
+    if setting == "POLLS_SEARCH_BACKEND":
+        _backend = None
+
+
+def search_questions(qs, query, ranked=False):
+    """
+    qs 를 검색어로 필터. ranked=True 면 관련도(search_rank) 순으로 정렬.
+    백엔드가 처리할 수 없는 검색어는 icontains 로 대신한다.
+    """
+    query = (query or "").strip()
+    if not query:
+        return qs
+    tokens = list(dict.fromkeys(tokenize(query)))
+    backend = get_search_backend()
+    if not backend.supports(tokens):
+        backend = LikeSearchBackend()
+    if ranked:
+        return backend.rank(qs, query, tokens)
+    return backend.filter(qs, query, tokens)
+
+
+# 검색 문서/인덱스 동기화
+@receiver(pre_save, sender=Question)
+def _build_document(sender, instance, **kwargs):
+    instance.search_document = build_search_document(instance.question_text)
+
+
+@receiver(post_save, sender=Question)
+def _index_question(sender, instance, **kwargs):
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Question)
+def _remove_question(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# 투표가 DB 에 반영된 직후 보내는 신호
+# kwargs: question_id, counts={choice_id: 증가량}
+# (버퍼 모드에서는 flush 시점에 질문별로 한 번씩 보낸다)
+votes_recorded = Signal()
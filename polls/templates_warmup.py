@@ -0,0 +1,65 @@
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+
+logger = logging.getLogger(__name__)
+
+# 템플릿 미리 컴파일
+# 운영 모드(POLLS_TEMPLATE_CACHE)에서는 cached loader 가 한 번 파싱한 템플릿을 워커 메모리에 둔다.
+# 워커가 뜰 때(mysite/wsgi.py, asgi.py) 모든 템플릿을 한 번씩 불러 두면
+# 배포 직후 첫 요청이 파싱 비용을 내지 않는다.
+# {% extends %}/{% include %} 대상은 렌더링할 때 불리므로 부모 템플릿(admin 등 앱 템플릿)까지 전부 연다.
+
+
+def template_names(include_apps=True):
+    """프로젝트 templates/ (+ 앱 templates/) 아래 모든 템플릿 이름. 앞쪽 디렉터리가 우선"""
+    engine = engines["django"].engine
+    dirs = [Path(d) for d in engine.dirs]
+    if include_apps:
+        dirs += [Path(d) for d in get_app_template_dirs("templates")]
+    names = []
+    seen = set()
+    for directory in dirs:
+        for path in sorted(directory.rglob("*")):
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            name = path.relative_to(directory).as_posix()
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+    return names
+
+
+def warm_templates(names=None):
+    """
+    템플릿을 컴파일해서 cached loader 에 채운다.
+    반환: (컴파일한 개수, [(이름, 에러)], 걸린 시간 ms)
+    """
+    engine = engines["django"].engine
+    names = template_names() if names is None else names
+    started = time.perf_counter()
+    compiled = 0
+    errors = []
+    for name in names:
+        try:
+            engine.get_template(name)
+        except (TemplateSyntaxError, UnicodeDecodeError) as exc:
+            errors.append((name, exc))
+        else:
+            compiled += 1
+    return compiled, errors, (time.perf_counter() - started) * 1000
+
+
+def precompile_on_startup():
+    """wsgi/asgi 모듈에서 호출. 운영 모드가 아니면 아무것도 하지 않는다"""
+    if not getattr(settings, "POLLS_TEMPLATE_CACHE", False):
+        return
+    compiled, errors, elapsed_ms = warm_templates()
+    for name, exc in errors:
+        # 서버는 띄우고 로그만 남긴다 (배포 전 검사는 manage.py warm_templates)
+        logger.error("template %s failed to compile: %s", name, exc)
+    logger.info("precompiled %d templates in %.0fms", compiled, elapsed_ms)
@@ -1,9 +1,54 @@
 # 개선 후 테스트 코드
 import datetime
-from django.test import TestCase, Client
+import gzip
+import importlib
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.urls import clear_url_caches
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, Client, override_settings
 from django.utils import timezone
 from django.urls import reverse
-from .models import Question
+from .models import Question, Choice, ChoiceVoteShard, Vote
+from .cache_backends import LRUFileBasedCache
+from .checks import check_results_cache_workers, check_versions_cache, configured_workers, warn_on_startup
+from .counters import stale_counters
+from .pagination import encode_cursor
+from .fragment_cache import GENERATION_KEY, index_cache_key, index_cache_timeout
+from .generators import generate_records, zipf_split
+from .importers import import_records
+from .inverted_index import InvertedIndex
+from .benchmarking import Client as BenchClient, parse_server_timing, summarize
+from .live import LiveResultsBroadcaster, astream_results
+from .management.commands.bench_polls import Command as BenchPollsCommand, index_scenarios
+from .metrics import MetricsRegistry, get_registry, record_db_pool_stats
+from .page_cache import page_cache_key
+from .middleware import TimingStats, get_request_stats
+from .results_cache import get_results
+from .versions import bump_version
+from .templates_warmup import template_names, warm_templates
+from .ranking import decay_trending
+from .ratelimit import PROBE, MemoryBucketStore, MmapBucketStore, parse_rate, reset_store
+from .search import build_search_document, get_search_backend, search_questions, tokenize
+from .vote_buffer import VoteBuffer
+from .voters import voted_questions
+from .votes import arecord_vote, compact_shards, insert_ballot, record_vote
 from django.contrib.auth.models import User
 
 
@@ -19,6 +64,58 @@ def create_question(question_text, days):
         )
 
 
+def clear_fragment_cache():
+    """
+    목록/페이지 캐시는 테스트 사이에 남는다 (롤백은 signal 이 없어 세대가 안 바뀌고 id 도 재사용됨).
+    목록 화면을 검사하는 테스트는 setUp 에서 비운다.
+    """
+    caches["polls_fragments"].clear()
+    caches["polls_pages"].clear()
+
+
+def warm_next_publication():
+    """
+    목록 세대가 바뀐 뒤 첫 목록 요청은 다음 공개 시각을 한 번 읽는다 (쿼리 1개, 세대당 한 번).
+    목록 쿼리 자체의 개수를 재는 테스트는 먼저 이것으로 채워 둔다.
+    """
+    index_cache_timeout({})
+
+
+# 쿼리 수 예산 (N+1 회귀 방지)
+@contextmanager
+def query_budget(limit, using=DEFAULT_DB_ALIAS):
+    """
+    블록 안에서 실행된 SQL 이 limit 개를 넘으면 실패.
+    assertNumQueries 와 달리 "이하" 면 통과하므로 최적화로 줄어드는 건 막지 않는다.
+    """
+    with CaptureQueriesContext(connections[using]) as captured:
+        yield captured
+    if len(captured) > limit:
+        sql = "\n".join(f"{i}. {q['sql']}" for i, q in enumerate(captured.captured_queries, 1))
+        raise AssertionError(
+            f"{len(captured)} queries executed, budget is {limit}\n{sql}"
+        )
+
+
+class QueryBudgetMixin:
+    """
+    TestCase 에 섞어서 쓰는 쿼리 예산 검사.
+    query_budgets = {"url 이름": 최대 쿼리 수} 를 선언하고 assertWithinBudget 으로 요청한다.
+    """
+
+    query_budgets = {}
+
+    def assertMaxQueries(self, limit, using=DEFAULT_DB_ALIAS):
+        return query_budget(limit, using)
+
+    def assertWithinBudget(self, url_name, args=(), query_string="", method="get", data=None):
+        limit = self.query_budgets[url_name]
+        url = reverse(f"polls:{url_name}", args=args) + query_string
+        with self.assertMaxQueries(limit):
+            response = getattr(self.client, method)(url, data or {})
+        return response
+
+
 # 모델 메서드 테스트(변경됨)
 class QuestionModelTests(TestCase):
     def setUp(self):
@@ -48,6 +145,7 @@ class QuestionModelTests(TestCase):
 # 수정코드, polls/views.py 코드
 class QuestionIndexViewTests(TestCase):
     def setUp(self):
+        clear_fragment_cache()
         self.url = reverse("polls:index")
     
     def _get_questions_from_response(self, url_params=''):
@@ -115,6 +213,22 @@ class QuestionIndexViewTests(TestCase):
         self.assertIn(old, questions)
         self.assertNotIn(recent, questions)
     
+    def test_date_end_filter_includes_whole_day(self):
+        """end 날짜의 마지막 시각(현재 타임존 기준)까지 포함"""
+        end = datetime.date(2026, 1, 31)
+        late = Question.objects.create(
+            question_text="그날 밤 질문",
+            pub_date=timezone.make_aware(datetime.datetime(2026, 1, 31, 23, 59)),
+        )
+        next_day = Question.objects.create(
+            question_text="다음날 질문",
+            pub_date=timezone.make_aware(datetime.datetime(2026, 2, 1, 0, 0)),
+        )
+        questions = self._get_questions_from_response(f'?end={end}&show=future')
+
+        self.assertIn(late, questions)
+        self.assertNotIn(next_day, questions)
+
     def test_order_oldest(self):
         q1 = create_question("질문 1", days=-10)
         q2 = create_question("질문 2", days=-1)
@@ -122,6 +236,150 @@ class QuestionIndexViewTests(TestCase):
         self._assert_questions_equal('?order=oldest&show=future', [q1, q2])
 
 
+class IndexPaginationTests(TestCase):
+    def setUp(self):
+        clear_fragment_cache()
+        self.url = reverse("polls:index")
+        # 12개 질문, 일부는 pub_date 가 같아서 id 로 순서가 갈린다
+        now = timezone.now()
+        self.questions = []
+        for i in range(12):
+            self.questions.append(Question.objects.create(
+                question_text=f"질문 {i}",
+                pub_date=now - datetime.timedelta(days=20 - (i // 2)),
+            ))
+
+    def _collect(self, params):
+        """cursor 를 따라가며 모든 페이지의 질문 id 수집"""
+        ids, cursor, pages = [], None, 0
+        while True:
+            query = dict(params, format="json")
+            if cursor:
+                query["cursor"] = cursor
+            data = self.client.get(self.url, query).json()
+            ids += [row["id"] for row in data["results"]]
+            pages += 1
+            cursor = data["next_cursor"]
+            if not cursor:
+                return ids, pages
+
+    def test_newest_first_pages(self):
+        ids, pages = self._collect({})
+        expected = [q.id for q in sorted(self.questions, key=lambda q: (q.pub_date, q.id), reverse=True)]
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_oldest_first_pages(self):
+        ids, _ = self._collect({"order": "oldest"})
+        expected = [q.id for q in sorted(self.questions, key=lambda q: (q.pub_date, q.id))]
+        self.assertEqual(ids, expected)
+
+    def test_next_page_link_in_template(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context["latest_question_list"]), 5)
+        self.assertContains(response, "cursor=" + response.context["next_cursor"])
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        first = self._get_ids({})
+        self.assertEqual(self._get_ids({"cursor": "not-a-cursor"}), first)
+
+    def test_non_string_cursor_values_fall_back_to_first_page(self):
+        first = self._get_ids({})
+        api_url = reverse("polls:api_question_list")
+        for values in ([1, 1], [[1], 1], [{"a": 1}, 1], [True, 1], ["2026-01-01T00:00:00", 2 ** 70]):
+            cursor = encode_cursor(values)
+            self.assertEqual(self._get_ids({"cursor": cursor}), first)
+            self.assertEqual(self.client.get(api_url, {"cursor": cursor}).status_code, 200)
+
+    def _get_ids(self, params):
+        response = self.client.get(self.url, params)
+        return [q.id for q in response.context["latest_question_list"]]
+
+
+class QuestionSearchTests(TestCase):
+    def setUp(self):
+        clear_fragment_cache()
+        self.sql = create_question("SQL 배우기", days=-1)
+        self.django = create_question("Django 배우기 입문", days=-2)
+        self.food = create_question("좋아하는 음식은?", days=-3)
+
+    def _search(self, q, ranked=False):
+        return list(search_questions(Question.objects.all(), q, ranked=ranked))
+
+    def test_tokenize_uses_hangul_bigrams(self):
+        self.assertEqual(tokenize("SQL 배우기!"), ["sql", "배우", "우기"])
+
+    def test_auto_picks_full_text_backend_for_database(self):
+        expected = {"sqlite": "sqlite_fts", "postgresql": "postgres"}.get(connection.vendor, "like")
+        self.assertEqual(get_search_backend().name, expected)
+
+    def test_search_document_keeps_repeated_tokens(self):
+        self.assertEqual(build_search_document("배우기 배우기"), "배우 우기 배우 우기")
+
+    def test_korean_substring_search(self):
+        self.assertEqual(set(self._search("배우")), {self.sql, self.django})
+        self.assertEqual(self._search("음식"), [self.food])
+
+    def test_english_prefix_search(self):
+        self.assertEqual(self._search("djan"), [self.django])
+
+    def test_single_hangul_falls_back_to_like(self):
+        self.assertEqual(self._search("식"), [self.food])
+
+    def test_ranked_search_orders_by_relevance(self):
+        extra = create_question("배우기 배우기 배우기", days=-4)
+        results = self._search("배우기", ranked=True)
+        self.assertEqual(results[0], extra)
+        self.assertEqual(set(results), {self.sql, self.django, extra})
+
+    def test_index_follows_update_and_delete(self):
+        self.food.question_text = "좋아하는 과일은?"
+        self.food.save()
+        self.assertEqual(self._search("음식"), [])
+        self.assertEqual(self._search("과일"), [self.food])
+
+        self.food.delete()
+        self.assertEqual(self._search("과일"), [])
+
+
+class InvertedIndexTests(TestCase):
+    def setUp(self):
+        self.index = InvertedIndex()
+        self.index.rebuild([(1, "SQL 배우기"), (2, "Django 배우기"), (3, "SQLite 입문")])
+
+    def test_exact_and_prefix_lookup(self):
+        self.assertEqual(self.index.search([("배우", False), ("우기", False)]), {1, 2})
+        self.assertEqual(self.index.search([("sql", True)]), {1, 3})
+        self.assertEqual(self.index.search([("sql", False)]), {1})
+
+    def test_incremental_update(self):
+        self.index.add(2, "Django 입문")
+        self.index.remove(3)
+        self.assertEqual(self.index.search([("입문", False)]), {2})
+        self.assertEqual(self.index.search([("배우", False)]), {1})
+        self.assertEqual(len(self.index), 2)
+
+
+@override_settings(POLLS_SEARCH_BACKEND="memory")
+class MemorySearchBackendTests(TestCase):
+    def setUp(self):
+        self.sql = create_question("SQL 배우기", days=-1)
+        self.django = create_question("Django 배우기", days=-2)
+
+    def test_index_view_search_uses_memory_index(self):
+        self.assertEqual(get_search_backend().name, "memory")
+        response = self.client.get(reverse("polls:index"), {"q": "배우기"})
+        self.assertEqual(set(response.context["latest_question_list"]), {self.sql, self.django})
+
+    def test_signals_keep_index_current(self):
+        search_questions(Question.objects.all(), "sql")  # 색인 생성
+        with self.captureOnCommitCallbacks(execute=True):
+            new = create_question("SQL 심화", days=-1)
+            self.sql.delete()
+
+        self.assertEqual(list(search_questions(Question.objects.all(), "sql")), [new])
+
+
 class QuestionDetailViewTests(TestCase):
     def _get_detail_response(self, question):
         """헬퍼: 질문 상세 페이지 응답 반환"""
@@ -141,6 +399,7 @@ class QuestionDetailViewTests(TestCase):
 
 class VoteViewTests(TestCase):
     def setUp(self):
+        reset_store()
         self.question = create_question("투표 질문", days=-1)
         self.choice = self.question.choice_set.create(choice_text="선택 1")
         self.url = reverse('polls:vote', args=(self.question.id,))
@@ -168,6 +427,1229 @@ def test_vote_invalid_choice(self):
     self.assertIn('error_message', response.context)
 
 
+class VoteBufferTests(TestCase):
+    def setUp(self):
+        reset_store()
+        self.question = create_question("버퍼 질문", days=-1)
+        self.c1 = self.question.choice_set.create(choice_text="선택 1")
+        self.c2 = self.question.choice_set.create(choice_text="선택 2")
+        # 테스트에서는 백그라운드 스레드 없이 직접 flush
+        self.buffer = VoteBuffer(autostart=False)
+
+    def test_flush_applies_counts_in_one_update(self):
+        for _ in range(3):
+            self.buffer.add(self.question.id, self.c1.id)
+        self.buffer.add(self.question.id, self.c2.id)
+
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as captured:
+            flushed = self.buffer.flush()
+
+        # 선택지 UPDATE 한 번 + 같은 트랜잭션에서 질문 total_votes UPDATE 한 번
+        updates = [q["sql"] for q in captured.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+        self.assertIn('"polls_choice"', updates[0])
+        self.assertIn('"polls_question"', updates[1])
+        self.assertEqual(flushed, 4)
+        self.assertEqual(self.buffer.pending_count, 0)
+        self.c1.refresh_from_db()
+        self.c2.refresh_from_db()
+        self.assertEqual((self.c1.votes, self.c2.votes), (3, 1))
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.total_votes, 4)
+
+    @override_settings(POLLS_VOTE_BUFFER_ENABLED=True)
+    def test_buffered_vote_is_written_on_flush(self):
+        url = reverse('polls:vote', args=(self.question.id,))
+        with mock.patch("polls.vote_buffer.get_vote_buffer", return_value=self.buffer):
+            response = self.client.post(url, {'choice': self.c1.id})
+
+        self.assertRedirects(response, reverse('polls:results', args=(self.question.id,)))
+        self.c1.refresh_from_db()
+        self.assertEqual(self.c1.votes, 0)  # 아직 버퍼에만 있음
+
+        self.buffer.flush()
+        self.c1.refresh_from_db()
+        self.assertEqual(self.c1.votes, 1)
+
+
+@override_settings(POLLS_VOTE_SHARDS=4)
+class VoteShardTests(TestCase):
+    def setUp(self):
+        reset_store()
+        self.question = create_question("샤드 질문", days=-1)
+        self.choice = self.question.choice_set.create(choice_text="선택 1", votes=2)
+        self.vote_url = reverse('polls:vote', args=(self.question.id,))
+
+    def _vote(self, times):
+        # 한 사람은 질문당 한 표라 매번 다른 (익명) 클라이언트로
+        for _ in range(times):
+            Client().post(self.vote_url, {'choice': self.choice.id})
+
+    def test_votes_go_to_shards(self):
+        self._vote(5)
+
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.votes, 2)
+        shards = ChoiceVoteShard.objects.filter(choice=self.choice)
+        self.assertLessEqual(shards.count(), 4)
+        self.assertEqual(sum(s.count for s in shards), 5)
+
+    def test_results_show_aggregated_total(self):
+        self._vote(3)
+        response = self.client.get(reverse('polls:results', args=(self.question.id,)))
+        self.assertContains(response, "5 votes")
+
+    def test_compaction_folds_shards_into_votes(self):
+        self._vote(3)
+
+        self.assertEqual(compact_shards(), 3)
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.votes, 5)
+        self.assertFalse(ChoiceVoteShard.objects.filter(count__gt=0).exists())
+
+
+class ResultsCacheTests(TestCase):
+    def setUp(self):
+        reset_store()
+        self.question = create_question("캐시 질문", days=-1)
+        self.c1 = self.question.choice_set.create(choice_text="선택 1", votes=3)
+        self.c2 = self.question.choice_set.create(choice_text="선택 2", votes=1)
+        self.results_url = reverse('polls:results', args=(self.question.id,))
+
+    def test_results_are_precomputed_and_cached(self):
+        results = get_results(self.question.id)
+        self.assertEqual(
+            [(r["choice_text"], r["votes"], r["percentage"]) for r in results],
+            [("선택 1", 3, 75.0), ("선택 2", 1, 25.0)],
+        )
+        with self.assertNumQueries(0):
+            get_results(self.question.id)
+
+    def test_vote_invalidates_cache(self):
+        get_results(self.question.id)
+        self.client.post(reverse('polls:vote', args=(self.question.id,)), {'choice': self.c2.id})
+
+        response = self.client.get(self.results_url)
+        self.assertContains(response, "2 votes (40.0%)")
+
+    def test_choice_edit_invalidates_cache(self):
+        get_results(self.question.id)
+        self.c1.choice_text = "수정된 선택"
+        self.c1.save()
+
+        self.assertEqual(get_results(self.question.id)[0]["choice_text"], "수정된 선택")
+
+
+class LRUFileBasedCacheTests(TestCase):
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        self.cache = LRUFileBasedCache(
+            cache_dir, {"OPTIONS": {"MAX_ENTRIES": 3, "CULL_FREQUENCY": 3}}
+        )
+
+    def test_cull_evicts_least_recently_used(self):
+        for key in ("a", "b", "c"):
+            self.cache.set(key, key)
+            time.sleep(0.01)
+        self.cache.get("a")  # a 를 최근 사용으로
+        time.sleep(0.01)
+        self.cache.set("d", "d")
+
+        self.assertIsNone(self.cache.get("b"))
+        for key in ("a", "c", "d"):
+            self.assertEqual(self.cache.get(key), key)
+
+
+class PollsApiTests(TestCase):
+    def setUp(self):
+        reset_store()
+        self.question = create_question("API 질문", days=-1)
+        self.c1 = self.question.choice_set.create(choice_text="선택 1", votes=1)
+        self.c2 = self.question.choice_set.create(choice_text="선택 2")
+        self.other = create_question("다른 질문", days=-2)
+        self.results_url = reverse("polls:api_question_results", args=(self.question.id,))
+
+    def test_list_and_detail(self):
+        data = self.client.get(reverse("polls:api_question_list")).json()
+        self.assertEqual([q["id"] for q in data["results"]], [self.question.id, self.other.id])
+        self.assertIsNone(data["next_cursor"])
+
+        detail = self.client.get(data["results"][0]["url"]).json()
+        self.assertEqual([c["choice_text"] for c in detail["choices"]], ["선택 1", "선택 2"])
+
+    def test_results_conditional_get(self):
+        first = self.client.get(self.results_url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["results"][0]["votes"], 1)
+        etag = first["ETag"]
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.results_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+
+        self.client.post(reverse("polls:api_vote", args=(self.question.id,)), {"choice": self.c2.id})
+        changed = self.client.get(self.results_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertEqual(changed.json()["results"][1]["votes"], 1)
+
+    def test_vote_in_other_worker_changes_etag_and_cached_results(self):
+        etag = self.client.get(self.results_url)["ETag"]
+        bulk_url = reverse("polls:api_bulk_results")
+        bulk_etag = self.client.get(bulk_url, {"ids": self.question.id})["ETag"]
+        # 다른 워커(프로세스)의 투표: DB 와 공유 버전 파일만 바뀌고 이 워커의 결과 캐시는 그대로
+        Choice.objects.filter(pk=self.c2.id).update(votes=1)
+        other_worker = LRUFileBasedCache(settings.CACHES["polls_versions"]["LOCATION"], {})
+        other_worker.set(f"polls:version:{self.question.id}", 12345, timeout=None)
+
+        changed = self.client.get(self.results_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["results"][1]["votes"], 1)
+        bulk = self.client.get(bulk_url, {"ids": self.question.id}, HTTP_IF_NONE_MATCH=bulk_etag)
+        self.assertEqual(bulk.status_code, 200)
+        self.assertEqual(bulk.json()["results"][0]["results"][1]["votes"], 1)
+
+    def test_unknown_ids_do_not_create_versions(self):
+        versions = caches["polls_versions"]
+        fake_ids = [990001, 990002, 990003]
+        for pk in fake_ids:
+            versions.delete(f"polls:version:{pk}")
+            self.assertEqual(self.client.get(reverse("polls:api_question_results", args=(pk,))).status_code, 404)
+            self.assertEqual(self.client.get(reverse("polls:results", args=(pk,))).status_code, 404)
+        self.client.get(reverse("polls:api_bulk_results"), {"ids": ",".join(map(str, fake_ids))})
+        self.assertFalse(any(versions.has_key(f"polls:version:{pk}") for pk in fake_ids))
+
+    def test_bulk_results(self):
+        url = reverse("polls:api_bulk_results")
+        ids = f"{self.question.id},{self.other.id},99999"
+        response = self.client.get(url, {"ids": ids})
+        data = response.json()["results"]
+        self.assertEqual([row["id"] for row in data], [self.question.id, self.other.id])
+        self.assertEqual(data[1]["results"], [])
+
+        again = self.client.get(url, {"ids": ids}, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_vote_requires_valid_choice(self):
+        url = reverse("polls:api_vote", args=(self.question.id,))
+        self.assertEqual(self.client.post(url, {}).status_code, 400)
+        self.assertEqual(self.client.post(url, {"choice": "abc"}).status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 405)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.q1 = create_question("내보내기 1", days=-10)
+        self.q1.choice_set.create(choice_text="선택 A", votes=3)
+        self.q1.choice_set.create(choice_text="선택 B", votes=1)
+        self.q2 = create_question("내보내기 2", days=-1)
+        self.url = reverse("polls:export")
+        User.objects.create_user("staff", password="pass1234!@", is_staff=True)
+
+    def _get(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_requires_staff(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_ndjson_export(self):
+        self.client.login(username="staff", password="pass1234!@")
+        rows = [json.loads(line) for line in self._get({}).decode().splitlines()]
+        self.assertEqual([r["id"] for r in rows], [self.q1.id, self.q2.id])
+        self.assertEqual([c["votes"] for c in rows[0]["choices"]], [3, 1])
+        self.assertEqual(rows[1]["choices"], [])
+
+    def test_csv_export_with_gzip_and_date_filter(self):
+        self.client.login(username="staff", password="pass1234!@")
+        start = (timezone.now() - datetime.timedelta(days=5)).date()
+        body = gzip.decompress(self._get({"format": "csv", "gzip": "1", "start": start}))
+        lines = body.decode().splitlines()
+        self.assertEqual(lines[0], "question_id,question_text,pub_date,choice_id,choice_text,votes")
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith(f"{self.q2.id},내보내기 2,"))
+
+    def test_export_command(self):
+        out_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, out_dir, ignore_errors=True)
+        path = os.path.join(out_dir, "polls.csv")
+        call_command("export_polls", format="csv", output=path, stderr=io.StringIO())
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 4)  # 헤더 + 선택지 2 + 선택지 없는 질문 1
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+
+    def _write(self, name, text):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_import_ndjson(self):
+        path = self._write("polls.ndjson", "\n".join([
+            json.dumps({"question_text": "가져온 질문", "pub_date": "2026-01-02T10:00:00+09:00",
+                        "choices": [{"choice_text": "예", "votes": 4}, {"choice_text": "아니오"}]}),
+            json.dumps({"question_text": "선택지 없는 질문", "choices": []}),
+        ]))
+        call_command("import_polls", path, batch_size=1, stdout=io.StringIO())
+
+        imported = Question.objects.get(question_text="가져온 질문")
+        self.assertEqual(
+            list(imported.choice_set.order_by("id").values_list("choice_text", "votes")),
+            [("예", 4), ("아니오", 0)],
+        )
+        self.assertEqual(imported.pub_date, datetime.datetime(2026, 1, 2, 1, tzinfo=datetime.timezone.utc))
+        # bulk_create 로 넣은 질문도 검색된다
+        self.assertEqual(list(search_questions(Question.objects.all(), "가져온")), [imported])
+
+    def test_export_import_roundtrip_csv(self):
+        q = create_question("왕복 질문", days=-1)
+        q.choice_set.create(choice_text="A", votes=2)
+        q.choice_set.create(choice_text="B", votes=5)
+        path = os.path.join(self.tmp_dir, "polls.csv")
+        call_command("export_polls", format="csv", output=path, stderr=io.StringIO())
+
+        call_command("import_polls", path, stdout=io.StringIO())
+
+        copies = Question.objects.filter(question_text="왕복 질문").order_by("id")
+        self.assertEqual(copies.count(), 2)
+        self.assertEqual(
+            list(copies[1].choice_set.order_by("id").values_list("choice_text", "votes")),
+            [("A", 2), ("B", 5)],
+        )
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    # 질문/선택지 수와 상관없이 지켜야 하는 뷰별 최대 쿼리 수
+    query_budgets = {
+        "index": 1,
+        "detail": 2,
+        "results": 2,
+        "api_question_list": 1,
+        "api_question_detail": 2,
+        "api_bulk_results": 2,
+    }
+
+    def setUp(self):
+        clear_fragment_cache()
+        self.questions = [create_question(f"질문 {i}", days=-i - 1) for i in range(6)]
+        for q in self.questions:
+            for j in range(5):
+                q.choice_set.create(choice_text=f"선택 {j}", votes=j)
+        self.question = self.questions[0]
+
+    def test_listings(self):
+        warm_next_publication()
+        response = self.assertWithinBudget("index")
+        self.assertEqual(len(response.context["latest_question_list"]), 5)
+        self.assertWithinBudget("index", query_string="?order=oldest&q=질문")
+        self.assertWithinBudget("api_question_list")
+
+    def test_detail_prefetches_choices(self):
+        response = self.assertWithinBudget("detail", args=(self.question.id,))
+        self.assertContains(response, "선택 4")
+        self.assertWithinBudget("api_question_detail", args=(self.question.id,))
+
+    def test_results(self):
+        response = self.assertWithinBudget("results", args=(self.question.id,))
+        self.assertContains(response, "4 votes")
+
+    def test_bulk_results(self):
+        ids = ",".join(str(q.id) for q in self.questions)
+        response = self.assertWithinBudget("api_bulk_results", query_string=f"?ids={ids}")
+        self.assertEqual(len(response.json()["results"]), 6)
+
+    def test_budget_overrun_fails(self):
+        with self.assertRaisesMessage(AssertionError, "budget is 1"):
+            with query_budget(1):
+                for q in Question.objects.all():
+                    list(q.choice_set.all())
+
+
+class RequestTimingTests(TestCase):
+    def setUp(self):
+        get_request_stats().reset()
+        self.question = create_question("측정 질문", days=-1)
+        self.question.choice_set.create(choice_text="선택 1")
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("polls:detail", args=(self.question.id,)))
+        header = response["Server-Timing"]
+        self.assertIn('db;dur=', header)
+        self.assertIn('desc="2 queries"', header)
+        self.assertIn("tpl;dur=", header)
+        self.assertIn("total;dur=", header)
+
+    def test_stats_per_url_name(self):
+        for _ in range(3):
+            self.client.get(reverse("polls:index"))
+        self.client.get(reverse("polls:detail", args=(self.question.id,)))
+        snapshot = get_request_stats().snapshot()
+        self.assertEqual(snapshot["polls:index"]["count"], 3)
+        self.assertEqual(snapshot["polls:detail"]["queries"]["p50"], 2)
+        self.assertGreater(snapshot["polls:detail"]["template_ms"]["p99"], 0)
+
+    def test_percentiles_use_rolling_window(self):
+        stats = TimingStats(window=100)
+        for ms in range(1, 201):
+            stats.record("polls:index", ms, 0, 1, 0)
+        entry = stats.snapshot()["polls:index"]
+        self.assertEqual(entry["count"], 200)
+        self.assertEqual(entry["window"], 100)
+        # 최근 100개(101~200)만 사용
+        self.assertEqual(entry["total_ms"], {"p50": 150, "p95": 195, "p99": 199})
+
+    def test_timings_endpoint_is_staff_only(self):
+        url = reverse("polls:timings")
+        self.assertEqual(self.client.get(url).status_code, 302)
+        User.objects.create_user("staff", password="pw", is_staff=True)
+        self.client.login(username="staff", password="pw")
+        self.client.get(reverse("polls:index"))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("polls:index", response.json())
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        reset_store()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        # 결과 캐시 적중률을 보려는 것이라 그 앞의 페이지 캐시는 끈다
+        override = override_settings(
+            POLLS_METRICS_DIR=self.tmp_dir, POLLS_METRICS_FLUSH_INTERVAL=0, POLLS_PAGE_CACHE=False
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        self.question = create_question("메트릭 질문", days=-1)
+        self.choice = self.question.choice_set.create(choice_text="선택 1")
+
+    def test_votes_latency_and_cache_ratio(self):
+        self.client.post(reverse("polls:vote", args=(self.question.id,)), {"choice": self.choice.id})
+        self.client.get(reverse("polls:results", args=(self.question.id,)))  # miss
+        self.client.get(reverse("polls:results", args=(self.question.id,)))  # hit
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        body = response.content.decode()
+        self.assertIn("polls_votes_total 1\n", body)
+        self.assertIn('polls_request_duration_seconds_count{view="polls:vote"} 1\n', body)
+        self.assertIn('polls_request_duration_seconds_bucket{view="polls:results",le="+Inf"} 2\n', body)
+        self.assertIn("polls_results_cache_hit_ratio 0.5\n", body)
+        self.assertIn('polls_db_connection_requests_total{alias="default",state="reused"}', body)
+
+    def test_sums_files_from_all_workers(self):
+        other = MetricsRegistry(self.tmp_dir, flush_interval=0)
+        other.pid = 999999  # 다른 워커인 것처럼
+        other.inc("polls_votes_total", 5)
+        other.observe("polls_request_duration_seconds", 0.2, view="polls:index")
+        registry = get_registry()
+        registry.inc("polls_votes_total", 2)
+        registry.observe("polls_request_duration_seconds", 3.0, view="polls:index")
+
+        counters, histograms = registry.collect()
+        self.assertEqual(counters[("polls_votes_total", ())], 7)
+        hist = histograms[("polls_request_duration_seconds", (("view", "polls:index"),))]
+        self.assertEqual(hist[-1], 2)
+        self.assertAlmostEqual(hist[-2], 3.2)
+
+    def test_db_pool_stats_are_summed_gauges(self):
+        class FakePool:
+            def get_stats(self):
+                return {"pool_size": 4, "pool_available": 1, "pool_max": 10,
+                        "requests_num": 30, "requests_wait_ms": 1500}
+
+        pooled = mock.Mock(alias="default", _connection_pools={"default": FakePool()})
+        plain = mock.Mock(alias="other", _connection_pools={})
+        other = MetricsRegistry(self.tmp_dir, flush_interval=0)
+        other.pid = os.getppid()  # 살아 있는 다른 워커인 것처럼
+        other.set("polls_db_pool_size", 2, alias="default")
+        with mock.patch("polls.metrics.connections.all", return_value=[pooled, plain]):
+            record_db_pool_stats()
+
+        body = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn("# TYPE polls_db_pool_size gauge\n", body)
+        self.assertIn('polls_db_pool_size{alias="default"} 6\n', body)
+        self.assertIn('polls_db_pool_waiting{alias="default"} 0\n', body)
+        self.assertIn('polls_db_pool_wait_seconds_total{alias="default"} 1.5\n', body)
+        self.assertNotIn('alias="other"', body)
+
+    def test_gauges_from_exited_workers_are_skipped(self):
+        exited = subprocess.Popen([sys.executable, "-c", ""])
+        exited.wait()
+        dead = MetricsRegistry(self.tmp_dir, flush_interval=0)
+        dead.pid = exited.pid  # 종료된(재시작 전) 워커의 파일
+        dead.set("polls_db_pool_size", 5, alias="default")
+        dead.set("polls_db_pool_requests_total", 10, alias="default")
+        dead.inc("polls_votes_total", 3)
+        get_registry().set("polls_db_pool_size", 2, alias="default")
+
+        counters, _ = get_registry().collect()
+        self.assertEqual(counters[("polls_db_pool_size", (("alias", "default"),))], 2)
+        # 카운터는 합계가 줄지 않도록 그대로 더한다
+        self.assertEqual(counters[("polls_db_pool_requests_total", (("alias", "default"),))], 10)
+        self.assertEqual(counters[("polls_votes_total", ())], 3)
+
+    @override_settings(POLLS_METRICS_TOKEN="secret")
+    def test_token_required_when_configured(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+
+
+class AsyncViewTests(TestCase):
+    """POLLS_ASYNC_VIEWS=1 일 때의 목록/결과/투표 (AsyncClient = ASGI 경로)"""
+
+    def _reload_urls(self):
+        import mysite.urls
+        import polls.urls
+
+        importlib.reload(polls.urls)
+        importlib.reload(mysite.urls)
+        clear_url_caches()
+
+    def setUp(self):
+        reset_store()
+        clear_fragment_cache()
+        override = override_settings(POLLS_ASYNC_VIEWS=True)
+        override.enable()
+        self._reload_urls()
+        self.addCleanup(self._reload_urls)
+        self.addCleanup(override.disable)
+        self.question = create_question("비동기 질문", days=-1)
+        self.choice = self.question.choice_set.create(choice_text="선택 1", votes=1)
+
+    async def test_index(self):
+        await sync_to_async(warm_next_publication)()
+        response = await self.async_client.get(reverse("polls:index"))
+        self.assertEqual(response.resolver_match.func.view_class.__module__, "polls.async_views")
+        self.assertContains(response, "비동기 질문")
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+        response = await self.async_client.get(reverse("polls:index"), {"format": "json"})
+        self.assertEqual(response.json()["results"][0]["id"], self.question.id)
+
+    async def test_vote_and_results(self):
+        url = reverse("polls:vote", args=(self.question.id,))
+        response = await self.async_client.post(url, {"choice": self.choice.id})
+        self.assertRedirects(
+            response, reverse("polls:results", args=(self.question.id,)), fetch_redirect_response=False
+        )
+        await self.choice.arefresh_from_db()
+        self.assertEqual(self.choice.votes, 2)
+
+        response = await self.async_client.get(reverse("polls:results", args=(self.question.id,)))
+        self.assertContains(response, "2 votes")
+        # ASGI 에서만 결과 페이지가 SSE 스트림에 연결한다
+        self.assertContains(response, reverse("polls:live_results", args=(self.question.id,)))
+
+    async def test_vote_without_choice_shows_error(self):
+        response = await self.async_client.post(reverse("polls:vote", args=(self.question.id,)))
+        self.assertContains(response, "You didn&#x27;t select a choice.")
+        self.assertContains(response, "선택 1")
+
+    async def test_missing_question_is_404(self):
+        response = await self.async_client.get(reverse("polls:results", args=(999999,)))
+        self.assertEqual(response.status_code, 404)
+
+
+class LiveResultsTests(TestCase):
+    def setUp(self):
+        self.question = create_question("실시간 질문", days=-1)
+        self.c1 = self.question.choice_set.create(choice_text="선택 1", votes=1)
+        self.c2 = self.question.choice_set.create(choice_text="선택 2")
+        self.broadcaster = LiveResultsBroadcaster(max_rate=2, autostart=False)
+        patcher = mock.patch("polls.live._broadcaster", self.broadcaster)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_read_fans_out_to_all_subscribers(self):
+        subscriptions = [self.broadcaster.subscribe(self.question.id) for _ in range(100)]
+        with mock.patch("polls.live.get_results", wraps=get_results) as read:
+            self.broadcaster.publish_due(now=0)
+        self.assertEqual(read.call_count, 1)
+        events = [s.get(timeout=0) for s in subscriptions]
+        self.assertTrue(all(e is events[0] for e in events))
+        self.assertEqual(events[0]["results"][0]["votes"], 1)
+
+    def test_bursts_are_coalesced(self):
+        subscription = self.broadcaster.subscribe(self.question.id)
+        self.broadcaster.publish_due(now=0)
+        subscription.get(timeout=0)
+
+        record_vote(self.question.id, self.c1.id)
+        record_vote(self.question.id, self.c2.id)
+        # 초당 2번 → 마지막 전송 후 0.5초가 지나야 보낸다
+        self.assertAlmostEqual(self.broadcaster.publish_due(now=0.1), 0.4)
+        self.assertIsNone(subscription.get(timeout=0))
+        record_vote(self.question.id, self.c1.id)
+        self.broadcaster.publish_due(now=0.5)
+        event = subscription.get(timeout=0)
+        self.assertEqual(event["deltas"], {str(self.c1.id): 2, str(self.c2.id): 1})
+        self.assertEqual([r["votes"] for r in event["results"]], [3, 1])
+
+    def test_changes_from_other_workers_via_version(self):
+        subscription = self.broadcaster.subscribe(self.question.id)
+        self.broadcaster.publish_due(now=0)
+        subscription.get(timeout=0)
+        # 다른 워커의 투표: signal 없이 버전만 바뀐 상태
+        bump_version(self.question.id)
+        self.broadcaster.poll_versions()
+        self.broadcaster.publish_due(now=10)
+        self.assertIsNotNone(subscription.get(timeout=0))
+
+    async def test_async_stream_sends_snapshot(self):
+        first = self.broadcaster.subscribe(self.question.id)
+        await sync_to_async(self.broadcaster.publish_due)(now=0)
+        chunks = astream_results(self.question.id)
+        self.assertEqual(await anext(chunks), "retry: 3000\n\n")
+        event = await anext(chunks)
+        self.assertTrue(event.startswith("id: "))
+        self.assertIn("event: results\n", event)
+        self.assertIn('"choice_text":"선택 1"', event)
+        await chunks.aclose()
+        self.broadcaster.unsubscribe(first)
+        self.assertEqual(self.broadcaster.subscriber_count(self.question.id), 0)
+
+    @override_settings(POLLS_LIVE_FALLBACK_INTERVAL=7)
+    def test_wsgi_endpoint_sends_one_snapshot_without_streaming(self):
+        response = self.client.get(reverse("polls:live_results", args=(self.question.id,)))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertFalse(response.streaming)
+        body = response.content.decode()
+        self.assertTrue(body.startswith("retry: 7000\n\n"))
+        self.assertIn("event: results\n", body)
+        self.assertIn('"choice_text":"선택 1"', body)
+        # 워커 스레드를 잡는 구독자를 만들지 않는다
+        self.assertEqual(self.broadcaster.subscriber_count(self.question.id), 0)
+
+    def test_wsgi_results_page_polls_json_api(self):
+        response = self.client.get(reverse("polls:results", args=(self.question.id,)))
+        self.assertNotContains(response, reverse("polls:live_results", args=(self.question.id,)))
+        self.assertContains(
+            response, f'data-poll-url="{reverse("polls:api_question_results", args=(self.question.id,))}"'
+        )
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        clear_fragment_cache()
+        self.url = reverse("polls:index")
+        self.question = create_question("캐시 질문", days=-1)
+
+    def test_repeated_index_is_served_from_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, "캐시 질문")
+
+    def test_question_save_and_delete_invalidate_list(self):
+        self.client.get(self.url)
+        self.question.question_text = "바뀐 질문"
+        self.question.save()
+        self.assertContains(self.client.get(self.url), "바뀐 질문")
+
+        self.question.delete()
+        self.assertContains(self.client.get(self.url), "No polls are available.")
+
+    def test_equivalent_query_strings_share_key(self):
+        self.assertEqual(
+            # 공백 차이, 무시되는 잘못된 날짜/정렬값은 같은 목록
+            index_cache_key({"q": "  캐시   질문 ", "start": "2026-13-01", "order": "newest"}),
+            index_cache_key({"q": "캐시 질문"}),
+        )
+        self.assertNotEqual(index_cache_key({"q": "캐시"}), index_cache_key({"q": "질문"}))
+        self.assertNotEqual(index_cache_key({}), index_cache_key({"show": "future"}))
+
+    def test_ignored_query_values_are_not_rendered_into_shared_fragment(self):
+        # 잘못된 start/end 나 모르는 파라미터는 캐시 키에서 빠지므로 조각에 출력되면 안 된다
+        for _ in range(6):
+            create_question("다음 페이지용 질문", days=-2)
+        self.client.get(self.url + "?start=VISIT-EVIL&end=EVIL-END&order=EVIL-ORDER&x=EVIL-PARAM")
+        response = Client().get(self.url)
+        self.assertNotContains(response, "EVIL")
+        self.assertContains(response, 'name="start" placeholder="start: 2026-01-01" value=""')
+
+        self.client.get(self.url + "?q=%20%20캐시%20%20질문%20")
+        self.assertContains(Client().get(self.url + "?q=캐시+질문"), 'value="캐시 질문"')
+
+    def test_save_in_other_worker_invalidates_index(self):
+        self.client.get(self.url)
+        # 다른 워커(프로세스)의 저장: DB 와 공유 세대 파일만 바뀌고 이 워커의 목록 캐시는 그대로
+        Question.objects.bulk_create([Question(question_text="다른 워커 질문", pub_date=timezone.now())])
+        other_worker = LRUFileBasedCache(settings.CACHES["polls_versions"]["LOCATION"], {})
+        other_worker.set(GENERATION_KEY, 12345, timeout=None)
+        self.assertContains(self.client.get(self.url), "다른 워커 질문")
+
+    def test_question_save_does_not_query_next_publication(self):
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            self.question.save()
+        self.assertFalse(any('"pub_date" >' in q["sql"] for q in queries.captured_queries))
+
+    def test_timeout_stops_at_next_publication(self):
+        create_question("곧 공개", days=0.0001)  # 약 9초 뒤 공개
+        self.assertLessEqual(index_cache_timeout({}), 10)
+        self.assertEqual(index_cache_timeout({"show": "future"}), 60)
+
+    def test_header_is_cached_per_login_state_with_fresh_csrf(self):
+        self.assertContains(self.client.get(self.url), "로그인")
+
+        User.objects.create_user(username="a", password="pw")
+        User.objects.create_user(username="b", password="pw")
+        tokens = []
+        for username in ("a", "b"):
+            client = Client()
+            client.login(username=username, password="pw")
+            response = client.get(self.url)
+            self.assertContains(response, "로그아웃")
+            self.assertNotContains(response, "회원가입")
+            tokens.append(response.context["csrf_token"])
+            self.assertContains(response, 'name="csrfmiddlewaretoken"')
+        self.assertNotEqual(tokens[0], tokens[1])
+
+
+class TemplateWarmupTests(TestCase):
+    def test_lists_project_and_app_templates(self):
+        names = template_names()
+        for name in ("polls/index.html", "accounts/signup.html", "registration/login.html",
+                     "admin/base_site.html", "admin/base.html"):
+            self.assertIn(name, names)
+        self.assertEqual(names.count("admin/base_site.html"), 1)
+        self.assertNotIn("admin/base.html", template_names(include_apps=False))
+
+    def test_warm_fills_cached_loader(self):
+        loader = engines["django"].engine.template_loaders[0]
+        self.assertIsInstance(loader, CachedLoader)
+        loader.reset()
+        compiled, errors, _ = warm_templates(["polls/index.html", "polls/results.html"])
+        self.assertEqual((compiled, errors), (2, []))
+        self.assertIn("polls/index.html", loader.get_template_cache)
+
+    def test_command_fails_on_broken_template(self):
+        out = io.StringIO()
+        call_command("warm_templates", "--project-only", stdout=out)
+        self.assertIn("Compiled", out.getvalue())
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with open(os.path.join(directory, "broken.html"), "w") as f:
+            f.write("{% if %}")
+        templates = [{
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "DIRS": [directory],
+        }]
+        with override_settings(TEMPLATES=templates):
+            with self.assertRaisesMessage(CommandError, "1 of 1 templates failed"):
+                call_command("warm_templates", "--project-only", stdout=io.StringIO(),
+                             stderr=io.StringIO())
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        clear_fragment_cache()
+        self.question = create_question("페이지 캐시 질문", days=-1)
+        self.choice = self.question.choice_set.create(choice_text="선택 1")
+        self.index_url = reverse("polls:index")
+        self.results_url = reverse("polls:results", args=(self.question.id,))
+
+    def test_anonymous_pages_are_cached(self):
+        self.assertEqual(self.client.get(self.results_url)["X-Page-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            response = self.client.get(self.results_url)
+        self.assertEqual(response["X-Page-Cache"], "HIT")
+        self.assertContains(response, "선택 1")
+
+    def test_query_string_is_normalized(self):
+        self.client.get(self.index_url + "?q=캐시&order=&show=")
+        response = self.client.get(self.index_url + "?show=&q=캐시")
+        self.assertEqual(response["X-Page-Cache"], "HIT")
+        self.assertEqual(self.client.get(self.index_url + "?q=다른")["X-Page-Cache"], "MISS")
+
+    def test_changes_invalidate(self):
+        self.client.get(self.results_url)
+        record_vote(self.question.id, self.choice.id)
+        response = self.client.get(self.results_url)
+        self.assertEqual(response["X-Page-Cache"], "MISS")
+        self.assertContains(response, "1 vote")
+
+        self.client.get(self.index_url)
+        self.question.question_text = "바뀐 질문"
+        self.question.save()
+        self.assertContains(self.client.get(self.index_url), "바뀐 질문")
+
+    def test_csrf_pages_and_sessions_bypass(self):
+        detail_url = reverse("polls:detail", args=(self.question.id,))
+        self.assertEqual(self.client.get(detail_url)["X-Page-Cache"], "BYPASS")
+        self.assertEqual(self.client.get(detail_url)["X-Page-Cache"], "BYPASS")
+
+        self.client.get(self.results_url)
+        User.objects.create_user(username="u", password="pw")
+        self.client.login(username="u", password="pw")
+        self.assertNotIn("X-Page-Cache", self.client.get(self.results_url))
+
+    async def test_async_requests(self):
+        # ASGI 에서는 미들웨어가 async 로 불린다 (목록 TTL 계산의 DB 조회가 sync 스레드에서 돌아야 함)
+        clear_fragment_cache()  # 워커가 막 뜬 것처럼 다음 공개 시각도 비운 상태
+        first = await self.async_client.get(self.index_url)
+        second = await self.async_client.get(self.index_url)
+        self.assertEqual((first["X-Page-Cache"], second["X-Page-Cache"]), ("MISS", "HIT"))
+
+    def test_stale_while_revalidate(self):
+        self.client.get(self.results_url)
+        key = page_cache_key(self.client.get(self.results_url).wsgi_request)
+        later = time.time() + 11  # TTL(10초) 지남
+        with mock.patch("polls.page_cache.time.time", return_value=later):
+            # 다른 요청이 다시 만드는 중이면 이전 응답
+            caches["polls_pages"].add(f"{key}:lock", 1)
+            self.assertEqual(self.client.get(self.results_url)["X-Page-Cache"], "STALE")
+            caches["polls_pages"].delete(f"{key}:lock")
+            # 잠금을 잡은 요청이 새로 만든다
+            self.assertEqual(self.client.get(self.results_url)["X-Page-Cache"], "MISS")
+            self.assertEqual(self.client.get(self.results_url)["X-Page-Cache"], "HIT")
+
+
+    def test_head_revalidation_keeps_stale_entry(self):
+        self.client.get(self.results_url)
+        key = page_cache_key(self.client.get(self.results_url).wsgi_request)
+        with mock.patch("polls.page_cache.time.time", return_value=time.time() + 11):
+            # 잠금을 잡은 HEAD 는 저장하지 않지만 다른 클라이언트가 쓸 stale 항목을 지우지도 않는다
+            self.assertEqual(self.client.head(self.results_url)["X-Page-Cache"], "BYPASS")
+            self.assertIsNotNone(caches["polls_pages"].get(key))
+            self.assertIsNone(caches["polls_pages"].get(f"{key}:lock"))
+
+    def test_disallowed_host_is_rejected_on_hit(self):
+        self.client.get(self.results_url)
+        self.assertEqual(self.client.get(self.results_url)["X-Page-Cache"], "HIT")
+        response = self.client.get(self.results_url, HTTP_HOST="evil.example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("X-Page-Cache", response)
+
+
+class BenchmarkToolsTests(TestCase):
+    def test_parse_server_timing(self):
+        self.assertEqual(
+            parse_server_timing('db;dur=1.50;desc="3 queries", tpl;dur=0.20, total;dur=4.00'),
+            {"db_ms": 1.5, "queries": 3, "tpl_ms": 0.2, "total_ms": 4.0},
+        )
+        self.assertEqual(parse_server_timing(None), {})
+
+    def test_summarize(self):
+        samples = [
+            (0.010, 200, {"queries": 2, "db_ms": 1.0}, "MISS"),
+            (0.002, 200, {"queries": 0, "db_ms": 0.0}, "HIT"),
+            (0.004, 404, {"queries": 1, "db_ms": 0.5}, None),
+        ]
+        result = summarize(samples, errors=1, elapsed=0.5, conflicts=4)
+        self.assertEqual(result["requests"], 3)
+        self.assertEqual(result["conflicts"], 4)
+        self.assertEqual(result["rps"], 6.0)
+        self.assertEqual(result["latency_ms"]["p50"], 4.0)
+        self.assertEqual(result["queries"]["max"], 2)
+        self.assertEqual(result["status"], {"200": 2, "404": 1})
+        self.assertEqual(result["page_cache"], {"MISS": 1, "HIT": 1})
+
+    def test_vote_requests_use_a_new_session_per_repeated_question(self):
+        command = BenchPollsCommand()
+        client = BenchClient("127.0.0.1", 0)
+        client.cookies = {"csrftoken": "t", settings.SESSION_COOKIE_NAME: "s1"}
+        client.csrf_token, client.voted = "t", set()
+        command._vote_request(client, (1, [10]), 0)
+        command._vote_request(client, (2, [20]), 1)
+        self.assertEqual(client.cookies[settings.SESSION_COOKIE_NAME], "s1")
+        # 같은 세션으로 질문 1 에 다시 투표하지 않는다
+        method, path, body, _ = command._vote_request(client, (1, [10]), 2)
+        self.assertEqual((method, path), ("POST", "/polls/1/vote/"))
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, client.cookies)
+        self.assertEqual(client.cookies["csrftoken"], "t")
+        self.assertEqual(client.voted, {1})
+
+    def test_index_scenarios_cover_every_filter_combination(self):
+        scenarios = dict(index_scenarios())
+        self.assertEqual(len(scenarios), 18)
+        self.assertEqual(scenarios["index"], "")
+        self.assertIn("show=future", scenarios["index?q+show+order+range"])
+        self.assertIn("start=", scenarios["index?range"])
+
+
+class GeneratorTests(TestCase):
+    anchor = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def test_same_seed_same_data(self):
+        first = list(generate_records(50, seed=7, anchor=self.anchor))
+        self.assertEqual(first, list(generate_records(50, seed=7, anchor=self.anchor)))
+        self.assertNotEqual(first, list(generate_records(50, seed=8, anchor=self.anchor)))
+
+    def test_distributions(self):
+        records = list(generate_records(2000, seed=1, anchor=self.anchor, future_ratio=0.2))
+        future = sum(r["pub_date"] > self.anchor.isoformat() for r in records)
+        self.assertTrue(300 < future < 500)
+        korean = sum(any("\uac00" <= ch <= "\ud7a3" for ch in r["question_text"]) for r in records)
+        self.assertTrue(800 < korean < 1200)
+        for r in records:
+            self.assertTrue(2 <= len(r["choices"]) <= 6)
+
+    def test_zipf_split(self):
+        counts = zipf_split(1000, 4, 1.0, random.Random(0))
+        self.assertEqual(sum(counts), 1000)
+        # 1 : 1/2 : 1/3 : 1/4 비율 (순서는 섞임)
+        self.assertEqual(sorted(counts, reverse=True), [483, 239, 159, 119])
+
+    def test_command_inserts_rows(self):
+        call_command("generate_polls", "--questions", "30", "--batch-size", "10",
+                     "--anchor", "2026-01-01T00:00:00", stdout=io.StringIO())
+        self.assertEqual(Question.objects.count(), 30)
+        self.assertTrue(Question.objects.filter(choice__votes__gt=0).exists())
+
+
+class QuestionCounterTests(TestCase):
+    def setUp(self):
+        reset_store()
+        self.question = create_question("집계 질문", days=-1)
+        self.c1 = self.question.choice_set.create(choice_text="선택 1", votes=5)
+        self.c2 = self.question.choice_set.create(choice_text="선택 2")
+
+    def assertCounters(self, total_votes, choice_count):
+        self.question.refresh_from_db()
+        self.assertEqual((self.question.total_votes, self.question.choice_count), (total_votes, choice_count))
+
+    def test_choice_create_and_delete(self):
+        self.assertCounters(5, 2)
+        self.c1.delete()
+        self.assertCounters(0, 1)
+
+    def test_vote_paths(self):
+        self.client.post(reverse("polls:vote", args=(self.question.id,)), {"choice": self.c2.id})
+        self.assertCounters(6, 2)
+        async_to_sync(arecord_vote)(self.question.id, self.c2.id)
+        self.assertCounters(7, 2)
+        with override_settings(POLLS_VOTE_SHARDS=4):
+            record_vote(self.question.id, self.c1.id)
+        # shard 에 있는 표는 votes 로 합칠 때 같이 반영
+        self.assertCounters(7, 2)
+        compact_shards()
+        self.assertCounters(8, 2)
+        self.assertFalse(stale_counters().exists())
+
+    def test_import_fills_counters(self):
+        list(import_records([{"question_text": "가져온 질문", "pub_date": None,
+                              "choices": [("a", 3), ("b", 4)]}]))
+        imported = Question.objects.get(question_text="가져온 질문")
+        self.assertEqual((imported.total_votes, imported.choice_count), (7, 2))
+
+    def test_repair_command(self):
+        Question.objects.filter(pk=self.question.pk).update(total_votes=0, choice_count=9)
+        out = io.StringIO()
+        call_command("repair_question_counters", "--check", stdout=out)
+        self.assertIn("1 questions have stale counters", out.getvalue())
+
+        call_command("repair_question_counters", "--batch-size", "1", stdout=io.StringIO())
+        self.assertCounters(5, 2)
+
+
+class RankingTests(TestCase):
+    def setUp(self):
+        clear_fragment_cache()
+        self.url = reverse("polls:index")
+        self.old = create_question("오래된 인기 질문", days=-30)
+        self.new = create_question("새 질문", days=-1)
+        self.others = [create_question(f"질문 {i}", days=-2) for i in range(6)]
+        self.old_choice = self.old.choice_set.create(choice_text="a", votes=100)
+        self.new_choice = self.new.choice_set.create(choice_text="b")
+
+    def _ids(self, query):
+        return [q.id for q in self.client.get(self.url + query).context["latest_question_list"]]
+
+    def test_popular_orders_by_total_votes(self):
+        ids = self._ids("?order=popular")
+        self.assertEqual(ids[0], self.old.id)
+
+    def test_trending_follows_recent_votes_and_decays(self):
+        for _ in range(3):
+            record_vote(self.new.id, self.new_choice.id)
+        record_vote(self.old.id, self.old_choice.id)
+        self.assertEqual(self._ids("?order=trending")[:2], [self.new.id, self.old.id])
+
+        decay_trending(elapsed=6 * 3600, half_life_seconds=6 * 3600)
+        self.new.refresh_from_db()
+        self.assertAlmostEqual(self.new.trending_score, 1.5)
+        decay_trending(elapsed=60 * 3600, half_life_seconds=6 * 3600)
+        self.new.refresh_from_db()
+        self.assertEqual(self.new.trending_score, 0)
+
+    def test_keyset_pages_through_ties(self):
+        seen, query = [], "?order=popular"
+        while True:
+            response = self.client.get(self.url + query)
+            seen += [q.id for q in response.context["latest_question_list"]]
+            if not response.context["next_page_query"]:
+                break
+            query = "?" + response.context["next_page_query"]
+        self.assertEqual(len(seen), 8)
+        self.assertEqual(len(set(seen)), 8)
+        self.assertEqual(seen[0], self.old.id)
+        # 표가 같은 질문(0표)은 id 내림차순
+        self.assertEqual(seen[2:], sorted(seen[2:], reverse=True))
+
+    def test_ranked_list_reads_sort_key_in_one_query(self):
+        clear_fragment_cache()
+        create_question("캐시 비우고 세대 만들기", days=-3)
+        warm_next_publication()
+        with self.assertNumQueries(1):
+            self.client.get(self.url + "?order=trending")
+
+    def test_decay_command(self):
+        record_vote(self.new.id, self.new_choice.id)
+        out = io.StringIO()
+        call_command("decay_trending", "--elapsed", "600", stdout=out)
+        self.assertIn("Decayed 1 trending scores", out.getvalue())
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class VoteRateLimitTests(TestCase):
+    def setUp(self):
+        reset_store()
+        self.question = create_question("제한 질문", days=-1)
+        self.choice = self.question.choice_set.create(choice_text="a")
+        self.url = reverse("polls:vote", args=(self.question.id,))
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("5/60"), (5.0, 5 / 60))
+        self.assertEqual(parse_rate("10"), (10.0, 10.0))
+        with self.assertRaises(ValueError):
+            parse_rate("0/60")
+
+    def test_memory_bucket_refills_and_evicts(self):
+        clock = FakeClock()
+        store = MemoryBucketStore(max_entries=2, clock=clock)
+        self.assertEqual([store.take("k", 2, 1)[0] for _ in range(3)], [True, True, False])
+        self.assertAlmostEqual(store.take("k", 2, 1)[1], 1.0)
+        clock.now += 1
+        self.assertTrue(store.take("k", 2, 1)[0])
+
+        store.take("a", 2, 1)
+        store.take("b", 2, 1)
+        self.assertEqual(len(store), 2)  # 최대 개수를 넘으면 오래 안 쓴 "k" 부터
+        clock.now += 10
+        store.take("c", 2, 1)
+        self.assertEqual(len(store), 1)  # 다시 가득 찬 버킷은 지워진다
+
+    def test_mmap_buckets_are_shared_between_stores(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "buckets.bin")
+            clock = FakeClock()
+            first = MmapBucketStore(path, slots=64, clock=clock)
+            second = MmapBucketStore(path, slots=64, clock=clock)  # 다른 워커
+            self.assertTrue(first.take("k", 2, 0.5)[0])
+            self.assertTrue(second.take("k", 2, 0.5)[0])
+            allowed, retry_after = first.take("k", 2, 0.5)
+            self.assertFalse(allowed)
+            self.assertAlmostEqual(retry_after, 2.0)
+            clock.now += 2
+            self.assertTrue(second.take("k", 2, 0.5)[0])
+
+    def test_mmap_store_reuses_slots_when_full(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = MmapBucketStore(os.path.join(tmp, "buckets.bin"), slots=PROBE, clock=FakeClock())
+            for i in range(PROBE * 3):
+                store.take(f"k{i}", 1, 0.01)
+            self.assertEqual(os.path.getsize(store.path), PROBE * 32)
+            self.assertTrue(store.take("new", 1, 0.01)[0])
+
+    @override_settings(POLLS_VOTE_RATE_PER_QUESTION="2/60", POLLS_VOTE_RATE_PER_CLIENT="60/60")
+    def test_vote_returns_429_without_queries(self):
+        # 세션 쿠키가 바뀌지 않도록 로그인한 상태로. 두 번째는 이미 투표해서 409 지만 토큰은 쓴다
+        self.client.force_login(User.objects.create_user("limited", password="pw-12345"))
+        statuses = [self.client.post(self.url, {"choice": self.choice.id}).status_code for _ in range(2)]
+        self.assertEqual(statuses, [302, 409])
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, {"choice": self.choice.id})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "30")
+        self.choice.refresh_from_db()
+        self.assertEqual(self.choice.votes, 1)
+
+        # 다른 질문은 따로 센다
+        other = create_question("다른 질문", days=-1)
+        response = self.client.post(reverse("polls:vote", args=(other.id,)))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(POLLS_VOTE_RATE_PER_QUESTION="1/60", POLLS_VOTE_RATE_PER_CLIENT="2/60")
+    def test_client_limit_applies_across_sessions(self):
+        for n in range(2):
+            self.client.cookies[settings.SESSION_COOKIE_NAME] = f"session-{n}"
+            response = self.client.post(self.url, {"choice": self.choice.id})
+            self.assertEqual(response.status_code, 302)
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = "session-2"
+        response = self.client.post(
+            reverse("polls:api_vote", args=(self.question.id,)), {"choice": self.choice.id}
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["retry_after"], 30)
+
+    @override_settings(
+        POLLS_CLIENT_IP_HEADER="HTTP_X_FORWARDED_FOR", POLLS_TRUSTED_PROXY_COUNT=1,
+        POLLS_VOTE_RATE_PER_QUESTION="1/60", POLLS_VOTE_RATE_PER_CLIENT="60/60",
+    )
+    def test_proxied_cookieless_voters_are_keyed_by_forwarded_ip(self):
+        other = create_question("다른 질문", days=-1)
+        other_url = reverse("polls:vote", args=(other.id,))
+
+        def vote(url, forwarded):
+            # 모두 같은 프록시(REMOTE_ADDR)를 거친 쿠키 없는 첫 투표
+            return Client().post(
+                url, {"choice": self.choice.id}, REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=forwarded
+            ).status_code
+
+        # 서로 다른 클라이언트는 프록시 주소 하나로 묶이지 않는다
+        self.assertEqual(vote(self.url, "203.0.113.1"), 302)
+        self.assertEqual(vote(self.url, "203.0.113.2"), 302)
+        # 왼쪽 값을 바꿔 보내도 프록시가 붙인 오른쪽 값으로 센다
+        self.assertEqual(vote(self.url, "1.2.3.4, 203.0.113.1"), 429)
+        self.assertEqual(vote(other_url, "203.0.113.1"), 200)  # 질문별로 따로 (선택지 없음)
+
+    @override_settings(
+        POLLS_CLIENT_IP_HEADER="", POLLS_VOTE_RATE_PER_QUESTION="1/60", POLLS_VOTE_RATE_PER_CLIENT="1/60",
+    )
+    def test_unknown_client_ip_skips_ip_rules(self):
+        # REMOTE_ADDR 가 프록시뿐이면 쿠키 없는 첫 투표들을 한 버킷으로 묶지 않는다
+        statuses = [
+            Client().post(self.url, {"choice": self.choice.id}, REMOTE_ADDR="10.0.0.1").status_code
+            for _ in range(3)
+        ]
+        self.assertEqual(statuses, [302, 302, 302])
+
+    @override_settings(POLLS_VOTE_RATE_LIMIT=False, POLLS_VOTE_RATE_PER_QUESTION="1/60")
+    def test_can_be_disabled(self):
+        statuses = [self.client.post(self.url, {"choice": self.choice.id}).status_code for _ in range(3)]
+        self.assertEqual(statuses, [302, 409, 409])
+
+
+class OneVotePerVoterTests(TestCase):
+    def setUp(self):
+        reset_store()
+        caches["polls_voted"].clear()
+        self.question = create_question("한 표 질문", days=-1)
+        self.c1 = self.question.choice_set.create(choice_text="a")
+        self.c2 = self.question.choice_set.create(choice_text="b")
+        self.url = reverse("polls:vote", args=(self.question.id,))
+        self.detail_url = reverse("polls:detail", args=(self.question.id,))
+
+    def test_insert_ballot_reports_conflicts(self):
+        self.assertTrue(insert_ballot(self.question.id, self.c1.id, "user:1"))
+        self.assertFalse(insert_ballot(self.question.id, self.c2.id, "user:1"))
+        self.assertTrue(insert_ballot(self.question.id, self.c2.id, "user:2"))
+        self.assertEqual(Vote.objects.filter(question=self.question).count(), 2)
+
+    def test_anonymous_voter_gets_session_and_one_vote(self):
+        response = self.client.post(self.url, {"choice": self.c1.id})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+        response = self.client.post(self.url, {"choice": self.c2.id})
+        self.assertEqual(response.status_code, 409)
+        self.assertContains(response, "You already voted", status_code=409)
+        self.c1.refresh_from_db()
+        self.c2.refresh_from_db()
+        self.assertEqual((self.c1.votes, self.c2.votes), (1, 0))
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.total_votes, 1)
+
+    def test_logged_in_user_votes_once_across_sessions(self):
+        user = User.objects.create_user("voter", password="pw-12345")
+        self.client.force_login(user)
+        self.assertEqual(self.client.post(self.url, {"choice": self.c1.id}).status_code, 302)
+        other = Client()
+        other.force_login(user)
+        response = other.post(reverse("polls:api_vote", args=(self.question.id,)), {"choice": self.c2.id})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Vote.objects.get().voter, f"user:{user.pk}")
+
+    def test_detail_shows_voted_state_from_cache(self):
+        response = self.client.get(self.detail_url)
+        self.assertFalse(response.context["already_voted"])
+        self.assertContains(response, 'class="vote-form"')
+
+        self.client.post(self.url, {"choice": self.c1.id})
+        voter = Vote.objects.get().voter
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as first:
+            response = self.client.get(self.detail_url)
+        self.assertTrue(response.context["already_voted"])
+        self.assertNotContains(response, 'class="vote-form"')
+        # 두 번째부터는 투표한 질문 집합을 캐시에서 읽는다
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as second:
+            self.client.get(self.detail_url)
+        self.assertEqual(len(second), len(first) - 1)
+        self.assertEqual(voted_questions(voter), {self.question.id})
+
+    def test_buffered_vote_is_rejected_before_buffering(self):
+        buffer = VoteBuffer(autostart=False)
+        with override_settings(POLLS_VOTE_BUFFER_ENABLED=True), \
+                mock.patch("polls.vote_buffer.get_vote_buffer", return_value=buffer):
+            self.assertTrue(record_vote(self.question.id, self.c1.id, "user:7"))
+            self.assertFalse(record_vote(self.question.id, self.c1.id, "user:7"))
+        self.assertEqual(buffer.pending_count, 1)
+
+    def test_async_vote_is_rejected_twice(self):
+        self.assertTrue(async_to_sync(arecord_vote)(self.question.id, self.c1.id, "session:x"))
+        self.assertFalse(async_to_sync(arecord_vote)(self.question.id, self.c2.id, "session:x"))
+        self.c2.refresh_from_db()
+        self.assertEqual(self.c2.votes, 0)
+
+
+LOCMEM_CACHE = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+
+
+class CacheCheckTests(TestCase):
+    """워커별(locmem) 결과/버전 캐시 설정 점검 (polls/checks.py)"""
+
+    @override_settings(CACHES={**settings.CACHES, "polls_versions": LOCMEM_CACHE})
+    def test_per_process_versions_cache_warns(self):
+        self.assertEqual([w.id for w in check_versions_cache(None)], ["polls.W001"])
+
+    def test_configured_workers(self):
+        cases = [
+            ({}, ["manage.py", "check"], 1),
+            ({"WEB_CONCURRENCY": "3"}, ["manage.py", "check"], 3),
+            ({"GUNICORN_CMD_ARGS": "--workers=4"}, ["manage.py"], 4),
+            # 명령행이 환경 변수보다 우선
+            ({"WEB_CONCURRENCY": "3"}, ["/venv/bin/gunicorn", "mysite.wsgi:application", "-w", "2"], 2),
+            ({}, ["/venv/bin/gunicorn", "-w8", "mysite.wsgi:application"], 8),
+        ]
+        for env, argv, expected in cases:
+            with self.subTest(env=env, argv=argv), mock.patch.dict(os.environ, env, clear=True), \
+                    mock.patch.object(sys, "argv", argv):
+                self.assertEqual(configured_workers(), expected)
+
+    @override_settings(CACHES={**settings.CACHES, "polls_results": LOCMEM_CACHE, "polls_versions": LOCMEM_CACHE})
+    def test_multiple_workers_with_per_process_caches_warn(self):
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": "2"}):
+            self.assertEqual([w.id for w in check_results_cache_workers(None)], ["polls.W002"])
+            with self.assertLogs("polls.checks", "WARNING") as logs:
+                warn_on_startup()
+        self.assertTrue(any("polls.W002" in line for line in logs.output))
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": "1"}):
+            self.assertEqual(check_results_cache_workers(None), [])
+
+    @override_settings(CACHES={**settings.CACHES, "polls_results": LOCMEM_CACHE})
+    def test_locmem_results_with_shared_versions_is_fine(self):
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": "4"}):
+            self.assertEqual(check_results_cache_workers(None), [])
+
+
 class QuestionCRUDTests(TestCase):
     def _create_question_data(self, text="새 질문"):
         """헬퍼: 질문 생성/수정용 데이터"""
@@ -1,9 +1,14 @@
+from django.conf import settings
 from django.urls import path
+from . import async_views
 from . import views
 from . import practice_views
+from . import api
 
 app_name = "polls"
 
+_views = async_views if settings.POLLS_ASYNC_VIEWS else views
+
 # 아래 변수는 전역변수, 변수명 수정 X
 urlpatterns = [
     # (도메인주소, views로 부터 함수 또는 클래스 호출,
@@ -21,12 +26,15 @@ urlpatterns = [
     # path("<int:question_id>/vote/", views.vote, name="vote"),
 
     # CBV
-    path("", views.IndexView.as_view(), name="index"),
+    # POLLS_ASYNC_VIEWS=1 (ASGI 실행) 이면 목록/결과/투표는 async 버전 (polls/async_views.py)
+    path("", _views.IndexView.as_view(), name="index"),
 
     
     path("<int:pk>/", views.DetailView.as_view(), name="detail"),
-    path("<int:pk>/results/", views.ResultsView.as_view(), name="results"),
-    path("<int:question_id>/vote/", views.vote, name="vote"),
+    path("<int:pk>/results/", _views.ResultsView.as_view(), name="results"),
+    path("<int:question_id>/vote/", _views.vote, name="vote"),
+    # 결과 실시간 전송 (SSE, 결과 페이지가 EventSource 로 연결)
+    path("<int:pk>/live/", views.live_results, name="live_results"),
     
     # CRUD
 
@@ -46,6 +54,22 @@ urlpatterns = [
     # 제너릭에 DeleteView 상속받아서 클래스 글 생성을 구현
     # url polls:question_delete 탬플릿(html)에서 링크 형태로 호출
 
+    # 내보내기 (관리자 전용) ?format=ndjson|csv&start=&end=&gzip=1
+    path("export/", views.export, name="export"),
+
+    # 요청 성능 통계 (관리자 전용) URL 이름별 p50/p95/p99
+    path("timings/", views.timings, name="timings"),
+
+    # JSON API
+    path("api/questions/", api.question_list, name="api_question_list"),
+    path("api/questions/<int:pk>/", api.question_detail, name="api_question_detail"),
+    path("api/questions/<int:pk>/results/", api.question_results, name="api_question_results"),
+    path("api/questions/<int:pk>/vote/", api.vote, name="api_vote"),
+    path("api/results/", api.bulk_results, name="api_bulk_results"),
+    # http://127.0.0.1:8000/polls/api/questions/
+    # http://127.0.0.1:8000/polls/api/results/?ids=1,2,3
+    # 결과 조회는 ETag 를 주므로 If-None-Match 로 다시 요청하면 바뀌지 않았을 때 304
+
     # # practice_id
     # path("practice/1/", practice_views.practice_1, name="practice_1"),
     # # http://127.0.0.1:8000/polls/practice/1/?q=~~~
@@ -0,0 +1,70 @@
+import secrets
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Choice, Question
+from .signals import votes_recorded
+
+# 질문별 버전
+# 투표나 선택지/질문 변경이 있을 때마다 바꾼다. ETag 등 "바뀌었는지" 판단에 사용.
+# 워커끼리 공유되는 polls_versions 캐시(기본 파일 캐시)에 두어야 한 워커의 투표를 다른 워커도 본다.
+# 파일 캐시의 incr 는 프로세스 사이에서 원자적이지 않으므로 1씩 올리지 않고 새 무작위 값을 쓴다
+# (동시에 바꿔도 어느 쪽이 남든 이전 값과는 다르다).
+# 값은 쓰는 쪽(투표/저장/삭제)에서만 만든다. 읽는 쪽(ETag, 페이지 캐시)은 없는 질문 id 로도 불리므로
+# 저장된 값이 없으면 UNSET 을 돌려주고 아무것도 쓰지 않는다 (가짜 id 로 캐시 파일이 늘어나지 않게).
+
+
+def shared_cache():
+    """워커끼리 공유되는 polls_versions 캐시 (목록 세대도 여기에 둔다, polls/fragment_cache.py)"""
+    return caches[getattr(settings, "POLLS_VERSIONS_CACHE_ALIAS", "polls_versions")]
+
+
+def new_version():
+    return secrets.randbits(48) or 1  # 0 은 UNSET
+
+
+UNSET = 0  # 새 버전은 48비트 무작위 값이라 0 과 겹칠 일은 사실상 없다
+
+
+def _key(question_id):
+    return f"polls:version:{question_id}"
+
+
+def get_version(question_id):
+    """저장된 버전, 아직 바뀐 적이 없으면(또는 캐시에서 밀려났으면) UNSET"""
+    return shared_cache().get(_key(question_id), UNSET)
+
+
+async def aget_version(question_id):
+    return await shared_cache().aget(_key(question_id), UNSET)
+
+
+def get_versions(question_ids):
+    """{question_id: version} (없는 것은 UNSET)"""
+    keys = {_key(qid): qid for qid in question_ids}
+    found = shared_cache().get_many(keys)
+    return {qid: found.get(key, UNSET) for key, qid in keys.items()}
+
+
+def bump_version(question_id):
+    shared_cache().set(_key(question_id), new_version(), timeout=None)
+
+
+@receiver(votes_recorded)
+def _bump_on_vote(sender, question_id, **kwargs):
+    bump_version(question_id)
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def _bump_on_choice_change(sender, instance, **kwargs):
+    bump_version(instance.question_id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def _bump_on_question_change(sender, instance, **kwargs):
+    bump_version(instance.pk)
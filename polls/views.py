@@ -1,14 +1,28 @@
 from django.utils import timezone
-from django.db.models import F
 from django.urls import reverse,reverse_lazy
 from django.views import generic
-from django.http import HttpResponseRedirect
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.forms import UserCreationForm
 import datetime
+from urllib.parse import urlencode
 
 
+from django.db.models import Prefetch
 from django.shortcuts import render, get_object_or_404
+from . import metrics as polls_metrics
+from .exporters import EXPORT_FORMATS, export_queryset, gzip_stream, iter_export
+from .fragment_cache import get_index_page, normalize_index_params
+from .live import astream_results, live_context, snapshot_results
+from .middleware import get_request_stats
 from .models import Question, Choice
+from .pagination import keyset_page
+from .ratelimit import limit_votes
+from .results_cache import get_results
+from .search import search_questions
+from .voters import ALREADY_VOTED, has_voted, remember_vote, voter_key
+from .votes import record_vote
 
 # 공용 처리 함수
 def _parse_yyyy_mm_dd(value: str):
@@ -21,44 +35,130 @@ def _parse_yyyy_mm_dd(value: str):
     except (TypeError, ValueError):
         return None
 
+def _day_start(day):
+    """date → 현재 타임존 기준 그날 00:00 (aware datetime)"""
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def filter_questions(params):
+    """
+    목록 쿼리스트링(show/q/start/end/order)으로 필터된 쿼리셋과 정렬 키를 반환.
+    정렬 키는 keyset 페이지네이션용 (정렬 필드, id) 튜플.
+    """
+    qs = Question.objects.all()
+
+    # 1) show=future → 미래 질문 포함 여부 (기본: 미래 숨김)
+    show = params.get("show")
+    if show != "future":
+        qs = qs.filter(pub_date__lte=timezone.now())
+
+    # 2) q=키워드 → question_text 전문 검색 (polls/search.py)
+    qs = search_questions(qs, params.get("q"))
+
+    # 3) start/end=YYYY-MM-DD → 기간 필터
+    # pub_date__date 는 컬럼에 함수가 씌워져 인덱스를 못 타므로
+    # 하루의 시작/다음날 시작 시각으로 바꿔 pub_date 범위로 비교한다.
+    start = _parse_yyyy_mm_dd(params.get("start"))
+    end = _parse_yyyy_mm_dd(params.get("end"))
+
+    if start:
+        qs = qs.filter(pub_date__gte=_day_start(start))
+    if end:
+        qs = qs.filter(pub_date__lt=_day_start(end + datetime.timedelta(days=1)))
+
+    # 4) order=oldest/popular/trending → 정렬 (기본: 최신순), 같은 값이면 id 로 순서 고정
+    #    popular 는 누적 투표수, trending 은 시간에 따라 줄어드는 점수 (둘 다 인덱스 컬럼)
+    ordering = ORDERINGS.get(params.get("order"), ORDERINGS[""])
+
+    return qs, ordering
+
+
+ORDERINGS = {
+    "": ("-pub_date", "-id"),
+    "oldest": ("pub_date", "id"),
+    "popular": ("-total_votes", "-id"),
+    "trending": ("-trending_score", "-id"),
+}
+
+
+def list_columns(ordering):
+    """목록에서 읽을 컬럼 (keyset 커서를 만들 정렬 키 포함)"""
+    return ("id", "question_text", "pub_date", ordering[0].lstrip("-"))
+
+
+def choices_prefetch():
+    """
+    질문 여러 개/하나의 선택지를 쿼리 한 번으로 미리 가져오기 (템플릿의 choice_set.all N+1 방지).
+    표시에 쓰는 컬럼만 읽는다.
+    """
+    return Prefetch(
+        "choice_set",
+        queryset=Choice.objects.only("id", "question_id", "choice_text").order_by("id"),
+    )
+
+
+def next_page_query(params, next_cursor):
+    """현재 쿼리스트링에 cursor 만 바꾼 다음 페이지 쿼리스트링 (마지막 페이지면 None)"""
+    if not next_cursor:
+        return None
+    # 캐시된 목록 조각에 들어가므로 요청 값 그대로가 아니라 정규화한 조건만
+    filters = normalize_index_params(params)
+    filters["cursor"] = next_cursor
+    return urlencode({key: value for key, value in filters.items() if value})
+
+
+def index_json(questions, next_cursor):
+    """목록 ?format=json 응답"""
+    return JsonResponse({
+        "results": [
+            {
+                "id": question.id,
+                "question_text": question.question_text,
+                "pub_date": question.pub_date.isoformat(),
+            }
+            for question in questions
+        ],
+        "next_cursor": next_cursor,
+    })
+
+
 # 메인 페이지 (질문 목록)
 class IndexView(generic.ListView):
     template_name = "polls/index.html"
     context_object_name = "latest_question_list"
+    # 한 페이지에 보여줄 질문 수
+    page_size = 5
 
-    
     def get_queryset(self):
-        qs = Question.objects.all()
-
-        # 1) show=future → 미래 질문 포함 여부 (기본: 미래 숨김)
-        show = self.request.GET.get("show")
-        if show != "future":
-            qs = qs.filter(pub_date__lte=timezone.now())
-
-        # 2) q=키워드 → question_text 검색
-        q = (self.request.GET.get("q") or "").strip()
-        if q:
-            qs = qs.filter(question_text__icontains=q)
-
-        # 3) start/end=YYYY-MM-DD → 기간 필터
-        start = _parse_yyyy_mm_dd(self.request.GET.get("start"))
-        end = _parse_yyyy_mm_dd(self.request.GET.get("end"))
-
-        if start:
-            qs = qs.filter(pub_date__date__gte=start)
-        if end:
-            qs = qs.filter(pub_date__date__lte=end)
-
-        # 4) order=oldest → 정렬 (기본: 최신순)
-        order = self.request.GET.get("order")
-        if order == "oldest":
-            qs = qs.order_by("pub_date")
-        else:
-            qs = qs.order_by("-pub_date")
-
-        # 5) (옵션) 목록 5개 제한 유지
-        return qs[:5]
-    
+        params = self.request.GET
+
+        def build():
+            qs, ordering = filter_questions(params)
+            # 목록에 쓰지 않는 search_document 같은 컬럼은 읽지 않음
+            qs = qs.only(*list_columns(ordering))
+
+            # 5) cursor=토큰 → 해당 위치 다음 페이지 (keyset 페이지네이션)
+            return keyset_page(qs, ordering, params.get("cursor"), self.page_size)
+
+        # 같은 조건의 목록은 질문이 바뀌기 전까지 캐시에서 (polls/fragment_cache.py)
+        items, self.next_cursor, self.cache_key, self.cache_timeout = get_index_page(params, build)
+        return items
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["index_filters"] = normalize_index_params(self.request.GET)
+        context["index_cache_key"] = self.cache_key
+        context["index_cache_timeout"] = self.cache_timeout
+        context["next_cursor"] = self.next_cursor
+        context["next_page_query"] = next_page_query(self.request.GET, self.next_cursor)
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        # format=json → 같은 목록을 JSON 으로
+        if self.request.GET.get("format") == "json":
+            return index_json(context["latest_question_list"], context["next_cursor"])
+        return super().render_to_response(context, **response_kwargs)
+
 
 # 질문 상세 페이지
 class DetailView(generic.DetailView):
@@ -67,17 +167,52 @@ class DetailView(generic.DetailView):
     context_object_name = "question"
 
     def get_queryset(self):
-        return Question.objects.filter(pub_date__lte=timezone.now())
-    
+        return (
+            Question.objects.filter(pub_date__lte=timezone.now())
+            .only("id", "question_text")
+            .prefetch_related(choices_prefetch())
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # 투표한 질문 집합은 voter 별로 캐시 (페이지마다 쿼리하지 않음)
+        context["already_voted"] = has_voted(voter_key(self.request), self.object.id)
+        return context
+
 
 # 결과 페이지
 class ResultsView(generic.DetailView):
     model = Question
     template_name = "polls/results.html"
     context_object_name = "question"
+    # 선택지/득표수는 결과 캐시에서 가져오므로 질문 제목만 읽음
+    queryset = Question.objects.only("id", "question_text")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # 득표수/비율은 결과 캐시에서 (투표·선택지 변경 시 무효화됨)
+        context["results"] = get_results(self.object.id)
+        context.update(live_context())
+        return context
+
+
+# 결과 실시간 전송 (Server-Sent Events)
+# http://127.0.0.1:8000/polls/question_id/live/
+# ASGI(POLLS_ASYNC_VIEWS=1) 면 이벤트 루프에서 스트리밍,
+# WSGI 면 워커 스레드를 잡지 않도록 현재 결과 한 건만 보내고 끝낸다 (브라우저가 retry 후 재연결)
+def live_results(request, pk):
+    question = get_object_or_404(Question.objects.only("id"), pk=pk)
+    if settings.POLLS_ASYNC_VIEWS:
+        response = StreamingHttpResponse(astream_results(question.id), content_type="text/event-stream")
+        response["X-Accel-Buffering"] = "no"  # 프록시 버퍼링 끄기
+    else:
+        response = HttpResponse(snapshot_results(question.id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    return response
 
 
 # 투표 처리 로직
+@limit_votes()
 def vote(request, question_id):
     question = get_object_or_404(Question, pk=question_id)
     try:
@@ -92,8 +227,20 @@ def vote(request, question_id):
             },
         )
     else:
-        selected_choice.votes = F("votes") + 1
-        selected_choice.save()
+        # 버퍼 모드면 메모리에 쌓고, 아니면 바로 UPDATE (질문당 한 표, Vote 행 INSERT 가 0행이면 거절)
+        voter = voter_key(request, create=True)
+        if not record_vote(question.id, selected_choice.id, voter):
+            return render(
+                request,
+                "polls/detail.html",
+                {
+                    "question": question,
+                    "already_voted": True,
+                    "error_message": ALREADY_VOTED,
+                },
+                status=409,
+            )
+        remember_vote(voter, question.id)
         return HttpResponseRedirect(reverse("polls:results", args=(question.id,)))
     
 # CRUD - Create
@@ -117,3 +264,53 @@ class QuestionDeleteView(generic.DeleteView):
     template_name = "polls/question_confirm_delete.html"
     # 목록이 삭제되면, 보여줄 상세 페이지가 사라지므로 인덱스로 이동
     success_url = reverse_lazy("polls:index")
+
+
+# 데이터 내보내기 (관리자 전용, 스트리밍)
+# http://127.0.0.1:8000/polls/export/?format=csv&start=2026-01-01&gzip=1
+@staff_member_required
+def export(request):
+    fmt = request.GET.get("format")
+    if fmt not in EXPORT_FORMATS:
+        fmt = "ndjson"
+    # 미래 질문 포함, start/end 기간 필터만 적용
+    qs, _ = filter_questions({
+        "show": "future",
+        "start": request.GET.get("start"),
+        "end": request.GET.get("end"),
+    })
+    chunks = iter_export(fmt, export_queryset(qs))
+    content_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson; charset=utf-8"
+    filename = f"polls.{fmt}"
+
+    if request.GET.get("gzip") == "1":
+        response = StreamingHttpResponse(gzip_stream(chunks), content_type="application/gzip")
+        filename += ".gz"
+    else:
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+# 요청 성능 통계 (관리자 전용, 이 워커 프로세스 기준)
+# http://127.0.0.1:8000/polls/timings/  (?reset=1 이면 조회 후 초기화)
+@staff_member_required
+def timings(request):
+    stats = get_request_stats()
+    data = stats.snapshot()
+    if request.GET.get("reset") == "1":
+        stats.reset()
+    return JsonResponse(data, json_dumps_params={"ensure_ascii": False, "indent": 2})
+
+
+# Prometheus 메트릭 (모든 워커 합산)
+# http://127.0.0.1:8000/metrics
+def metrics(request):
+    token = getattr(settings, "POLLS_METRICS_TOKEN", "")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+    counters, histograms = polls_metrics.get_registry().collect()
+    return HttpResponse(
+        polls_metrics.render_metrics(counters, histograms),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,127 @@
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+
+from .models import Choice
+from .signals import votes_recorded
+from .votes import apply_vote_counts
+
+logger = logging.getLogger(__name__)
+
+
+class VoteBuffer:
+    """
+    투표를 메모리에 모아두었다가 백그라운드 스레드가 주기적으로 DB에 반영.
+
+    flush_interval: 최대 지연(초). 버퍼에 들어간 표는 이 시간 안에 DB에 반영된다.
+    max_pending: 쌓인 표가 이 개수 이상이면 주기를 기다리지 않고 바로 flush.
+    """
+
+    def __init__(self, flush_interval=1.0, max_pending=1000, autostart=True):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.autostart = autostart
+        self._lock = threading.Lock()
+        self._pending = defaultdict(lambda: defaultdict(int))
+        self._pending_count = 0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def pending_count(self):
+        return self._pending_count
+
+    def add(self, question_id, choice_id, n=1):
+        with self._lock:
+            self._pending[question_id][choice_id] += n
+            self._pending_count += n
+            full = self._pending_count >= self.max_pending
+        if self.autostart:
+            self.start()
+        if full:
+            self._wakeup.set()
+
+    def drain(self):
+        """쌓인 표를 꺼내고 버퍼를 비운다. {question_id: {choice_id: n}}"""
+        with self._lock:
+            pending = self._pending
+            self._pending = defaultdict(lambda: defaultdict(int))
+            self._pending_count = 0
+        return pending
+
+    def flush(self):
+        """
+        쌓인 표를 질문별 UPDATE ... CASE 로 반영하고 반영한 표 수를 반환.
+        DB 오류가 나면 아직 못 쓴 표를 버퍼에 되돌려 놓고 예외를 다시 던진다.
+        """
+        pending = self.drain()
+        flushed = 0
+        items = list(pending.items())
+        for index, (question_id, counts) in enumerate(items):
+            try:
+                apply_vote_counts(question_id, dict(counts))
+            except DatabaseError:
+                for qid, rest in items[index:]:
+                    for choice_id, n in rest.items():
+                        self.add(qid, choice_id, n)
+                raise
+            votes_recorded.send(sender=Choice, question_id=question_id, counts=dict(counts))
+            flushed += sum(counts.values())
+        return flushed
+
+    # 백그라운드 flush 스레드
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="polls-vote-buffer", daemon=True
+            )
+            self._thread.start()
+        # 프로세스 종료 시 남은 표를 반영
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.flush()
+            except DatabaseError:
+                logger.exception("vote buffer flush failed")
+            finally:
+                # 스레드 전용 커넥션도 CONN_MAX_AGE 규칙을 따르게 정리
+                close_old_connections()
+
+
+_vote_buffer = None
+_vote_buffer_lock = threading.Lock()
+
+
+def get_vote_buffer():
+    """프로세스당 하나의 VoteBuffer (설정값으로 생성)"""
+    global _vote_buffer
+    if _vote_buffer is None:
+        with _vote_buffer_lock:
+            if _vote_buffer is None:
+                _vote_buffer = VoteBuffer(
+                    flush_interval=getattr(settings, "POLLS_VOTE_BUFFER_FLUSH_INTERVAL", 1.0),
+                    max_pending=getattr(settings, "POLLS_VOTE_BUFFER_MAX_PENDING", 1000),
+                )
+    return _vote_buffer
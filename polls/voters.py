@@ -0,0 +1,63 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Vote
+
+# 투표한 사람 구분 + "이미 투표함" 확인
+# voter 키: 로그인 사용자는 "user:<id>", 익명은 "session:<세션 키>"
+# 익명 사용자가 처음 투표할 때 세션을 만든다 (세션 쿠키 → 이후 같은 사람으로 인식, 페이지 캐시도 우회)
+# 투표한 질문 id 집합은 polls_voted 캐시(locmem LRU)에 voter 별로 두고
+# 처음 한 번만 DB 에서 읽는다. 워커마다 따로라 다른 워커에서 한 투표는 TTL 안에 안 보일 수 있지만
+# 실제 중복 투표는 Vote 유니크 제약이 막는다.
+
+ALREADY_VOTED = "You already voted in this poll."
+
+
+def voter_key(request, create=False):
+    """요청한 사람의 voter 키. 익명이고 세션이 없으면 create=True 일 때만 새로 만든다"""
+    user = request.user
+    if user.is_authenticated:
+        return f"user:{user.pk}"
+    # request.user 를 읽으면서 세션을 불러왔으므로 DB 에 없는 세션 키는 이미 None
+    session = request.session
+    if session.session_key is None:
+        if not create:
+            return None
+        session.create()
+    return f"session:{session.session_key}"
+
+
+def _cache():
+    return caches[getattr(settings, "POLLS_VOTED_CACHE_ALIAS", "polls_voted")]
+
+
+def _key(voter):
+    return "polls:voted:" + hashlib.sha1(voter.encode()).hexdigest()
+
+
+def voted_questions(voter):
+    """voter 가 투표한 질문 id 집합 (캐시가 없을 때만 쿼리 한 번)"""
+    ids = _cache().get(_key(voter))
+    if ids is None:
+        ids = frozenset(Vote.objects.filter(voter=voter).values_list("question_id", flat=True))
+        _cache().set(_key(voter), ids)
+    return ids
+
+
+def has_voted(voter, question_id):
+    return voter is not None and question_id in voted_questions(voter)
+
+
+def remember_vote(voter, question_id):
+    """투표 성공 후 캐시에 반영 (캐시가 없으면 다음 조회 때 DB 에서 읽음)"""
+    ids = _cache().get(_key(voter))
+    if ids is not None:
+        _cache().set(_key(voter), ids | {question_id})
+
+
+async def aremember_vote(voter, question_id):
+    ids = await _cache().aget(_key(voter))
+    if ids is not None:
+        await _cache().aset(_key(voter), ids | {question_id})
@@ -0,0 +1,188 @@
+import random
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from . import metrics
+from .counters import refresh_counters
+from .models import Choice, ChoiceVoteShard, Question, Vote
+from .signals import votes_recorded
+
+
+def buffering_enabled():
+    """POLLS_VOTE_BUFFER_ENABLED 설정이 켜져 있으면 True"""
+    return getattr(settings, "POLLS_VOTE_BUFFER_ENABLED", False)
+
+
+def shard_count():
+    """POLLS_VOTE_SHARDS 설정값 (0이면 shard 미사용)"""
+    return getattr(settings, "POLLS_VOTE_SHARDS", 0)
+
+
+def apply_vote_counts(question_id, counts):
+    """
+    {choice_id: 증가량} 을 질문 하나당 UPDATE ... CASE 한 번으로 반영.
+    반영된 행 수를 반환.
+    """
+    if not counts:
+        return 0
+    increment = Case(
+        *[When(pk=choice_id, then=Value(n)) for choice_id, n in counts.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    with transaction.atomic():
+        updated = Choice.objects.filter(
+            question_id=question_id, pk__in=list(counts)
+        ).update(votes=F("votes") + increment)
+        if updated == len(counts):
+            add_question_votes(question_id, sum(counts.values()))
+        else:
+            # 그 사이 지워진 선택지가 있으면 더할 양을 알 수 없으므로 다시 계산
+            refresh_counters([question_id])
+    return updated
+
+
+def add_question_votes(question_id, n):
+    """질문의 total_votes 와 급상승 점수(trending_score)에 n 표를 더한다"""
+    Question.objects.filter(pk=question_id).update(
+        total_votes=F("total_votes") + n, trending_score=F("trending_score") + n
+    )
+
+
+def _increment_vote(question_id, choice_id):
+    """votes = votes + 1 과 질문 집계를 한 트랜잭션으로"""
+    with transaction.atomic():
+        if Choice.objects.filter(pk=choice_id).update(votes=F("votes") + 1):
+            add_question_votes(question_id, 1)
+
+
+def insert_ballot(question_id, choice_id, voter):
+    """
+    Vote 행 INSERT ... ON CONFLICT DO NOTHING 한 번.
+    새로 들어갔으면 True, 이미 투표한 사람이면 (0행) False.
+    """
+    qn = connection.ops.quote_name
+    sql = (
+        f"INSERT INTO {qn(Vote._meta.db_table)} ({qn('question_id')}, {qn('choice_id')}, {qn('voter')}) "
+        f"VALUES (%s, %s, %s) ON CONFLICT ({qn('voter')}, {qn('question_id')}) DO NOTHING"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [question_id, choice_id, voter])
+        return cursor.rowcount == 1
+
+
+def _count_vote(question_id, choice_id, voter):
+    """Vote 행과 득표수를 한 트랜잭션으로 (이미 투표했으면 아무것도 안 하고 False)"""
+    with transaction.atomic():
+        if voter is not None and not insert_ballot(question_id, choice_id, voter):
+            return False
+        if shard_count():
+            increment_shard(choice_id)
+        else:
+            _increment_vote(question_id, choice_id)
+    return True
+
+
+def record_vote(question_id, choice_id, voter=None):
+    """
+    투표 한 건 기록. voter 를 주면 질문당 한 표만 (이미 투표했으면 False).
+    버퍼 모드면 메모리 버퍼에 쌓고(백그라운드에서 일괄 반영),
+    shard 모드면 무작위 shard 행에 더하고,
+    아니면 바로 votes = votes + 1 UPDATE.
+    """
+    if buffering_enabled():
+        from .vote_buffer import get_vote_buffer
+
+        if voter is not None and not insert_ballot(question_id, choice_id, voter):
+            return False
+        metrics.inc("polls_votes_total")
+        get_vote_buffer().add(question_id, choice_id)
+        return True
+    if not _count_vote(question_id, choice_id, voter):
+        return False
+    metrics.inc("polls_votes_total")
+    votes_recorded.send(sender=Choice, question_id=question_id, counts={choice_id: 1})
+    return True
+
+
+async def arecord_vote(question_id, choice_id, voter=None):
+    """record_vote 의 async 버전 (수신자는 asend 로 호출)"""
+    if buffering_enabled():
+        from .vote_buffer import get_vote_buffer
+
+        if voter is not None and not await sync_to_async(insert_ballot)(question_id, choice_id, voter):
+            return False
+        metrics.inc("polls_votes_total")
+        get_vote_buffer().add(question_id, choice_id)
+        return True
+    # Vote INSERT 와 UPDATE 들을 한 트랜잭션으로 묶어야 해서 sync 로 (async ORM 은 트랜잭션 미지원)
+    if not await sync_to_async(_count_vote)(question_id, choice_id, voter):
+        return False
+    metrics.inc("polls_votes_total")
+    await votes_recorded.asend(sender=Choice, question_id=question_id, counts={choice_id: 1})
+    return True
+
+
+# shard 카운터
+def increment_shard(choice_id, n=1, shards=None):
+    """
+    무작위로 고른 shard 행 하나에 n 을 더한다.
+    해당 shard 행이 아직 없으면 만들고, 동시에 만들어졌으면 다시 UPDATE.
+    """
+    shard = random.randrange(shards or shard_count())
+    rows = ChoiceVoteShard.objects.filter(choice_id=choice_id, shard=shard)
+    if rows.update(count=F("count") + n):
+        return shard
+    try:
+        with transaction.atomic():
+            ChoiceVoteShard.objects.create(choice_id=choice_id, shard=shard, count=n)
+    except IntegrityError:
+        rows.update(count=F("count") + n)
+    return shard
+
+
+def with_vote_totals(choices):
+    """
+    Choice 쿼리셋에 vote_total(= votes + 아직 합쳐지지 않은 shard 합계) 주석을 붙인다.
+    """
+    return choices.annotate(
+        vote_total=F("votes") + Coalesce(Sum("vote_shards__count"), 0)
+    )
+
+
+def compact_shards():
+    """
+    shard 에 쌓인 표를 Choice.votes 로 옮기고 옮긴 표 수를 반환.
+    읽은 만큼만 빼기 때문에 도중에 들어온 표는 다음 번에 옮겨진다.
+    """
+    moved = 0
+    choice_ids = (
+        ChoiceVoteShard.objects.filter(count__gt=0)
+        .values_list("choice_id", "choice__question_id")
+        .distinct()
+    )
+    for choice_id, question_id in list(choice_ids):
+        with transaction.atomic():
+            shards = dict(
+                ChoiceVoteShard.objects.select_for_update()
+                .filter(choice_id=choice_id, count__gt=0)
+                .values_list("pk", "count")
+            )
+            total = sum(shards.values())
+            if not total:
+                continue
+            ChoiceVoteShard.objects.filter(pk__in=list(shards)).update(
+                count=F("count") - Case(
+                    *[When(pk=pk, then=Value(n)) for pk, n in shards.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            )
+            Choice.objects.filter(pk=choice_id).update(votes=F("votes") + total)
+            add_question_votes(question_id, total)
+        moved += total
+    return moved
@@ -0,0 +1,57 @@
+// 결과 페이지 실시간 갱신
+// 새로고침 없이 득표수/비율을 바꾼다.
+//   data-live-url: ASGI 서버의 /polls/<id>/live/ 에 Server-Sent Events 로 연결
+//   data-poll-url: WSGI 서버에서는 JSON API 를 data-poll-interval 초마다 다시 읽는다
+//                  (ETag 로 재검증하므로 바뀌지 않았으면 304)
+(function () {
+    var list = document.querySelector(".result-list[data-live-url], .result-list[data-poll-url]");
+    if (!list) {
+        return;
+    }
+
+    function update(results) {
+        results.forEach(function (result) {
+            var item = list.querySelector('[data-choice-id="' + result.id + '"] .vote-count');
+            if (item) {
+                var label = result.votes === 1 ? " vote" : " votes";
+                item.textContent = result.votes + label + " (" + result.percentage + "%)";
+            }
+        });
+    }
+
+    if (list.dataset.liveUrl) {
+        if (!window.EventSource) {
+            return;
+        }
+        var source = new EventSource(list.dataset.liveUrl);
+        source.addEventListener("results", function (e) {
+            update(JSON.parse(e.data).results);
+        });
+        return;
+    }
+
+    if (!window.fetch) {
+        return;
+    }
+    var interval = (parseInt(list.dataset.pollInterval, 10) || 5) * 1000;
+    function poll() {
+        if (document.hidden) {
+            setTimeout(poll, interval);
+            return;
+        }
+        fetch(list.dataset.pollUrl, {cache: "no-cache", headers: {"Accept": "application/json"}})
+            .then(function (response) {
+                return response.ok ? response.json() : null;
+            })
+            .then(function (data) {
+                if (data) {
+                    update(data.results);
+                }
+            })
+            .catch(function () {})
+            .then(function () {
+                setTimeout(poll, interval);
+            });
+    }
+    setTimeout(poll, interval);
+})();